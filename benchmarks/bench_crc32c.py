@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Measure the throughput of every available CRC32C backend.
+
+Usage: python benchmarks/bench_crc32c.py [size_in_kb] [repeat]
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import time
+
+from odps.crc import Crc32c, crc32c_backends
+
+
+def bench(backend, data, repeat):
+    crc = Crc32c(backend=backend)
+    start = time.time()
+    for _ in range(repeat):
+        crc.update(data, 0, len(data))
+    elapsed = time.time() - start
+    return len(data) * repeat / elapsed / (1024 ** 2)
+
+
+def bench_fields(backend, n_fields):
+    # simulate the tunnel usage where each field is hashed separately
+    fields = [os.urandom(8) for _ in range(n_fields)]
+    crc = Crc32c(backend=backend)
+    start = time.time()
+    for field in fields:
+        crc.update(field, 0, 8)
+    elapsed = time.time() - start
+    return n_fields * 8 / elapsed / (1024 ** 2)
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    data = bytearray(os.urandom(size * 1024))
+    print('%-16s%16s%16s' % ('backend', 'bulk MB/s', '8-byte MB/s'))
+    for backend in crc32c_backends():
+        if backend == 'bytewise':
+            bulk = bench(backend, data[:len(data) // 8], repeat)
+        else:
+            bulk = bench(backend, data, repeat)
+        print('%-16s%16.2f%16.2f' % (backend, bulk, bench_fields(backend, 100000)))
+
+
+if __name__ == '__main__':
+    main()
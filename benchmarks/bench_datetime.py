@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Measure values/sec of converting datetime values from and into milliseconds
+since epoch, one value at a time with the old ``fromtimestamp`` / ``mktime``
+approach, with the cached offsets of ``odps.utils``, and for whole NumPy
+columns at once.
+
+Usage: python benchmarks/bench_datetime.py [n_values]
+"""
+
+from __future__ import print_function
+
+import random
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+from odps import utils
+
+
+def _old_to_datetime(milliseconds):
+    seconds = int(milliseconds / 1000)
+    microseconds = milliseconds % 1000 * 1000
+    return datetime.fromtimestamp(seconds).replace(microsecond=microseconds)
+
+
+def _old_to_milliseconds(dt):
+    return int((time.mktime(dt.timetuple()) + dt.microsecond / 1000000.0) * 1000)
+
+
+def _rate(func, arg, n):
+    start = time.time()
+    func(arg)
+    return n / (time.time() - start)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    random.seed(0)
+    # timestamps of a log table, roughly one year
+    milliseconds = [random.randint(1450000000000, 1480000000000) for _ in range(n)]
+    dts = [utils.to_datetime(ms) for ms in milliseconds]
+    ms_array = np.array(milliseconds, dtype=np.int64)
+    dt_array = np.array(dts, dtype='datetime64[ms]')
+
+    print('%-20s %18s %18s' % ('method', 'to_datetime/s', 'to_milliseconds/s'))
+    print('%-20s %18.1f %18.1f' % (
+        'old', _rate(lambda v: [_old_to_datetime(ms) for ms in v], milliseconds, n),
+        _rate(lambda v: [_old_to_milliseconds(dt) for dt in v], dts, n)))
+    print('%-20s %18.1f %18.1f' % (
+        'cached offsets', _rate(lambda v: [utils.to_datetime(ms) for ms in v], milliseconds, n),
+        _rate(lambda v: [utils.to_milliseconds(dt) for dt in v], dts, n)))
+    print('%-20s %18.1f %18.1f' % (
+        'datetime64 column', _rate(utils.to_datetime64, ms_array, n),
+        _rate(utils.datetime64_to_milliseconds, dt_array, n)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Measure records/sec of creating records with validation and from trusted
+decoded values, as well as reading them through TunnelReader, for tables
+where bigint, double, string or datetime columns dominate.
+
+Usage: python benchmarks/bench_record_construction.py [n_columns] [n_records]
+"""
+
+from __future__ import print_function
+
+import sys
+import time
+from datetime import datetime
+
+from odps.models import Schema
+from odps.types import Record
+from odps.tunnel.reader import TunnelReader
+from odps.tunnel.writer import TunnelWriter
+
+_SCHEMAS = [
+    ('bigint', 1234567890),
+    ('double', 3.1415926),
+    ('string', u'benchmark string'),
+    ('datetime', datetime(2016, 1, 1, 12, 30, 45)),
+]
+
+
+class ValidatingTunnelReader(TunnelReader):
+    """
+    Reader creating records with validation, like before the trusted path.
+    """
+    def read(self):
+        values = self._read_values()
+        if values is None:
+            return
+        return Record(self._columns, values=values)
+
+
+def speed(func, n):
+    start = time.time()
+    func()
+    return n / (time.time() - start)
+
+
+def main():
+    n_columns = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    n_records = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    print('%-10s %14s %14s %14s %14s' % ('schema', 'validated/s', 'decoded/s',
+                                         'read old/s', 'read new/s'))
+    for type_name, value in _SCHEMAS:
+        schema = Schema.from_lists(['col%s' % i for i in range(n_columns)],
+                                   [type_name] * n_columns)
+        columns = schema.columns
+        values = [value] * n_columns
+
+        validated = speed(lambda: [Record(columns, values=values)
+                                   for _ in range(n_records)], n_records)
+        decoded = speed(lambda: [Record._from_decoded(columns, list(values))
+                                 for _ in range(n_records)], n_records)
+
+        chunks = []
+        writer = TunnelWriter(schema, lambda it: chunks.extend(it))
+        for _ in range(n_records):
+            writer.write(Record(columns, values=values))
+        writer.close()
+        data = b''.join(chunks)
+
+        read_old = speed(lambda: list(ValidatingTunnelReader(schema, data)), n_records)
+        read_new = speed(lambda: list(TunnelReader(schema, data)), n_records)
+
+        print('%-10s %14.1f %14.1f %14.1f %14.1f' % (type_name, validated, decoded,
+                                                     read_old, read_new))
+
+
+if __name__ == '__main__':
+    main()
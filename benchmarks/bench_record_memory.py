@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Measure memory allocated per record when decoding a wide table, comparing
+records which build their own column index with records sharing the index,
+as well as compact read-only records.
+
+Usage: python benchmarks/bench_record_memory.py [n_columns] [n_records]
+"""
+
+from __future__ import print_function
+
+import sys
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from odps.models import Schema
+from odps.types import Record
+from odps.tunnel.reader import TunnelReader
+from odps.tunnel.writer import TunnelWriter
+
+
+class DictIndexRecord(Record):
+    """
+    Record building a name index per record, like before the index is shared.
+    """
+    __slots__ = '_own_indexes',
+
+    def __init__(self, *args, **kwargs):
+        super(DictIndexRecord, self).__init__(*args, **kwargs)
+        self._own_indexes = dict((col.name, i) for i, col in enumerate(self._columns))
+
+
+class DictIndexReader(TunnelReader):
+    def read(self):
+        values = self._read_values()
+        if values is None:
+            return
+        return DictIndexRecord(self._columns, values=values)
+
+
+def measure(reader):
+    tracemalloc.start()
+    records = list(reader)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / float(len(records))
+
+
+def main():
+    if tracemalloc is None:
+        print('tracemalloc is required, run this benchmark with Python 3')
+        return
+
+    n_columns = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    n_records = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    schema = Schema.from_lists(['col%s' % i for i in range(n_columns)], ['bigint'] * n_columns)
+    chunks = []
+    writer = TunnelWriter(schema, lambda it: chunks.extend(it))
+    for i in range(n_records):
+        writer.write(Record(schema=schema, values=[i % 256] * n_columns))
+    writer.close()
+    data = b''.join(chunks)
+
+    print('%-24s %20s' % ('record', 'bytes per record'))
+    for name, reader in (('per-record index', DictIndexReader(schema, data)),
+                         ('shared index', TunnelReader(schema, data)),
+                         ('read-only', TunnelReader(schema, data, read_only=True))):
+        print('%-24s %20.1f' % (name, measure(reader)))
+
+
+if __name__ == '__main__':
+    main()
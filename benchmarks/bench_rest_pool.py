@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Measure latency per call of metadata-heavy workloads, i.e. iterating tables
+and partitions page by page, against a local HTTP stand-in of the ODPS service,
+with and without pooled keep-alive connections.
+
+Usage: python benchmarks/bench_rest_pool.py [n_tables] [n_partitions]
+"""
+
+from __future__ import print_function
+
+import re
+import socket
+import sys
+import threading
+import time
+
+from six.moves import BaseHTTPServer, socketserver
+from six.moves.urllib.parse import urlparse, parse_qs
+
+from odps import ODPS, options
+
+_TABLES_PATH = re.compile(r'^/projects/[^/]+/tables/?$')
+_PARTITIONS_PATH = re.compile(r'^/projects/[^/]+/tables/[^/]+/?$')
+
+
+class MetaHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    # keep-alive connections need HTTP/1.1
+    protocol_version = 'HTTP/1.1'
+    n_tables = 100
+    n_partitions = 100
+    connections = set()
+
+    def setup(self):
+        # avoid delayed ACKs stalling small responses on kept-alive connections
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        BaseHTTPServer.BaseHTTPRequestHandler.setup(self)
+
+    def log_message(self, *args):
+        pass
+
+    def _page(self, params, total):
+        idx = int(params.get('marker', ['0'])[0] or 0)
+        marker = str(idx + 1) if idx + 1 < total else ''
+        return idx, marker
+
+    def do_GET(self):
+        self.connections.add(self.client_address)
+        url = urlparse(self.path)
+        params = parse_qs(url.query, keep_blank_values=True)
+
+        if _TABLES_PATH.match(url.path):
+            idx, marker = self._page(params, self.n_tables)
+            body = ('<?xml version="1.0" ?><Tables><Marker>%s</Marker><MaxItems>1</MaxItems>'
+                    '<Table><Name>table_%s</Name></Table></Tables>') % (marker, idx)
+        elif _PARTITIONS_PATH.match(url.path) and 'partitions' in params:
+            idx, marker = self._page(params, self.n_partitions)
+            body = ('<?xml version="1.0" ?><Partitions><Marker>%s</Marker><MaxItems>1</MaxItems>'
+                    '<Partition><Column Name="pt" Value="%s"/></Partition>'
+                    '</Partitions>') % (marker, idx)
+        else:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        body = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/xml')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class ThreadingHTTPServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+def run_workload(odps):
+    n_calls = 0
+    start = time.time()
+    for _ in odps.list_tables():
+        n_calls += 1
+    for _ in odps.get_table('table_0').partitions:
+        n_calls += 1
+    return n_calls, time.time() - start
+
+
+def main():
+    MetaHandler.n_tables = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    MetaHandler.n_partitions = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), MetaHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    endpoint = 'http://127.0.0.1:%s' % server.server_address[1]
+
+    print('%-12s %10s %15s %13s' % ('keep_alive', 'calls', 'ms per call', 'connections'))
+    for keep_alive in (False, True):
+        options.keep_alive = keep_alive
+        MetaHandler.connections.clear()
+        odps = ODPS('access_id', 'secret_access_key', 'bench_project', endpoint=endpoint)
+        n_calls, elapsed = run_workload(odps)
+        print('%-12s %10d %15.3f %13d' % (keep_alive, n_calls, elapsed * 1000 / n_calls,
+                                          len(MetaHandler.connections)))
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Measure peak memory and time of creating a pandas DataFrame from records,
+through a list of lists as before and through typed columns.
+
+Usage: python benchmarks/bench_result_frame.py [n_records]
+"""
+
+from __future__ import print_function
+
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+from odps.df.backends.frame import ResultFrame, ResultColumns
+from odps.df.types import validate_data_type
+from odps.models import Schema
+
+
+def _gen_values(n):
+    for i in range(n):
+        yield [i, i * 1.5, i * 7, 'name%s' % (i % 100), i % 2 == 0]
+
+
+def _by_rows(schema, n):
+    data = [values for values in _gen_values(n)]
+    return pd.DataFrame(data, columns=schema.names)
+
+
+def _by_columns(schema, n):
+    data = ResultColumns(schema.columns)
+    for values in _gen_values(n):
+        data.append(values)
+    return ResultFrame(data, schema=schema).values
+
+
+def _measure(func, schema, n):
+    tracemalloc.start()
+    start = time.time()
+    df = func(schema, n)
+    elapsed = time.time() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return df, peak, elapsed
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    types = [validate_data_type(t) for t in ('int64', 'float64', 'int64', 'string', 'boolean')]
+    schema = Schema.from_lists(['a', 'b', 'c', 'd', 'e'], types)
+
+    print('%-10s %14s %12s' % ('method', 'peak MB', 'seconds'))
+    results = []
+    for name, func in (('rows', _by_rows), ('columns', _by_columns)):
+        df, peak, elapsed = _measure(func, schema, n)
+        results.append(df)
+        print('%-10s %14.1f %12.2f' % (name, peak / 1024.0 / 1024, elapsed))
+    assert results[0].equals(results[1])
+
+
+if __name__ == '__main__':
+    main()
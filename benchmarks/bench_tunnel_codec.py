@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Compare records/sec of the tunnel wire codec against the protobuf
+encoder/decoder objects the tunnel used to construct for every value.
+
+Usage: python benchmarks/bench_tunnel_codec.py [n_records]
+"""
+
+from __future__ import print_function
+
+import sys
+import time
+from datetime import datetime
+
+from odps.models import Schema
+from odps.types import Record
+from odps.tunnel import io
+from odps.tunnel.reader import TunnelReader
+from odps.tunnel.writer import TunnelWriter
+
+try:
+    from google.protobuf.internal import encoder as pb_encoder
+    from google.protobuf.internal import decoder as pb_decoder
+except ImportError:
+    pb_encoder = pb_decoder = None
+
+
+class LegacyProtobufWriter(io.ProtobufWriter):
+    def _pb_write(self, b):
+        self._data.extend(b)
+
+    def write_bool(self, field_num, val):
+        pb_encoder.BoolEncoder(field_num, False, False)(self._pb_write, val)
+        self.check_flush()
+
+    def write_uint32(self, field_num, val):
+        pb_encoder.UInt32Encoder(field_num, False, False)(self._pb_write, val)
+        self.check_flush()
+
+    def write_long(self, field_num, val):
+        pb_encoder.SInt64Encoder(field_num, False, False)(self._pb_write, val)
+        self.check_flush()
+
+    def write_double(self, field_num, val):
+        pb_encoder.DoubleEncoder(field_num, False, False)(self._pb_write, val)
+        self.check_flush()
+
+
+class LegacyProtobufReader(io.ProtobufReader):
+    _bytes = None
+
+    def _fill(self, size):
+        state = len(self._data), self._n_totals
+        super(LegacyProtobufReader, self)._fill(size)
+        # protobuf decoders need immutable bytes
+        if self._bytes is None or state != (len(self._data), self._n_totals):
+            self._bytes = bytes(self._data)
+
+    def _decode_value(self, decoder, new_default=None, size=None):
+        self._fill(size or self.MAX_VARINT_SIZE)
+        decode_dict = {}
+        decode = decoder(None, False, False, 'key', new_default)
+        self._curr_cursor = decode(self._bytes, self._curr_cursor, len(self._bytes),
+                                   None, decode_dict)
+        return decode_dict['key']
+
+    def read_uint32(self):
+        return self._decode_value(pb_decoder.UInt32Decoder)
+
+    def read_long(self):
+        return self._decode_value(pb_decoder.SInt64Decoder)
+
+    def read_double(self):
+        return self._decode_value(pb_decoder.DoubleDecoder, size=8)
+
+
+def gen_records(schema, n_records):
+    values = [12345678, 3.1415926, 'benchmark', datetime(2016, 1, 1, 12, 30, 45), True] * 4
+    return [Record(schema=schema, values=values) for _ in range(n_records)]
+
+
+def bench_write(schema, records, writer_cls=None):
+    chunks = []
+    writer = TunnelWriter(schema, lambda it: chunks.extend(it))
+    if writer_cls is not None:
+        writer._writer = writer_cls(buffer_size=writer._writer._buffer_size)
+
+    start = time.time()
+    for record in records:
+        writer.write(record)
+    writer.close()
+    elapsed = time.time() - start
+    return len(records) / elapsed, b''.join(chunks)
+
+
+def bench_read(schema, data, reader_cls=None):
+    reader = TunnelReader(schema, data)
+    if reader_cls is not None:
+        reader._reader = reader_cls(data)
+
+    start = time.time()
+    n_records = sum(1 for _ in reader)
+    elapsed = time.time() - start
+    return n_records / elapsed
+
+
+def main():
+    n_records = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    types = ['bigint', 'double', 'string', 'datetime', 'boolean'] * 4
+    schema = Schema.from_lists(['col%s' % i for i in range(len(types))], types)
+    records = gen_records(schema, n_records)
+
+    write_speed, data = bench_write(schema, records)
+    read_speed = bench_read(schema, data)
+    print('%-12s%18s%18s' % ('codec', 'write records/s', 'read records/s'))
+    print('%-12s%18.1f%18.1f' % ('wireformat', write_speed, read_speed))
+
+    if pb_encoder is not None:
+        legacy_write_speed, legacy_data = bench_write(schema, records, LegacyProtobufWriter)
+        assert legacy_data == data
+        legacy_read_speed = bench_read(schema, data, LegacyProtobufReader)
+        print('%-12s%18.1f%18.1f' % ('protobuf', legacy_write_speed, legacy_read_speed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Measure records/sec of TunnelWriter and TunnelReader on a wide table.
+
+Usage: python benchmarks/bench_tunnel_records.py [n_columns] [n_records]
+"""
+
+from __future__ import print_function
+
+import sys
+import time
+from datetime import datetime
+
+from odps.models import Schema
+from odps.types import Record
+from odps.tunnel.reader import TunnelReader
+from odps.tunnel.writer import TunnelWriter
+
+_TYPES = ['bigint', 'double', 'string', 'boolean', 'datetime']
+_VALUES = [12345678, 3.1415926, 'benchmark', True, datetime(2016, 1, 1, 12, 30, 45)]
+
+
+def main():
+    n_columns = int(sys.argv[1]) if len(sys.argv) > 1 else 120
+    n_records = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    types = [_TYPES[i % len(_TYPES)] for i in range(n_columns)]
+    values = [_VALUES[i % len(_VALUES)] for i in range(n_columns)]
+    schema = Schema.from_lists(['col%s' % i for i in range(n_columns)], types)
+    records = [Record(schema=schema, values=values) for _ in range(n_records)]
+
+    chunks = []
+    writer = TunnelWriter(schema, lambda it: chunks.extend(it))
+    start = time.time()
+    for record in records:
+        writer.write(record)
+    writer.close()
+    write_speed = n_records / (time.time() - start)
+
+    reader = TunnelReader(schema, b''.join(chunks))
+    start = time.time()
+    n_read = sum(1 for _ in reader)
+    read_speed = n_read / (time.time() - start)
+
+    print('%s columns, %s records' % (n_columns, n_records))
+    print('write: %.1f records/s' % write_speed)
+    print('read:  %.1f records/s' % read_speed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Coroutines to submit, wait for and read ODPS instances on an asyncio event loop,
+which requires Python 3.5+.
+
+REST requests are sent from a thread pool of at most ``options.async_concurrency``
+threads, which share the pooled HTTP sessions of the clients, while waiting for
+instances only takes timers of the event loop. Thus many instances can be waited
+for at the same time without a thread for each of them.
+
+:Example:
+
+>>> async def run_all(odps, sqls):
+>>>     instances = await asyncio.gather(*[odps.async_run_sql(sql) for sql in sqls])
+>>>     await asyncio.gather(*[instance.wait() for instance in instances])
+>>>
+>>> asyncio.get_event_loop().run_until_complete(run_all(odps, sqls))
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from . import utils
+from .config import options
+
+
+class AsyncExecutor(object):
+    """
+    Run blocking calls on a thread pool of at most ``concurrency`` threads
+    and await them on the event loop.
+    """
+
+    def __init__(self, concurrency=None):
+        self._concurrency = concurrency or options.async_concurrency
+        self._pool = ThreadPoolExecutor(max_workers=self._concurrency)
+
+    @property
+    def concurrency(self):
+        return self._concurrency
+
+    async def run(self, func, *args, **kwargs):
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self._pool, functools.partial(func, *args, **kwargs))
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait)
+
+
+_default_executor = None
+_default_executor_lock = threading.Lock()
+
+
+def get_default_executor():
+    """
+    Get the executor shared in the process.
+    """
+    global _default_executor
+
+    with _default_executor_lock:
+        if _default_executor is None:
+            _default_executor = AsyncExecutor()
+        return _default_executor
+
+
+async def run_sql(odps, sql, executor=None, **kwargs):
+    """
+    Submit the SQL, see :meth:`odps.ODPS.run_sql`.
+
+    :return: instance
+    """
+    executor = executor or get_default_executor()
+    return await executor.run(odps.run_sql, sql, **kwargs)
+
+
+async def wait_for_completion(instance, interval=1, max_interval=None, executor=None):
+    """
+    Wait for the instance to complete, the interval of checking grows
+    from ``interval`` up to ``max_interval`` seconds.
+    """
+    executor = executor or get_default_executor()
+    if max_interval is None:
+        max_interval = options.max_poll_interval
+    backoff = utils.Backoff(interval, max_interval)
+
+    while not await executor.run(instance.is_terminated):
+        await asyncio.sleep(backoff.next())
+
+
+async def wait_for_success(instance, interval=1, max_interval=None, executor=None):
+    """
+    Wait for the instance to complete, and check if the instance is successful.
+
+    :raise: :class:`odps.errors.ODPSError` if the instance failed
+    """
+    executor = executor or get_default_executor()
+    await wait_for_completion(instance, interval=interval, max_interval=max_interval,
+                              executor=executor)
+    # the instance has terminated, so this only checks the task statuses
+    await executor.run(instance.wait_for_success)
+
+
+async def execute_sql(odps, sql, executor=None, **kwargs):
+    """
+    Submit the SQL and wait until it succeeds, see :meth:`odps.ODPS.execute_sql`.
+
+    :return: instance
+    """
+    instance = await run_sql(odps, sql, executor=executor, **kwargs)
+    await wait_for_success(instance, executor=executor)
+    return instance
+
+
+def _read_all(open_reader, start, count, **kw):
+    with open_reader() as reader:
+        return list(reader.read(start=start, count=count, **kw))
+
+
+async def read_table(table, partition=None, start=None, count=None, executor=None, **kw):
+    """
+    Read records of the table through tunnel.
+
+    :param table: table to read
+    :param partition: partition of the table
+    :param start: start of the records
+    :param count: count of the records, default to the rest of the records
+    :param columns: the columns to read
+    :return: list of records
+    """
+    executor = executor or get_default_executor()
+    open_reader = functools.partial(table.open_reader, partition=partition, reopen=True,
+                                    endpoint=kw.pop('endpoint', None))
+    return await executor.run(_read_all, open_reader, start, count, **kw)
+
+
+async def read_instance(instance, start=None, count=None, executor=None, **kw):
+    """
+    Read records of the result of the SQL instance through the instance tunnel.
+
+    :param instance: SQL instance which has succeeded
+    :param start: start of the records
+    :param count: count of the records, default to the rest of the records
+    :return: list of records
+    """
+    executor = executor or get_default_executor()
+    open_reader = functools.partial(instance.open_reader, tunnel=True,
+                                    endpoint=kw.pop('endpoint', None))
+    return await executor.run(_read_all, open_reader, start, count, **kw)
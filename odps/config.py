@@ -23,10 +23,15 @@ import contextlib
 import six
 
 
-DEFAULT_CHUNK_SIZE = 1496
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+DEFAULT_UPLOAD_QUEUE_SIZE = 4
 DEFAULT_CONNECT_RETRY_TIMES = 4
 DEFAULT_CONNECT_TIMEOUT = 5
 DEFAULT_READ_TIMEOUT = 120
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_POOL_MAX_IDLE_TIME = 60
+DEFAULT_MAX_POLL_INTERVAL = 10
 
 
 class AttributeDict(dict):
@@ -145,12 +150,20 @@ options.register_option('log_view_host', None)
 options.register_option('log_view_hours', 24, validator=is_integer)
 options.register_option('tunnel_endpoint', None)
 options.register_option('biz_id', None)
+options.register_option('max_poll_interval', DEFAULT_MAX_POLL_INTERVAL, validator=is_integer)
+options.register_option('async_concurrency', DEFAULT_POOL_MAXSIZE, validator=is_integer)
 
 # network connections
 options.register_option('chunk_size', DEFAULT_CHUNK_SIZE, validator=is_integer)
+options.register_option('upload_queue_size', DEFAULT_UPLOAD_QUEUE_SIZE, validator=is_integer)
 options.register_option('retry_times', DEFAULT_CONNECT_RETRY_TIMES, validator=is_integer)
 options.register_option('connect_timeout', DEFAULT_CONNECT_TIMEOUT, validator=is_integer)
 options.register_option('read_timeout', DEFAULT_READ_TIMEOUT, validator=is_integer)
+options.register_option('keep_alive', True, validator=is_bool)
+options.register_option('pool_connections', DEFAULT_POOL_CONNECTIONS, validator=is_integer)
+options.register_option('pool_maxsize', DEFAULT_POOL_MAXSIZE, validator=is_integer)
+options.register_option('pool_max_idle_time', DEFAULT_POOL_MAX_IDLE_TIME,
+                        validator=any_validator(is_null, is_integer))
 
 # terminal
 options.register_option('console.max_lines', None)
@@ -163,6 +176,14 @@ options.register_option('verbose', False, validator=is_bool)
 options.register_option('verbose_log', None)
 options.register_option('df.analyze', True, validator=is_bool)
 options.register_option('df.use_cache', False, validator=is_bool)
+options.register_option('df.batch_size', 10000, validator=is_integer)
+options.register_option('df.use_instance_tunnel', True, validator=is_bool)
+options.register_option('df.compile_cache_size', 256, validator=is_integer)
+options.register_option('df.compile_cache_dir', None)
+options.register_option('df.local_memory_limit', None, validator=any_validator(is_null, is_integer))
+options.register_option('df.result_cache', None, validator=any_validator(is_null, is_in(['table', 'local'])))
+options.register_option('df.result_cache_dir', None)
+options.register_option('df.result_cache_lifecycle', 1, validator=is_integer)
 
 # PAI
 options.register_option('pai.temp_lifecycle', 1, validator=is_integer)
@@ -223,6 +223,10 @@ class ODPS(object):
         :param endpoint: tunnel service URL
         :param reopen: reading the table will reuse the session which opened last time,
                        if set to True will open a new download session, default as False
+        :param workers: if greater than 1, the records will be downloaded in parallel
+                        with this number of threads
+        :param ordered: if False when ``workers`` is greater than 1, records are yielded
+                        as soon as they are downloaded, default as True
         :return: records
         :rtype: generator
 
@@ -232,6 +236,8 @@ class ODPS(object):
         >>>     # deal with such 100 records
         >>> for record in odps.read_table('test_table', partition='pt=test', start=100, limit=100):
         >>>     # read the `pt=test` partition, skip 100 records and read 100 records
+        >>> for record in odps.read_table('test_table', workers=4):
+        >>>     # read all records with 4 threads
 
         .. seealso:: :class:`odps.models.Record`
         """
@@ -244,10 +250,12 @@ class ODPS(object):
 
         compress = kw.pop('compress', False)
         columns = kw.pop('columns', None)
+        workers = kw.pop('workers', None)
+        ordered = kw.pop('ordered', True)
 
         with table.open_reader(partition=partition, **kw) as reader:
-            for record in reader.read(start, limit, step=step,
-                                      compress=compress, columns=columns):
+            for record in reader.read(start, limit, step=step, compress=compress,
+                                      columns=columns, workers=workers, ordered=ordered):
                 yield record
 
     def write_table(self, name, *block_records, **kw):
@@ -649,6 +657,75 @@ class ODPS(object):
         return project.instances.create(task=task, priority=priority,
                                         running_cluster=running_cluster)
 
+    def async_run_sql(self, sql, project=None, priority=None, running_cluster=None, **kwargs):
+        """
+        Coroutine to run a given SQL statement asynchronously, requires Python 3.5+.
+
+        :param sql: SQL statement
+        :type sql: str
+        :param project: project name, if not provided, will be the default project
+        :param priority: instance priority, 9 as default
+        :type priority: int
+        :param running_cluster: cluster to run this instance
+        :return: instance
+        :rtype: :class:`odps.models.Instance`
+
+        :Example:
+
+        >>> instance = await odps.async_run_sql('select * from dual')
+        >>> await instance.wait()
+
+        .. seealso:: :mod:`odps.aio`
+        """
+        from . import aio
+
+        return aio.run_sql(self, sql, project=project, priority=priority,
+                           running_cluster=running_cluster, **kwargs)
+
+    def async_execute_sql(self, sql, project=None, priority=None, running_cluster=None, **kwargs):
+        """
+        Coroutine to run a given SQL statement and wait until it succeeds,
+        requires Python 3.5+.
+
+        :param sql: SQL statement
+        :type sql: str
+        :param project: project name, if not provided, will be the default project
+        :param priority: instance priority, 9 as default
+        :type priority: int
+        :param running_cluster: cluster to run this instance
+        :return: instance
+        :rtype: :class:`odps.models.Instance`
+
+        .. seealso:: :mod:`odps.aio`
+        """
+        from . import aio
+
+        return aio.execute_sql(self, sql, project=project, priority=priority,
+                               running_cluster=running_cluster, **kwargs)
+
+    def async_read_table(self, name, limit=None, start=0, project=None, partition=None, **kw):
+        """
+        Coroutine to read table's records through tunnel, requires Python 3.5+.
+
+        :param name: table or table name
+        :type name: :class:`odps.models.table.Table` or str
+        :param limit:  the records' size, if None will read all records from the table
+        :param start:  the record where read starts with
+        :param project: project name, if not provided, will be the default project
+        :param partition: the partition of this table to read
+        :param columns: the columns' names which are the parts of table's columns
+        :type columns: list
+        :return: list of records
+
+        .. seealso:: :mod:`odps.aio`
+        """
+        from . import aio
+
+        if not isinstance(name, six.string_types):
+            name = name.name
+        table = self.get_table(name, project=project)
+        return aio.read_table(table, partition=partition, start=start, count=limit, **kw)
+
     def list_xflows(self, project=None, owner=None):
         """
         List xflows of a project which can be filtered by the xflow owner.
@@ -17,10 +17,18 @@
 # specific language governing permissions and limitations
 # under the License.
 
+import struct
 import zlib
 
 import six
 
+try:
+    import crc32c as _crc32c_ext
+except ImportError:
+    _crc32c_ext = None
+
+from . import compat
+
 
 class Crc32(object):
     def __init__(self):
@@ -112,25 +120,120 @@ _CRC_TABLE = (
 _CRC_INIT = 0xffffffff
 
 
+def _gen_slicing_tables(n_tables=8):
+    tables = [_CRC_TABLE, ]
+    for _ in range(1, n_tables):
+        last = tables[-1]
+        tables.append(tuple((last[i] >> 8) ^ _CRC_TABLE[last[i] & 0xff]
+                            for i in range(256)))
+    return tables
+
+_CRC_TABLES = _gen_slicing_tables()
+
+# buffers shorter than this are not worth to unpack into words
+_SLICING_THRESHOLD = 16
+# every slice of 8 bytes is unpacked as one little-endian 32-bit word
+# followed by 4 single bytes, so that the later half needs no shifting
+_SLICE_GROUPS = 512
+_SLICE_STRUCT = struct.Struct('<' + 'I4B' * _SLICE_GROUPS)
+
+
+def _update_bytewise(crc, buf):
+    if not isinstance(buf, bytearray):
+        buf = bytearray(buf)
+
+    table = _CRC_TABLE
+    for b in buf:
+        crc = table[(crc ^ b) & 0xff] ^ (crc >> 8)
+    return crc
+
+
+def _update_slicing_by_8(crc, buf):
+    if not isinstance(buf, bytearray):
+        buf = bytearray(buf)
+
+    n_bytes = len(buf)
+    if n_bytes < _SLICING_THRESHOLD:
+        table = _CRC_TABLE
+        for b in buf:
+            crc = table[(crc ^ b) & 0xff] ^ (crc >> 8)
+        return crc
+
+    t0, t1, t2, t3, t4, t5, t6, t7 = _CRC_TABLES
+
+    n_slices = n_bytes >> 3
+    off = 0
+    while n_slices > 0:
+        n_groups = min(n_slices, _SLICE_GROUPS)
+        if n_groups == _SLICE_GROUPS:
+            values = _SLICE_STRUCT.unpack_from(buf, off)
+        else:
+            values = struct.unpack_from('<' + 'I4B' * n_groups, buf, off)
+
+        it = iter(values)
+        for lo, b4, b5, b6, b7 in zip(it, it, it, it, it):
+            crc ^= lo
+            crc = t7[crc & 0xff] ^ t6[(crc >> 8) & 0xff] ^ \
+                t5[(crc >> 16) & 0xff] ^ t4[crc >> 24] ^ \
+                t3[b4] ^ t2[b5] ^ t1[b6] ^ t0[b7]
+
+        off += n_groups << 3
+        n_slices -= n_groups
+
+    if off < n_bytes:
+        crc = _update_bytewise(crc, buf[off:])
+    return crc
+
+
+def _update_native(crc, buf):
+    # the native module accepts and returns finalized values
+    return _crc32c_ext.crc32c(bytes(buf), crc ^ 0xffffffff) ^ 0xffffffff
+
+
+_CRC32C_BACKENDS = compat.OrderedDict([
+    ('bytewise', _update_bytewise),
+    ('slicing_by_8', _update_slicing_by_8),
+])
+if _crc32c_ext is not None:
+    _CRC32C_BACKENDS['native'] = _update_native
+
+
+def crc32c_backends():
+    """
+    Names of CRC32C backends available in current environment,
+    the last one is the fastest and is used by default.
+    """
+    return compat.lkeys(_CRC32C_BACKENDS)
+
+
+def get_crc32c_backend(name=None):
+    if name is None:
+        name = crc32c_backends()[-1]
+    if name not in _CRC32C_BACKENDS:
+        raise ValueError('Unknown or unavailable CRC32C backend: %s' % name)
+    return _CRC32C_BACKENDS[name]
+
+
 class Crc32c(object):
 
-    def __init__(self):
+    def __init__(self, backend=None):
         self.crc = _CRC_INIT
+        self._update = get_crc32c_backend(backend)
 
-    def update(self, buf, off, length):
+    def update(self, buf, off=None, length=None):
         """
         :param buf: buf to update
         :type buf: bytearray
         :param off: offset
         :param length: length
         """
-        to_crc = buf[off: off+length]
+        off = off or 0
+        if length is None:
+            length = len(buf) - off
+        if off != 0 or length != len(buf):
+            buf = buf[off: off+length]
 
-        crc = self.crc
-        for b in to_crc:
-            table_index = (crc ^ b) & 0xff
-            crc = (_CRC_TABLE[table_index] ^ (crc >> 8)) & 0xffffffff
-        self.crc = crc & 0xffffffff
+        self.crc = self._update(self.crc, buf) & 0xffffffff
 
     def reset(self):
         self.crc = _CRC_INIT
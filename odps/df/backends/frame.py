@@ -17,25 +17,193 @@
 # specific language governing permissions and limitations
 # under the License.
 
+import array
 import itertools
 
 import six
 from six.moves.builtins import zip
 from six import StringIO
+try:
+    import numpy as np
+    has_numpy = True
+except ImportError:
+    has_numpy = False
 try:
     import pandas as pd
     has_pandas = True
 except ImportError:
     has_pandas = False
 
-from ...compat import u
+from ... import types as odps_types
+from ...compat import u, OrderedDict
 from ...config import options
 from ...console import get_console_size, in_interactive_session, \
     in_ipython_frontend, in_qtconsole
+from .. import types as df_types
 from . import formatter as fmt
 
 
+def _get_typecode(data_type):
+    if isinstance(data_type, df_types.Integer) or data_type == odps_types.bigint:
+        return 'q'
+    if isinstance(data_type, df_types.Float) or data_type == odps_types.double:
+        return 'd'
+
+
+class ResultColumns(object):
+    """
+    Collect values of a result into columns record by record.
+
+    Bigint and double values are kept in compact typed arrays rather than
+    lists of Python objects, and NumPy arrays or pandas DataFrames are created
+    from these arrays without copying them.
+
+    :param columns: columns of the result
+
+    :Example:
+
+    >>> data = ResultColumns(schema.columns)
+    >>> for record in reader:
+    >>>     data.append(record.values)
+    >>> frame = ResultFrame(data, schema=schema)
+    """
+
+    def __init__(self, columns):
+        self._columns = columns
+        self._typecodes = [_get_typecode(col.type) for col in columns]
+        self._data = [array.array(tc) if tc else [] for tc in self._typecodes]
+        self._appends = [d.append for d in self._data]
+        # indexes of nulls in typed arrays
+        self._nulls = [[] for _ in columns]
+        self._count = 0
+
+    @property
+    def columns(self):
+        return self._columns
+
+    def __len__(self):
+        return self._count
+
+    def _to_list_column(self, i):
+        values = self._data[i].tolist()
+        for idx in self._nulls[i]:
+            values[idx] = None
+        self._typecodes[i] = None
+        self._data[i] = values
+        self._appends[i] = values.append
+        self._nulls[i] = []
+
+    def append(self, values):
+        """
+        Append values of a record.
+        """
+        if len(values) != len(self._columns):
+            raise ValueError('Expect %s values, got %s' % (len(self._columns), len(values)))
+
+        for i, append, val in zip(itertools.count(), self._appends, values):
+            if val is None and self._typecodes[i] is not None:
+                self._nulls[i].append(self._count)
+                val = 0
+            try:
+                append(val)
+            except (TypeError, OverflowError):
+                # values which cannot be held by the typed array
+                self._to_list_column(i)
+                self._appends[i](val)
+        self._count += 1
+
+    def extend(self, rows):
+        for values in rows:
+            self.append(values)
+
+    def _to_numpy_column(self, i):
+        data, nulls = self._data[i], self._nulls[i]
+        if self._typecodes[i] is None:
+            # let pandas infer the type of the column
+            return pd.Series(data).values
+        arr = np.frombuffer(data, dtype='int64' if self._typecodes[i] == 'q' else 'float64')
+        if nulls:
+            arr = arr.astype('float64')
+            arr[nulls] = np.nan
+        return arr
+
+    def to_columns(self, pandas=False):
+        """
+        Get the columns. Each column is a NumPy array when ``pandas`` is True,
+        otherwise a typed array if the column holds no null, else a list.
+        The collected data are released after calling.
+        """
+        result = []
+        for i in range(len(self._columns)):
+            if pandas:
+                result.append(self._to_numpy_column(i))
+            elif self._nulls[i]:
+                self._to_list_column(i)
+                result.append(self._data[i])
+            else:
+                result.append(self._data[i])
+            # release the data as soon as the column is converted
+            self._data[i] = None
+        self._appends = None
+        return result
+
+
+def iter_result_batches(records, columns, batch_size, batch_format='pandas'):
+    """
+    Group records into batches of at most ``batch_size`` records. Each batch
+    is a pandas DataFrame if ``batch_format`` is ``pandas``, otherwise a list
+    of records.
+    """
+    pandas = batch_format == 'pandas'
+    offsets = [0]
+
+    def to_batch(batch):
+        start = offsets[0]
+        offsets[0] += len(batch)
+        if pandas:
+            # indexes of DataFrames continue across batches
+            return ResultFrame(batch, columns=columns,
+                               index=pd.RangeIndex(start, start + len(batch))).values
+        return batch
+
+    batch = ResultColumns(columns) if pandas else []
+    for record in records:
+        batch.append(getattr(record, 'values', record) if pandas else record)
+        if len(batch) >= batch_size:
+            yield to_batch(batch)
+            batch = ResultColumns(columns) if pandas else []
+    if len(batch) > 0:
+        yield to_batch(batch)
+
+
+def _create_pandas_frame(names, arrays, index=None):
+    """
+    Create a pandas DataFrame whose columns are the given NumPy arrays,
+    which are not copied if the version of pandas allows.
+    """
+    if index is None:
+        n_rows = len(arrays[0]) if arrays else 0
+        index = pd.RangeIndex(n_rows)
+    return pd.DataFrame(OrderedDict(zip(names, arrays)), columns=names, index=index, copy=False)
+
+
+def _concat_column(col, other):
+    if type(col) == type(other) and getattr(col, 'typecode', None) == \
+            getattr(other, 'typecode', None):
+        return col + other
+    return list(col) + list(other)
+
+
 class ResultFrame(six.Iterator):
+    """
+    Result of an expression.
+
+    The data can be given as rows, which are records or lists of values,
+    as a :class:`ResultColumns` or as a dict of column names to columns.
+    Values are held by columns, as a pandas DataFrame if pandas is installed
+    and ``pandas`` is True, otherwise as a list of columns.
+    """
+
     def __init__(self, data, columns=None, schema=None, index=None, pandas=True):
         if columns is None and schema is None:
             raise ValueError('Either columns or schema should be provided')
@@ -44,26 +212,43 @@ class ResultFrame(six.Iterator):
             columns = schema.columns
 
         self._columns = columns
-        self._index = index
-
-        if has_pandas and pandas:
-            self._values = pd.DataFrame([self._get_values(r) for r in data],
-                                        columns=[col.name for col in self._columns],
-                                        index=index)
-            self._index = self._values.index
-            self._pandas = True
-        else:
-            if self._index is None:
-                self._index = []
-                self._values = []
-                for i, r in zip(itertools.count(0), data):
-                    self._values.append(self._get_values(r))
-                    self._index.append(i)
+        self._pandas = has_pandas and pandas
+
+        names = [col.name for col in self._columns]
+        if isinstance(data, dict):
+            data = [data[name] for name in names]
+            if self._pandas:
+                data = [pd.Series(d).values for d in data]
             else:
-                self._values = list(self._get_values(r) for r in data)
-            self._pandas = False
+                data = [d if hasattr(d, '__getitem__') else list(d) for d in data]
+        else:
+            if not isinstance(data, ResultColumns):
+                rows, data = data, ResultColumns(self._columns)
+                data.extend(self._get_values(r) for r in rows)
+            data = data.to_columns(pandas=self._pandas)
+
+        if self._pandas:
+            self._data = _create_pandas_frame(names, data, index=index)
+            self._index = self._data.index
+        else:
+            self._data = data
+            n_rows = len(data[0]) if data else len(index if index is not None else [])
+            self._index = list(index) if index is not None else list(range(n_rows))
 
         self._cursor = -1
+        # rows built from the columns when pandas is not used
+        self._rows = None
+
+    @classmethod
+    def _from_columns(cls, data, columns, index):
+        frame = cls.__new__(cls)
+        frame._columns = columns
+        frame._pandas = False
+        frame._data = data
+        frame._index = index
+        frame._cursor = -1
+        frame._rows = None
+        return frame
 
     def _get_values(self, r):
         if hasattr(r, 'values'):
@@ -80,40 +265,56 @@ class ResultFrame(six.Iterator):
 
     @property
     def values(self):
-        return self._values
+        """
+        A pandas DataFrame if pandas is used, otherwise a list of rows.
+        """
+        if self._pandas:
+            return self._data
+        if self._rows is None:
+            if not self._data:
+                self._rows = [[] for _ in self._index]
+            else:
+                self._rows = [list(r) for r in zip(*self._data)]
+        return self._rows
+
+    _values = values
+
+    def _row(self, i):
+        return [col[i] for col in self._data]
+
+    def _sub_frame(self, rows, columns):
+        return self._from_columns([self._data[i][rows] for i in columns],
+                                  [self._columns[i] for i in columns], self._index[rows])
 
     def __getitem__(self, item):
+        if self._pandas:
+            if isinstance(item, (six.integer_types, slice)) or \
+                    (isinstance(item, tuple) and len(item) == 2):
+                return self._data.iloc[item]
+            return
+
+        all_columns = list(range(len(self._columns)))
         if isinstance(item, six.integer_types):
-            if self._pandas:
-                return self._values.iloc[item]
-            else:
-                return self._values[item]
+            return self._row(item)
         elif isinstance(item, slice):
-            if self._pandas:
-                return self._values.iloc[item]
-            else:
-                return ResultFrame(self._values[item], columns=self._columns,
-                                   index=self._index[item], pandas=self._pandas)
+            return self._sub_frame(item, all_columns)
         elif isinstance(item, tuple) and len(item) == 2:
-            if self._pandas:
-                return self._values.iloc[item]
+            rows, cols = item
+            if isinstance(cols, slice):
+                return self._sub_frame(rows, all_columns[cols])
             else:
-                if isinstance(item[1], slice):
-                    frame = self[item[0]]
-                    values = [r[item[1]] for r in frame._values]
-                    return ResultFrame(values, columns=self._columns[item[1]],
-                                       index=frame._index, pandas=self._pandas)
-                else:
-                    values = [r[item[1]] for r in self[item[0]]._values]
-                    return values
+                values = self._data[cols][rows]
+                return list(values) if isinstance(rows, slice) else values
 
     def __next__(self):
         self._cursor += 1
         try:
             if self._pandas:
-                return self._values.iloc[self._cursor]
+                return self._data.iloc[self._cursor]
             else:
-                return self._values[self._cursor]
+                if self._cursor >= len(self._index):
+                    raise IndexError
+                return self._row(self._cursor)
         except IndexError:
             raise StopIteration
 
@@ -135,23 +336,23 @@ class ResultFrame(six.Iterator):
                     raise ValueError(
                         'Cannot concat two frame of different columns')
 
-                return ResultFrame(self._values + frame._values, columns=self._columns,
-                                   index=self._index + frame._index, pandas=self._pandas)
+                data = [_concat_column(col, other)
+                        for col, other in zip(self._data, frame._data)]
+                return self._from_columns(data, self._columns, self._index + frame._index)
             else:
                 if self._index != frame._index:
                     raise ValueError(
                         'Cannot concat two frames of different indexes')
 
-                values = [val+other for val, other in zip(self._values, frame._values)]
-                return ResultFrame(values, self._columns + frame._columns,
-                                   index=self._index, pandas=self._pandas)
+                return self._from_columns(self._data + frame._data,
+                                          self._columns + frame._columns, self._index)
 
     @property
     def dtypes(self):
         return [it.type for it in self._columns]
 
     def __len__(self):
-        return len(self._values)
+        return len(self._index)
 
     def _repr_fits_vertical_(self):
         """
@@ -221,7 +422,7 @@ class ResultFrame(six.Iterator):
         py2/py3.
         """
         if self._pandas:
-            return repr(self._values)
+            return repr(self._data)
 
         buf = StringIO(u(""))
 
@@ -249,7 +450,7 @@ class ResultFrame(six.Iterator):
         # display HTML, so this check can be removed when support for IPython 2.x
         # is no longer needed.
         if self._pandas:
-            return self._values._repr_html_()
+            return self._data._repr_html_()
 
         if in_qtconsole():
             # 'HTML output is disabled in QtConsole'
@@ -0,0 +1,372 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import base64
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+import six
+
+from ....compat import OrderedDict
+from ....config import options
+from ....errors import DependencyNotInstalledError
+from ...expr.utils import _digest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class CompileCacheEntry(object):
+    """
+    Compiled result of an expression.
+
+    :ivar sql: the compiled SQL
+    :ivar udfs: list of UDF names referred by the SQL and their code
+    """
+    __slots__ = 'sql', 'udfs'
+
+    def __init__(self, sql=None, udfs=None):
+        self.sql = sql
+        self.udfs = udfs or []
+
+
+class CompileCache(object):
+    """
+    LRU cache of compiled SQL keyed by the structural hash of expressions,
+    so that expressions rebuilt in the same way are not compiled again.
+
+    Only the SQL and the code of its UDFs are kept, expressions are never
+    shared, because they refer to the tables of the clients they are built with.
+
+    The compiled SQL is also saved into ``options.df.compile_cache_dir``
+    if specified, which is shared between processes.
+    """
+
+    def __init__(self, size=None, cache_dir=None):
+        self._size = size
+        self._cache_dir = cache_dir
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def size(self):
+        return self._size if self._size is not None else options.df.compile_cache_size
+
+    @property
+    def cache_dir(self):
+        return self._cache_dir if self._cache_dir is not None else options.df.compile_cache_dir
+
+    @property
+    def enabled(self):
+        return self.size > 0
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, '%s.json' % key)
+
+    def _load(self, key):
+        if self.cache_dir is None:
+            return
+        try:
+            with open(self._path(key)) as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return
+        return CompileCacheEntry(sql=data['sql'], udfs=[tuple(it) for it in data['udfs']])
+
+    def _save(self, key, entry):
+        if self.cache_dir is None:
+            return
+        try:
+            if not os.path.exists(self.cache_dir):
+                os.makedirs(self.cache_dir)
+            # write into a temporary file first, so that no partial file is read
+            tmp_path = self._path('%s.%s' % (key, uuid.uuid4().hex))
+            with open(tmp_path, 'w') as f:
+                json.dump(dict(sql=entry.sql, udfs=entry.udfs), f)
+            if os.path.exists(self._path(key)):
+                os.remove(self._path(key))
+            os.rename(tmp_path, self._path(key))
+        except (IOError, OSError):
+            pass
+
+    def get(self, key):
+        """
+        :return: the entry of the key, None if not cached
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                entry = self._load(key)
+            if entry is None:
+                return
+            self._entries[key] = entry
+            return entry
+
+    def get_sql(self, key):
+        """
+        :return: tuple of the SQL and its UDFs, None if not cached
+        """
+        entry = self.get(key)
+        with self._lock:
+            if entry is None or entry.sql is None:
+                self.misses += 1
+                return
+            self.hits += 1
+            return entry.sql, entry.udfs
+
+    def put_sql(self, key, sql, udfs=None):
+        with self._lock:
+            self._entries.pop(key, None)
+            entry = self._entries[key] = CompileCacheEntry(sql, list(udfs or []))
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+            self._save(key, entry)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return float(self.hits) / total if total else 0.0
+
+    def stats(self):
+        """
+        :return: dict of the numbers of hits, misses, entries and the hit rate
+        """
+        with self._lock:
+            return dict(hits=self.hits, misses=self.misses,
+                        entries=len(self._entries), hit_rate=self.hit_rate)
+
+
+compile_cache = CompileCache()
+
+
+class ResultCache(object):
+    """
+    Cache of execution results keyed by the structural hash of expressions and
+    the versions of their source tables and partitions, so that an expression
+    executed again is not run on ODPS until its source data are modified.
+
+    By ``options.df.result_cache``, results are kept as ODPS tables with the
+    lifecycle of ``options.df.result_cache_lifecycle`` days if set as ``table``,
+    or as npz files in ``options.df.result_cache_dir`` if set as ``local``.
+    Both of them are shared between sessions.
+
+    Local files are kept in ``~/.pyodps/result_cache`` by default, the directory
+    is only accessible by the current user, and files not owned by the user are
+    never loaded. Values which are not numbers are encoded as JSON instead of
+    being pickled.
+    """
+
+    TABLE_PREFIX = 'pyodps_result_cache_'
+
+    def __init__(self, cache_dir=None):
+        self._cache_dir = cache_dir
+        self._lock = threading.RLock()
+
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def mode(self):
+        return options.df.result_cache
+
+    @property
+    def enabled(self):
+        return self.mode is not None
+
+    @property
+    def cache_dir(self):
+        if self._cache_dir is not None:
+            return self._cache_dir
+        if options.df.result_cache_dir is not None:
+            return options.df.result_cache_dir
+        return os.path.join(os.path.expanduser('~'), '.pyodps', 'result_cache')
+
+    @classmethod
+    def get_key(cls, expr_key, versions):
+        """
+        :param expr_key: structural hash of the expression
+        :param versions: list of tuples of names of the source tables or partitions
+                         and their last modified time
+        """
+        return _digest([expr_key] + ['%s@%s' % it for it in sorted(versions)])
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def table_name(self, key):
+        return self.TABLE_PREFIX + key
+
+    def get_table(self, odps, key):
+        """
+        :return: the table holding the result of the key, None if not cached
+        """
+        name = self.table_name(key)
+        exists = odps.exist_table(name)
+        self._count(exists)
+        return odps.get_table(name) if exists else None
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, '%s.npz' % key)
+
+    @classmethod
+    def _is_owned(cls, path):
+        if not hasattr(os, 'getuid'):
+            return True
+        return os.stat(path).st_uid == os.getuid()
+
+    @classmethod
+    def _encode_value(cls, value):
+        if value is None:
+            return None
+        if isinstance(value, bool):
+            return ['b', value]
+        if isinstance(value, six.integer_types):
+            # integers beyond 64 bits are kept as strings
+            return ['i', str(value)]
+        if isinstance(value, float):
+            return ['f', repr(value)]
+        if isinstance(value, Decimal):
+            return ['d', str(value)]
+        if isinstance(value, datetime):
+            return ['t', value.strftime('%Y-%m-%d %H:%M:%S.%f')]
+        if isinstance(value, six.binary_type):
+            return ['y', base64.b64encode(value).decode('ascii')]
+        if isinstance(value, six.text_type):
+            return ['s', value]
+        raise TypeError('Cannot cache value of type %s' % type(value).__name__)
+
+    @classmethod
+    def _decode_value(cls, value):
+        if value is None:
+            return None
+        tag, data = value
+        if tag == 'b':
+            return data
+        if tag == 'i':
+            return int(data)
+        if tag == 'f':
+            return float(data)
+        if tag == 'd':
+            return Decimal(data)
+        if tag == 't':
+            return datetime.strptime(data, '%Y-%m-%d %H:%M:%S.%f')
+        if tag == 'y':
+            return base64.b64decode(data.encode('ascii'))
+        if tag == 's':
+            return data
+        raise ValueError('Unknown tag of cached value: %s' % tag)
+
+    def load(self, key):
+        """
+        :return: list of the result columns of the key, None if not cached or expired
+        """
+        if np is None:
+            raise DependencyNotInstalledError('numpy library is required to cache results locally')
+
+        path = self._path(key)
+        try:
+            if not self._is_owned(path):
+                raise IOError('Result cache not owned by current user: %s' % path)
+            if time.time() - os.path.getmtime(path) > options.df.result_cache_lifecycle * 86400:
+                os.remove(path)
+                raise IOError('Result cache expired: %s' % path)
+            with open(path, 'rb') as f:
+                data = np.load(f, allow_pickle=False)
+                columns = []
+                for i in range(len(data.files) // 2):
+                    kind, arr = data['kind_%d' % i], data['col_%d' % i]
+                    if kind.item() == 'json':
+                        columns.append([self._decode_value(v) for v in json.loads(arr.item())])
+                    else:
+                        columns.append(arr.tolist())
+        except (IOError, OSError, ValueError, KeyError, TypeError):
+            self._count(False)
+            return
+        self._count(True)
+        return columns
+
+    def save(self, key, columns):
+        """
+        Save the result columns of the key, values not held by typed arrays are
+        encoded as JSON.
+        """
+        if np is None:
+            raise DependencyNotInstalledError('numpy library is required to cache results locally')
+
+        arrays = dict()
+        try:
+            for i, col in enumerate(columns):
+                if getattr(col, 'typecode', None) is not None:
+                    arrays['kind_%d' % i], arrays['col_%d' % i] = np.array('typed'), np.array(col)
+                else:
+                    encoded = json.dumps([self._encode_value(v) for v in col])
+                    arrays['kind_%d' % i], arrays['col_%d' % i] = np.array('json'), np.array(encoded)
+        except TypeError:
+            # values which cannot be encoded are not cached
+            return
+        try:
+            if not os.path.exists(self.cache_dir):
+                os.makedirs(self.cache_dir, 0o700)
+            # write into a temporary file first, so that no partial file is read
+            tmp_path = self._path('%s.%s' % (key, uuid.uuid4().hex))
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, **arrays)
+            if os.path.exists(self._path(key)):
+                os.remove(self._path(key))
+            os.rename(tmp_path, self._path(key))
+        except (IOError, OSError):
+            pass
+
+    def clear_stats(self):
+        with self._lock:
+            self.hits = self.misses = 0
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return float(self.hits) / total if total else 0.0
+
+    def stats(self):
+        """
+        :return: dict of the numbers of hits, misses and the hit rate
+        """
+        with self._lock:
+            return dict(hits=self.hits, misses=self.misses, hit_rate=self.hit_rate)
+
+
+result_cache = ResultCache()
@@ -30,7 +30,9 @@ from ...expr.window import CumSum
 from ...expr import element
 from ...expr import strings
 from ...expr import datetimes
+from ...expr.utils import structural_hash, UnhashableExpr
 from ... import types as df_types
+from ....compat import OrderedDict
 from . import types
 from ..core import Backend
 from .... import utils
@@ -116,6 +118,13 @@ class OdpsSQLCompiler(Backend):
         # of the `join` or `union` node.
         self._callbacks = list()
 
+        # branches of `join` or `union` which are referred more than once,
+        # by the same expression or structurally equal ones, are compiled only once
+        # and referred by name in the `WITH` clause
+        self._branch_keys = dict()
+        self._shared_keys = set()
+        self._ctes = OrderedDict()
+
         self._re_init()
 
     def _re_init(self):
@@ -134,6 +143,79 @@ class OdpsSQLCompiler(Backend):
             callback()
         self._callbacks = list()
 
+        self._branch_keys = dict()
+        self._shared_keys = set()
+        self._ctes = OrderedDict()
+
+    @classmethod
+    def _iter_branches(cls, expr):
+        if isinstance(expr, JoinCollectionExpr):
+            # chained joins are not compiled as subqueries
+            if not cls._is_source_table(expr.lhs) and \
+                    not isinstance(expr.lhs, JoinCollectionExpr):
+                yield expr.lhs
+            if not cls._is_source_table(expr.rhs):
+                yield expr.rhs
+        elif isinstance(expr, UnionCollectionExpr):
+            yield expr.lhs
+            yield expr.rhs
+
+    def _find_shared_branches(self, expr):
+        counts = defaultdict(lambda: 0)
+        for node in expr.traverse(unique=True):
+            for branch in self._iter_branches(node):
+                key = self._branch_keys.get(id(branch))
+                if key is None:
+                    try:
+                        key = structural_hash(branch)
+                    except UnhashableExpr:
+                        key = 'id:%s' % id(branch)
+                    self._branch_keys[id(branch)] = key
+                counts[key] += 1
+
+        self._shared_keys = set(key for key, count in counts.items() if count > 1)
+
+    def _compile_branch(self, expr):
+        """
+        Compile a branch of `join` or `union`.
+
+        :return: tuple of the compiled SQL and the name of the `WITH` clause
+                 if the branch is shared, else None
+        """
+        key = self._branch_keys.get(id(expr))
+        if key not in self._shared_keys:
+            return self._compile(expr), None
+
+        if key not in self._ctes:
+            compiled = self._compile(expr)
+            self._ctes[key] = (self._ctx.new_alias_table_name(), compiled)
+        name = self._ctes[key][0]
+        return 'SELECT * \nFROM {0}'.format(name), name
+
+    def _compile_ctes(self, sql):
+        if not self._ctes:
+            return sql
+
+        ctes = ['{0} AS (\n{1}\n)'.format(name, utils.indent(compiled, self._indent_size))
+                for name, compiled in self._ctes.values()]
+        return 'WITH \n{0}\n{1}'.format(
+            utils.indent(',\n'.join(ctes), self._indent_size), sql)
+
+    @classmethod
+    def insert_before_query(cls, sql, statement):
+        """
+        Insert the statement, like `INSERT OVERWRITE TABLE`, before the query
+        of the compiled SQL, after the `WITH` clause if any.
+        """
+        if not sql.startswith('WITH '):
+            return '{0} \n{1}'.format(statement, sql)
+
+        lines = sql.split('\n')
+        # clauses of `WITH` are indented, the query starts at the first line without indentation
+        idx = next(i for i, line in enumerate(lines)
+                   if i > 0 and line and not line[0].isspace())
+        return '\n'.join(lines[:idx] + [statement] + lines[idx:])
+
     @classmethod
     def _need_recursive_handle_in_expr(cls, node):
         return isinstance(node, (element.IsIn, element.NotIn)) and \
@@ -160,11 +242,11 @@ class OdpsSQLCompiler(Backend):
         return False
 
     def _compile_union_node(self, expr, traversed):
-        compiled = self._compile(expr.lhs)
+        compiled, _ = self._compile_branch(expr.lhs)
 
         self._sub_compiles[expr].append(compiled)
 
-        compiled = self._compile(expr.rhs)
+        compiled, _ = self._compile_branch(expr.rhs)
         self._sub_compiles[expr].append(compiled)
 
         cached_args = expr.args
@@ -175,23 +257,24 @@ class OdpsSQLCompiler(Backend):
 
         expr._cached_args = [None] * len(expr.args)
 
+    def _compile_join_branch(self, expr):
+        compiled, name = self._compile_branch(expr)
+        alias = self._ctx.get_collection_alias(expr, True)[0]
+        if name is not None:
+            return '{0} {1}'.format(name, alias)
+        return '(\n{0}\n) {1}'.format(utils.indent(compiled, self._indent_size), alias)
+
     def _compile_join_node(self, expr, traversed):
-        compiled = self._compile(expr.lhs)
         if not self._is_source_table(expr.lhs) and not isinstance(expr.lhs, JoinCollectionExpr):
-            self._sub_compiles[expr].append(
-                '(\n{0}\n) {1}'.format(utils.indent(compiled, self._indent_size),
-                                     self._ctx.get_collection_alias(expr.lhs, True)[0])
-            )
+            self._sub_compiles[expr].append(self._compile_join_branch(expr.lhs))
         else:
+            self._compile(expr.lhs)
             self._sub_compiles[expr].append(self._ctx.get_expr_compiled(expr.lhs))
 
-        compiled = self._compile(expr.rhs)
         if not self._is_source_table(expr.rhs):
-            self._sub_compiles[expr].append(
-                '(\n{0}\n) {1}'.format(utils.indent(compiled, self._indent_size),
-                                     self._ctx.get_collection_alias(expr.rhs, True)[0])
-            )
+            self._sub_compiles[expr].append(self._compile_join_branch(expr.rhs))
         else:
+            self._compile(expr.rhs)
             self._sub_compiles[expr].append(self._ctx.get_expr_compiled(expr.rhs))
 
         self._compile(expr.predicate, traversed)
@@ -252,7 +335,8 @@ class OdpsSQLCompiler(Backend):
 
     def compile(self, expr):
         try:
-            return self._compile(expr)
+            self._find_shared_branches(expr)
+            return self._compile_ctes(self._compile(expr))
         finally:
             self._cleanup()
 
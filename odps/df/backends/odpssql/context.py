@@ -19,6 +19,7 @@
 
 import itertools
 import random
+import re
 import time
 import weakref
 
@@ -30,6 +31,7 @@ from ....compat import OrderedDict
 UDF_CLASS_NAME = 'PyOdpsFunc'
 
 _replaced_exprs = weakref.WeakKeyDictionary()
+_cache_keys = weakref.WeakKeyDictionary()
 
 
 class ODPSContext(object):
@@ -84,6 +86,38 @@ class ODPSContext(object):
     def get_udf(self, func):
         return self._registered_funcs[func]
 
+    def get_udf_codes(self):
+        """
+        :return: list of the names of the registered UDFs and their code
+        """
+        return [(self._registered_funcs[func], udf)
+                for func, udf in six.iteritems(self._func_to_udfs)]
+
+    def restore_udfs(self, sql, udfs):
+        """
+        Register the UDFs of a cached SQL under new names, because the functions
+        are dropped once executed.
+
+        :param sql: the cached SQL
+        :param udfs: list of the names of the UDFs and their code
+        :return: the SQL which refers to the new names
+        """
+        func_to_udfs = OrderedDict()
+        new_names = dict()
+        for name, udf in udfs:
+            new_name = self._gen_udf_name()
+            new_names[name] = new_name
+            func_to_udfs[new_name] = udf
+            self._registered_funcs[new_name] = new_name
+        self._func_to_udfs = func_to_udfs
+        if not new_names:
+            return sql
+
+        # one name may be the prefix of another, so replace whole identifiers in one pass
+        names = sorted(new_names, key=len, reverse=True)
+        pattern = re.compile(r'\b(%s)\b' % '|'.join(re.escape(name) for name in names))
+        return pattern.sub(lambda m: new_names[m.group(1)], sql)
+
     def create_udfs(self):
         self._func_to_functions.clear()
 
@@ -102,6 +136,12 @@ class ODPSContext(object):
     def get_replaced_expr(self, expr):
         return _replaced_exprs.get(expr)
 
+    def add_cache_key(self, expr, key):
+        _cache_keys[expr] = key
+
+    def get_cache_key(self, expr):
+        return _cache_keys.get(expr)
+
     def _drop_function(self, func):
         for resource in func.resources:
             resource.drop()
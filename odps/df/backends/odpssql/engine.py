@@ -19,23 +19,35 @@
 
 import time
 import sys
-
-from ....errors import ODPSError
-from ....utils import init_progress_bar
-from ....models import Schema, Partition
+import contextlib
+from collections import deque
+
+from ....errors import ODPSError, DependencyNotInstalledError
+from ....utils import init_progress_bar, Backoff
+from ....models import Schema, Partition, Table
+from ....tunnel.errors import TunnelError
+from .... import readers
 from ...core import DataFrame
 from ...expr.reduction import *
 from ...expr.arithmetic import And, Equal
+from ...expr.expressions import SliceCollectionExpr
+from ...expr.collections import SortedCollectionExpr
+from ...expr.utils import structural_hash, UnhashableExpr
 from ..core import Engine
-from ..frame import ResultFrame
+from ..utils import log, table_source_partitions
+from ..frame import ResultFrame, ResultColumns, iter_result_batches, has_pandas
 from . import types
 from . import analyzer as ana
 from .context import ODPSContext, UDF_CLASS_NAME
+from .cache import compile_cache, result_cache
 from .compiler import OdpsSQLCompiler
 from .codegen import gen_udf
 
 
 class ODPSEngine(Engine):
+    # seconds between two fetches of task progress
+    PROGRESS_INTERVAL = 5
+
     def __init__(self, odps):
         self._odps = odps
         self._ctx = ODPSContext(self._odps)
@@ -50,13 +62,8 @@ class ODPSEngine(Engine):
         else:
             return 0
 
-    @classmethod
-    def _to_stdout(cls, msg):
-        print(msg)
-
     def _log(self, msg):
-        if options.verbose:
-            (options.verbose_log or self._to_stdout)(msg)
+        log(msg)
 
     @classmethod
     def _is_source_table(cls, expr):
@@ -69,19 +76,25 @@ class ODPSEngine(Engine):
         self._log('logview:')
         self._log(self._odps.get_logview_address(instance.id, 24))
         try:
+            backoff = Backoff(1, options.max_poll_interval)
             percent = 0
+            task_names = []
+            last_progress_time = 0
             while not instance.is_terminated():
-                task_names = instance.get_task_names()
-                last_percent = percent
-                if len(task_names) > 0:
-                    percent = sum(self._get_task_percent(instance, name)
-                                  for name in task_names) / len(task_names)
-                else:
-                    percent = 0
-                percent = min(1, max(percent, last_percent))
-                bar.update(percent * max_progress)
+                # progress is fetched less often than status, as it takes a request per task
+                if time.time() - last_progress_time >= self.PROGRESS_INTERVAL:
+                    task_names = task_names or instance.get_task_names()
+                    last_percent = percent
+                    if len(task_names) > 0:
+                        percent = sum(self._get_task_percent(instance, name)
+                                      for name in task_names) / len(task_names)
+                    else:
+                        percent = 0
+                    percent = min(1, max(percent, last_percent))
+                    bar.update(percent * max_progress)
+                    last_progress_time = time.time()
 
-                time.sleep(1)
+                time.sleep(backoff.next())
 
             instance.wait_for_success()
             bar.update(max_progress)
@@ -91,6 +104,12 @@ class ODPSEngine(Engine):
 
         return instance
 
+    def _run_sql(self, sql, bar, max_progress=1, async=False):
+        self._ctx.create_udfs()
+        instance = self._run(sql, bar, max_progress=max_progress, async=async)
+        self._ctx.close()  # clear udfs and resources generated
+        return instance
+
     @classmethod
     def _is_source_column(cls, expr, table):
         if not isinstance(expr, Column):
@@ -175,10 +194,14 @@ class ODPSEngine(Engine):
             return list(zip(cols, values))
         return False
 
-    def _handle_cases(self, expr, bar=None, tail=None):
-        if bar is None:
-            bar = init_progress_bar()
+    def _get_tunnel_source(self, expr):
+        """
+        Check if the expression can be read from its source table through
+        tunnel directly.
 
+        :return: None if not, else a tuple of the expression, the table,
+                 the partition, the columns and the count to read
+        """
         if isinstance(expr, (ProjectCollectionExpr, Summary)) and \
                 len(expr.fields) == 1 and \
                 isinstance(expr.fields[0], Count) and \
@@ -219,6 +242,19 @@ class ODPSEngine(Engine):
                 len(table.schema._partitions) != partition_size:
             return
 
+        if isinstance(expr, SliceCollectionExpr):
+            count = expr.stop
+        return expr, table, partition, columns, count
+
+    def _handle_cases(self, expr, bar=None, tail=None):
+        if bar is None:
+            bar = init_progress_bar()
+
+        source = self._get_tunnel_source(expr)
+        if source is None:
+            return
+        expr, table, partition, columns, count = source
+
         if isinstance(expr, Count):
             try:
                 with table.open_reader(reopen=True, partition=partition) as reader:
@@ -228,8 +264,6 @@ class ODPSEngine(Engine):
                 return
         else:
             self._log('Try to fetch data from tunnel')
-            if isinstance(expr, SliceCollectionExpr):
-                count = expr.stop
             try:
                 with table.open_reader(reopen=True, partition=partition) as reader:
                     if tail is not None:
@@ -237,7 +271,8 @@ class ODPSEngine(Engine):
                     else:
                         start = None
 
-                    data = []
+                    schema = types.df_schema_to_odps_schema(expr._schema, ignorecase=True)
+                    data = ResultColumns(schema.columns)
                     curr = itertools.count(0)
                     size = count or reader.count
                     for r in reader.read(start=start, count=count, columns=columns):
@@ -247,12 +282,32 @@ class ODPSEngine(Engine):
                         data.append(r.values)
                     bar.update(1)
 
-                    schema = types.df_schema_to_odps_schema(expr._schema, ignorecase=True)
                     return ResultFrame(data, schema=schema)
             except ODPSError:
                 return
 
-    def execute(self, expr, async=False):
+    @contextlib.contextmanager
+    def _open_reader(self, instance, schema):
+        """
+        Open the reader of the instance result. The result is downloaded through
+        the instance tunnel if possible, which is typed and not limited in size,
+        otherwise it falls back to the text result of the SQL task.
+        """
+        if options.df.use_instance_tunnel:
+            try:
+                tunnel = instance._create_instance_tunnel()
+                download_session = tunnel.create_download_session(instance)
+            except (ODPSError, TunnelError) as e:
+                self._log('Failed to download result through instance tunnel: %s' % e)
+            else:
+                self._log('Try to fetch result from instance tunnel')
+                yield readers.TunnelRecordReader(download_session)
+                return
+
+        with instance.open_reader(schema=schema) as reader:
+            yield reader
+
+    def execute(self, expr, async=False, tail=None):
         bar = init_progress_bar()
 
         if isinstance(expr, Scalar) and expr.value is not None:
@@ -263,7 +318,7 @@ class ODPSEngine(Engine):
         expr = self._pre_process(expr)
 
         try:
-            result = self._handle_cases(expr, bar)
+            result = self._handle_cases(expr, bar, tail=tail)
         except KeyboardInterrupt:
             sys.exit(1)
         if result is not None:
@@ -276,10 +331,83 @@ class ODPSEngine(Engine):
         self._log('Sql compiled:')
         self._log(sql)
 
-        self._ctx.create_udfs()
-        instance = self._run(sql, bar, max_progress=0.9, async=async)
-        self._ctx.close()  # clear udfs and resources generated
+        df_schema, schema = self._get_result_schemas(expr)
+        # instances run asynchronously are not cached
+        cache_key = self._get_result_cache_key(expr) if not async else None
+        try:
+            if cache_key is not None and result_cache.mode == 'local':
+                columns = result_cache.load(cache_key)
+                if columns is None:
+                    instance = self._run_sql(sql, bar, max_progress=0.9)
+                    with self._open_reader(instance, schema) as reader:
+                        data = ResultColumns(df_schema.columns)
+                        for r in reader:
+                            data.append(r.values)
+                        columns = data.to_columns()
+                    result_cache.save(cache_key, columns)
+                else:
+                    self._log('Result fetched from result cache')
+                bar.update(1)
+                return self._columns_to_result(columns, src_expr, df_schema, tail)
+
+            # ODPS tables do not keep the order of rows
+            if cache_key is not None and result_cache.mode == 'table' and \
+                    tail is None and not self._is_ordered(expr):
+                table = result_cache.get_table(self._odps, cache_key)
+                if table is None:
+                    sql = 'CREATE TABLE IF NOT EXISTS {0} LIFECYCLE {1} AS \n{2}'.format(
+                        result_cache.table_name(cache_key), options.df.result_cache_lifecycle, sql)
+                    self._run_sql(sql, bar, max_progress=0.9)
+                    table = self._odps.get_table(result_cache.table_name(cache_key))
+                else:
+                    self._log('Result fetched from result cache table: %s' % table.name)
+                with table.open_reader(reopen=True) as reader:
+                    return self._read_result(reader, src_expr, df_schema, tail, bar)
+
+            instance = self._run_sql(sql, bar, max_progress=0.9, async=async)
+            with self._open_reader(instance, schema) as reader:
+                return self._read_result(reader, src_expr, df_schema, tail, bar)
+        finally:
+            bar.close()
+
+    @classmethod
+    def _is_ordered(cls, expr):
+        return any(isinstance(node, (SortedCollectionExpr, SliceCollectionExpr))
+                   for node in expr.traverse(unique=True))
+
+    @classmethod
+    def _read_result(cls, reader, src_expr, df_schema, tail, bar):
+        if isinstance(src_expr, Scalar):
+            bar.update(1)
+            odps_type = types.df_type_to_odps_type(src_expr._value_type)
+            return types.odps_types.validate_value(reader[0][0], odps_type)
 
+        try:
+            data = ResultColumns(df_schema.columns)
+            if tail is None:
+                records = reader
+            elif isinstance(reader, readers.TunnelRecordReader):
+                records = reader.read(start=max(reader.count - tail, 0))
+            else:
+                records = deque(reader, maxlen=tail)
+            for r in records:
+                data.append(r.values)
+            return ResultFrame(data, schema=df_schema)
+        finally:
+            bar.update(1)
+
+    @classmethod
+    def _columns_to_result(cls, columns, src_expr, df_schema, tail):
+        if isinstance(src_expr, Scalar):
+            odps_type = types.df_type_to_odps_type(src_expr._value_type)
+            return types.odps_types.validate_value(columns[0][0], odps_type)
+
+        if tail is not None:
+            columns = [col[max(len(col) - tail, 0):] for col in columns]
+        return ResultFrame(dict(zip(df_schema.names, columns)), schema=df_schema)
+
+    @classmethod
+    def _get_result_schemas(cls, expr):
         if isinstance(expr, (CollectionExpr, Summary)):
             df_schema = expr._schema
             schema = types.df_schema_to_odps_schema(expr._schema, ignorecase=True)
@@ -289,20 +417,57 @@ class ODPSEngine(Engine):
         else:
             df_schema = None
             schema = None
+        return df_schema, schema
+
+    def iter_batches(self, expr, batch_size=None, batch_format=None):
+        """
+        Execute the expression and yield the result batch by batch as records
+        arrive, so that the whole result is never held in memory.
+
+        :param expr: collection or sequence expression
+        :param batch_size: records of each batch
+        :param batch_format: ``pandas`` to yield pandas DataFrames, ``records`` to yield
+                             lists of records, default as ``pandas`` if pandas is installed
+        """
+        if isinstance(expr, Scalar):
+            raise ValueError('Scalar cannot be executed as batches')
+        batch_size = batch_size or options.df.batch_size
+        if batch_format is None:
+            batch_format = 'pandas' if has_pandas else 'records'
+        if batch_format not in ('pandas', 'records'):
+            raise ValueError('Unknown batch format: %s' % batch_format)
+        if batch_format == 'pandas' and not has_pandas:
+            raise DependencyNotInstalledError('pandas library is required to yield DataFrames')
+
+        expr = self._pre_process(expr)
+        df_schema, schema = self._get_result_schemas(expr)
+
+        source = self._get_tunnel_source(expr)
+        if source is not None and not isinstance(source[0], Count):
+            self._log('Try to fetch data from tunnel')
+            _, table, partition, columns, count = source
+            with table.open_reader(reopen=True, partition=partition) as reader:
+                records = reader.read(count=count, columns=columns)
+                for batch in iter_result_batches(records, df_schema.columns,
+                                                 batch_size, batch_format):
+                    yield batch
+            return
+
+        sql = self._compile(expr)
+        self._log('Sql compiled:')
+        self._log(sql)
+
+        bar = init_progress_bar()
         try:
-            with instance.open_reader(schema=schema) as reader:
-                if not isinstance(src_expr, Scalar):
-                    try:
-                        return ResultFrame([r.values for r in reader], schema=df_schema)
-                    finally:
-                        bar.update(1)
-                else:
-                    bar.update(1)
-                    odps_type = types.df_type_to_odps_type(src_expr._value_type)
-                    return types.odps_types.validate_value(reader[0][0], odps_type)
+            instance = self._run_sql(sql, bar)
         finally:
             bar.close()
 
+        with self._open_reader(instance, schema) as reader:
+            for batch in iter_result_batches(reader, df_schema.columns,
+                                             batch_size, batch_format):
+                yield batch
+
     def _convert_table(self, expr):
         for node in expr.traverse(top_down=True, unique=True):
             if hasattr(node, 'raw_input') and \
@@ -329,20 +494,82 @@ class ODPSEngine(Engine):
         expr = ana.Analyzer(expr, memo).analyze()
         return expr
 
+    @classmethod
+    def _get_cache_key(cls, expr):
+        if not compile_cache.enabled and not result_cache.enabled:
+            return
+        try:
+            key = structural_hash(expr)
+        except UnhashableExpr:
+            return
+        # the analyzer compiles differently by the option
+        return key if options.df.analyze else key + '-noanalyze'
+
+    @classmethod
+    def _get_source_versions(cls, expr):
+        """
+        Get the versions of the source data of the expression. The last modified
+        time of partitions is taken if a table is only referred by filters on
+        its whole partitions, otherwise the last modified time of the table.
+
+        :return: list of tuples of names of the tables or partitions and their
+                 last modified time, None if any source cannot be versioned
+        """
+        if any(cls._is_source_table(node) and not isinstance(node._source_data, Table)
+               for node in expr.traverse(unique=True)):
+            return
+
+        versions = []
+        for _, table, partitions in table_source_partitions(expr).values():
+            table_name = '%s.%s' % (table.project.name, table.name)
+            if partitions is not None:
+                for partition in partitions:
+                    spec = ','.join('%s=%s' % it for it in partition)
+                    meta = table.get_partition(spec)
+                    meta.reload()
+                    versions.append(('%s(%s)' % (table_name, spec), meta.last_modified_time))
+            else:
+                table.reload()
+                if table.is_virtual_view:
+                    # data of views are modified along with the tables they select from
+                    return
+                versions.append((table_name, table.last_modified_time))
+        return versions
+
+    def _get_result_cache_key(self, expr):
+        if not result_cache.enabled:
+            return
+        key = self._ctx.get_cache_key(expr)
+        if key is None:
+            return
+        try:
+            versions = self._get_source_versions(expr)
+        except ODPSError as e:
+            self._log('Failed to get versions of source data: %s' % e)
+            return
+        if versions is None:
+            return
+        return result_cache.get_key(key, versions)
+
     def _pre_process(self, expr):
         src_expr = expr
 
         if isinstance(expr, Scalar) and expr.value is not None:
             return expr.value
-        elif isinstance(expr, (Scalar, SequenceExpr)):
-            expr = self._convert_table(expr)
 
         replaced = self._ctx.get_replaced_expr(src_expr)
-        if replaced is None:
-            expr = self._optimize(expr)
-            self._ctx.add_replaced_expr(src_expr, expr)
-        else:
-            expr = replaced
+        if replaced is not None:
+            return replaced
+
+        # the key is computed before optimizing, which changes the expression in place
+        key = self._get_cache_key(src_expr)
+        expr = None
+        if isinstance(src_expr, (Scalar, SequenceExpr)):
+            expr = self._convert_table(src_expr)
+        expr = self._optimize(expr if expr is not None else src_expr)
+        if key is not None:
+            self._ctx.add_cache_key(expr, key)
+        self._ctx.add_replaced_expr(src_expr, expr)
 
         return expr
 
@@ -352,11 +579,25 @@ class ODPSEngine(Engine):
         return self._compile(expr, prettify=prettify)
 
     def _compile(self, expr, prettify=False):
+        key = self._ctx.get_cache_key(expr)
+        if key is not None and not compile_cache.enabled:
+            key = None
+        if key is not None:
+            # prettified and plain SQL are cached separately
+            key = '%s%s' % (key, '-pretty' if prettify else '')
+            cached = compile_cache.get_sql(key)
+            if cached is not None:
+                self._log('Sql fetched from compile cache')
+                return self._ctx.restore_udfs(*cached)
+
         backend = OdpsSQLCompiler(self._ctx, beautify=prettify)
 
         self._ctx.register_udfs(gen_udf(expr, UDF_CLASS_NAME))
 
-        return backend.compile(expr)
+        sql = backend.compile(expr)
+        if key is not None:
+            compile_cache.put_sql(key, sql, self._ctx.get_udf_codes())
+        return sql
 
     def persist(self, expr, name, partitions=None):
         bar = init_progress_bar()
@@ -390,8 +631,8 @@ class ODPSEngine(Engine):
 
             sql = self.compile(expr, prettify=False)
 
-            sql = 'INSERT OVERWRITE TABLE {0} PARTITION({1}) \n{2}'.format(
-                name, ', '.join(partitions), sql
+            sql = OdpsSQLCompiler.insert_before_query(
+                sql, 'INSERT OVERWRITE TABLE {0} PARTITION({1})'.format(name, ', '.join(partitions))
             )
 
         try:
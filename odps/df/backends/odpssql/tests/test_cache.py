@@ -0,0 +1,286 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import contextlib
+import os
+import shutil
+import tempfile
+from datetime import datetime
+
+from odps.tests.core import TestBase
+from odps.compat import unittest
+from odps.config import options
+from odps.models import Schema, Record
+from odps.df.types import validate_data_type
+from odps.df.expr.expressions import CollectionExpr
+from odps.df.expr.tests.core import MockTable
+from odps.df.backends.odpssql.engine import ODPSEngine
+from odps.df.backends.odpssql.cache import CompileCache, ResultCache, \
+    compile_cache, result_cache
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class MockVersionedTable(MockTable):
+    __slots__ = 'partition_times',
+
+    def __init__(self, **kwargs):
+        self.partition_times = kwargs.pop('partition_times', dict())
+
+        super(MockVersionedTable, self).__init__(**kwargs)
+
+    def reload(self):
+        pass
+
+    def get_partition(self, partition_spec):
+        return type('Partition', (object, ), dict(
+            reload=lambda p: None, last_modified_time=self.partition_times[partition_spec]))()
+
+
+class MockResultEngine(ODPSEngine):
+    def __init__(self, odps, rows):
+        super(MockResultEngine, self).__init__(odps)
+        self.rows = rows
+        self.runs = []
+
+    def _run_sql(self, sql, bar, max_progress=1, async=False):
+        self.runs.append(sql)
+
+    @contextlib.contextmanager
+    def _open_reader(self, instance, schema):
+        yield [Record(schema=schema, values=values) for values in self.rows]
+
+
+class Test(TestBase):
+    def setup(self):
+        datatypes = lambda *types: [validate_data_type(t) for t in types]
+        self.schema = Schema.from_lists(['name', 'id', 'fid'],
+                                        datatypes('string', 'int64', 'float64'))
+        self.table = MockTable(name='pyodps_test_expr_table', schema=self.schema)
+        compile_cache.clear()
+
+    def teardown(self):
+        compile_cache.clear()
+
+    def _build(self):
+        expr = CollectionExpr(_source_data=self.table, _schema=self.schema)
+        expr = expr[expr.id > 1]
+        return expr.groupby('name').agg(expr.fid.sum())
+
+    def testCompileCache(self):
+        sql = ODPSEngine(self.odps).compile(self._build())
+        self.assertEqual(compile_cache.stats()['misses'], 1)
+
+        # a structurally identical expression rebuilt with a new engine
+        expr = self._build()
+        engine = ODPSEngine(self.odps)
+        self.assertEqual(engine.compile(expr), sql)
+        # only the SQL is shared, optimized expressions refer to their own tables
+        self.assertIsNot(engine._pre_process(expr),
+                         ODPSEngine(self.odps)._pre_process(self._build()))
+        stats = compile_cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['hit_rate'], 0.5)
+
+        old_size = options.df.compile_cache_size
+        options.df.compile_cache_size = 0
+        try:
+            self.assertEqual(ODPSEngine(self.odps).compile(self._build()), sql)
+            self.assertEqual(compile_cache.stats()['hits'], 1)
+        finally:
+            options.df.compile_cache_size = old_size
+
+    def testUdfRenamed(self):
+        def build():
+            expr = CollectionExpr(_source_data=self.table, _schema=self.schema)
+            return expr.id.map(lambda v: v + 1)
+
+        engine = ODPSEngine(self.odps)
+        sql = engine.compile(build())
+        name = list(engine._ctx._registered_funcs.values())[0]
+        self.assertIn(name, sql)
+
+        engine = ODPSEngine(self.odps)
+        cached_sql = engine.compile(build())
+        self.assertEqual(compile_cache.stats()['hits'], 1)
+
+        new_name = list(engine._ctx._func_to_udfs.keys())[0]
+        self.assertNotIn(name, cached_sql)
+        self.assertEqual(cached_sql, sql.replace(name, new_name))
+
+    def testUdfPrefixRenamed(self):
+        from odps.df.backends.odpssql.context import ODPSContext
+
+        ctx = ODPSContext(self.odps)
+        new_names = iter(['pyodps_udf_2_100', 'pyodps_udf_3_100', 'pyodps_udf_4_100'])
+        ctx._gen_udf_name = lambda: next(new_names)
+
+        # one name is the prefix of another, and a new name equals an old one
+        sql = 'SELECT pyodps_udf_1_100(a), pyodps_udf_1_1000(b), pyodps_udf_2_100(c) FROM t'
+        udfs = [('pyodps_udf_1_100', 'code1'), ('pyodps_udf_1_1000', 'code2'),
+                ('pyodps_udf_2_100', 'code3')]
+        self.assertEqual(ctx.restore_udfs(sql, udfs),
+                         'SELECT pyodps_udf_2_100(a), pyodps_udf_3_100(b), pyodps_udf_4_100(c) FROM t')
+        self.assertEqual(ctx.get_udf_codes(), [('pyodps_udf_2_100', 'code1'),
+                                               ('pyodps_udf_3_100', 'code2'),
+                                               ('pyodps_udf_4_100', 'code3')])
+
+    def testPersistent(self):
+        cache_dir = tempfile.mkdtemp()
+        try:
+            cache = CompileCache(size=2, cache_dir=cache_dir)
+            cache.put_sql('key1', 'SELECT 1', [('udf1', 'code')])
+            cache.put_sql('key2', 'SELECT 2')
+            cache.put_sql('key3', 'SELECT 3')
+            self.assertEqual(cache.stats()['entries'], 2)
+
+            cache = CompileCache(size=2, cache_dir=cache_dir)
+            self.assertEqual(cache.get_sql('key1'), ('SELECT 1', [('udf1', 'code')]))
+            self.assertIsNone(cache.get_sql('key4'))
+            self.assertEqual(cache.stats()['hits'], 1)
+            self.assertEqual(cache.stats()['misses'], 1)
+        finally:
+            shutil.rmtree(cache_dir)
+
+    def testSourceVersions(self):
+        schema = Schema.from_lists(['id', 'ds'], [validate_data_type(t) for t in ('int64', 'string')])
+        schema._partitions = schema._columns[1:]
+        schema._columns = schema._columns[:1]
+        times = {'ds=1': datetime(2016, 1, 1), 'ds=2': datetime(2016, 1, 2)}
+        table = MockVersionedTable(name='pyodps_test_partitioned_table', schema=schema,
+                                   last_modified_time=datetime(2016, 1, 3),
+                                   is_virtual_view=False, partition_times=times)
+        expr = CollectionExpr(_source_data=table, _schema=Schema(columns=schema.columns))
+
+        versions = ODPSEngine._get_source_versions(expr[expr.ds == '1'])
+        self.assertEqual(versions, [('mocked_project.pyodps_test_partitioned_table(ds=1)',
+                                     times['ds=1'])])
+
+        union = expr[expr.ds == '1'].union(expr[expr.ds == '2'])
+        self.assertEqual(sorted(ODPSEngine._get_source_versions(union)),
+                         [('mocked_project.pyodps_test_partitioned_table(ds=%s)' % i,
+                           times['ds=%s' % i]) for i in (1, 2)])
+
+        # filters not on whole partitions depend on the whole table
+        versions = ODPSEngine._get_source_versions(expr[expr.id > 1])
+        self.assertEqual(versions, [('mocked_project.pyodps_test_partitioned_table',
+                                     datetime(2016, 1, 3))])
+
+        table.is_virtual_view = True
+        self.assertIsNone(ODPSEngine._get_source_versions(expr[expr.id > 1]))
+
+    def testResultCacheKey(self):
+        versions = [('t1', datetime(2016, 1, 1)), ('t2', datetime(2016, 1, 2))]
+        key = ResultCache.get_key('expr', versions)
+        self.assertEqual(ResultCache.get_key('expr', versions[::-1]), key)
+        self.assertNotEqual(ResultCache.get_key('expr', [versions[0], ('t2', datetime(2016, 1, 3))]), key)
+        self.assertNotEqual(ResultCache.get_key('expr2', versions), key)
+
+    @unittest.skipIf(np is None, 'numpy not installed')
+    def testLocalResultCache(self):
+        table = MockVersionedTable(name='pyodps_test_expr_table', schema=self.schema,
+                                   last_modified_time=datetime(2016, 1, 1),
+                                   is_virtual_view=False)
+        rows = [['name1', 1, 1.5], ['name2', None, None]]
+        cache_dir = tempfile.mkdtemp()
+        old_mode, old_dir = options.df.result_cache, options.df.result_cache_dir
+        options.df.result_cache, options.df.result_cache_dir = 'local', cache_dir
+        result_cache.clear_stats()
+        try:
+            def build():
+                return CollectionExpr(_source_data=table, _schema=self.schema)[lambda x: x.id > 0]
+
+            engine = MockResultEngine(self.odps, rows)
+            self.assertEqual(engine.execute(build()).values.values.tolist()[0], rows[0])
+            self.assertEqual(len(engine.runs), 1)
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+            # fetched from files by another engine
+            engine = MockResultEngine(self.odps, rows)
+            result = engine.execute(build(), tail=1)
+            self.assertEqual(len(engine.runs), 0)
+            self.assertEqual(len(result), 1)
+            self.assertEqual(result.values['name'].tolist(), ['name2'])
+            self.assertEqual(result_cache.stats()['hits'], 1)
+
+            # modifying the table invalidates the result
+            table.last_modified_time = datetime(2016, 1, 2)
+            engine = MockResultEngine(self.odps, rows)
+            engine.execute(build())
+            self.assertEqual(len(engine.runs), 1)
+            self.assertEqual(result_cache.stats()['misses'], 2)
+        finally:
+            options.df.result_cache, options.df.result_cache_dir = old_mode, old_dir
+            result_cache.clear_stats()
+            shutil.rmtree(cache_dir)
+
+    @unittest.skipIf(np is None, 'numpy not installed')
+    def testOrderedNotCachedAsTable(self):
+        table = MockVersionedTable(name='pyodps_test_expr_table', schema=self.schema,
+                                   last_modified_time=datetime(2016, 1, 1),
+                                   is_virtual_view=False)
+        rows = [['name1', 1, 1.5], ['name2', 2, 2.5]]
+        old_mode = options.df.result_cache
+        options.df.result_cache = 'table'
+        try:
+            expr = CollectionExpr(_source_data=table, _schema=self.schema)
+            expr = expr[expr.id > 0]
+            # ODPS tables do not keep the order of rows
+            for expr, tail in [(expr.sort('id'), None), (expr[:1], None), (expr, 1)]:
+                engine = MockResultEngine(self.odps, rows)
+                engine.execute(expr, tail=tail)
+                self.assertEqual(len(engine.runs), 1)
+                self.assertNotIn('CREATE TABLE', engine.runs[0])
+        finally:
+            options.df.result_cache = old_mode
+
+    def testLocalResultValues(self):
+        import array
+        from decimal import Decimal
+
+        cache_dir = tempfile.mkdtemp()
+        try:
+            columns = [array.array('q', [1, 2, 3]),
+                       [None, 1 << 70, True],
+                       [u'name', b'bytes', Decimal('1.25')],
+                       [datetime(2016, 1, 1, 12, 30, 1, 5), None, 1.5]]
+            cache = ResultCache(cache_dir=os.path.join(cache_dir, 'cache'))
+            cache.save('key', columns)
+            self.assertEqual(os.stat(cache.cache_dir).st_mode & 0o777, 0o700)
+            self.assertEqual(cache.load('key'), [list(col) for col in columns])
+
+            class NotOwnedResultCache(ResultCache):
+                @classmethod
+                def _is_owned(cls, path):
+                    return False
+
+            self.assertIsNone(NotOwnedResultCache(cache_dir=cache.cache_dir).load('key'))
+
+            # values which cannot be encoded are not cached
+            cache.save('key2', [[object()]])
+            self.assertIsNone(cache.load('key2'))
+        finally:
+            shutil.rmtree(cache_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -33,7 +33,7 @@ from odps.df.types import validate_data_type
 from odps.df.expr.expressions import CollectionExpr
 from odps.df.backends.odpssql.engine import ODPSEngine, UDF_CLASS_NAME
 from odps.df.backends.odpssql.compiler import BINARY_OP_COMPILE_DIC, \
-    MATH_COMPILE_DIC, DATE_PARTS_DIC
+    MATH_COMPILE_DIC, DATE_PARTS_DIC, OdpsSQLCompiler
 from odps.df.backends.errors import CompileError
 from odps.df.expr.tests.core import MockTable
 from odps.df.backends.odpssql.cloudpickle import *  # noqa
@@ -970,5 +970,57 @@ class Test(TestBase):
         except AssertionError:
             self.assertEqual(to_str(expected)[:-1], to_str(self.engine.compile(e1.concat(e2), False)[:-1]))
 
+    @classmethod
+    def _count_scans(cls, sql, table_name):
+        return len(re.findall(r'mocked_project\.`%s`' % table_name, sql))
+
+    def testSharedBranches(self):
+        e = self.expr
+        filtered = e[e.id > 1]['name', 'id']
+
+        expected = 'WITH \n' \
+                   '  t2 AS (\n' \
+                   '    SELECT t1.`name`, t1.`id` \n' \
+                   '    FROM mocked_project.`pyodps_test_expr_table` t1 \n' \
+                   '    WHERE t1.`id` > 1\n' \
+                   '  )\n' \
+                   'SELECT * \n' \
+                   'FROM (\n' \
+                   '  SELECT * \n' \
+                   '  FROM t2 \n' \
+                   '  UNION ALL\n' \
+                   '    SELECT * \n' \
+                   '    FROM t2\n' \
+                   ') t3'
+        self.assertEqual(to_str(expected),
+                         to_str(ODPSEngine(self.odps).compile(filtered.union(filtered), False)))
+
+        # structurally equal branches are shared as well
+        build = lambda: e[e.id > 1]
+        sql = ODPSEngine(self.odps).compile(build().join(build(), 'name'), False)
+        self.assertEqual(self._count_scans(sql, 'pyodps_test_expr_table'), 1)
+        self.assertTrue(sql.startswith('WITH '))
+
+        build = lambda: self.expr1[self.expr1.id > 1]['name', 'id']
+        sql = ODPSEngine(self.odps).compile(
+            build().union(filtered).union(build()).union(filtered), False)
+        self.assertEqual(self._count_scans(sql, 'pyodps_test_expr_table'), 1)
+        self.assertEqual(self._count_scans(sql, 'pyodps_test_expr_table1'), 1)
+
+        sql = ODPSEngine(self.odps).compile(filtered.union(e[e.id > 2]['name', 'id']), False)
+        self.assertEqual(self._count_scans(sql, 'pyodps_test_expr_table'), 2)
+        self.assertFalse(sql.startswith('WITH '))
+
+    def testInsertBeforeQuery(self):
+        statement = 'INSERT OVERWRITE TABLE t PARTITION(ds)'
+        sql = 'SELECT * \nFROM t1'
+        self.assertEqual(OdpsSQLCompiler.insert_before_query(sql, statement),
+                         statement + ' \n' + sql)
+
+        sql = 'WITH \n  t2 AS (\n    SELECT 1\n  )\nSELECT * \nFROM t2'
+        self.assertEqual(OdpsSQLCompiler.insert_before_query(sql, statement),
+                         'WITH \n  t2 AS (\n    SELECT 1\n  )\n' + statement + '\nSELECT * \nFROM t2')
+
+
 if __name__ == '__main__':
     unittest.main()
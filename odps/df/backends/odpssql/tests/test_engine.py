@@ -155,6 +155,29 @@ class Test(TestBase):
         finally:
             self.odps.delete_table(table_name, if_exists=True)
 
+    def testIterBatches(self):
+        data = self._gen_data(10, value_range=(-1000, 1000))
+
+        # read from tunnel
+        batches = list(self.engine.iter_batches(self.expr, batch_size=4, batch_format='records'))
+        self.assertEqual([4, 4, 2], [len(b) for b in batches])
+        self.assertEqual(data, [r.values for b in batches for r in b])
+
+        # read from the result of an instance
+        expr = self.expr[self.expr.id + 1, 'name']
+        batches = list(self.engine.iter_batches(expr, batch_size=3, batch_format='records'))
+        self.assertEqual([3, 3, 3, 1], [len(b) for b in batches])
+        self.assertEqual(sorted([it[1] + 1, it[0]] for it in data),
+                         sorted(r.values for b in batches for r in b))
+
+        try:
+            import pandas
+        except ImportError:
+            return
+        batches = list(self.engine.iter_batches(expr, batch_size=3))
+        self.assertIsInstance(batches[0], pandas.DataFrame)
+        self.assertEqual(10, sum(len(b) for b in batches))
+
     def testBase(self):
         data = self._gen_data(10, value_range=(-1000, 1000))
 
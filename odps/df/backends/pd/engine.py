@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from ....compat import OrderedDict
+from ....errors import DependencyNotInstalledError
+from ....models import Schema, Record
+from ....config import options
+from ...expr.expressions import CollectionExpr, Scalar, Summary
+from ..core import Engine
+from ..frame import ResultFrame
+from ..odpssql.types import df_schema_to_odps_schema
+from .executor import PandasExecutor
+from .types import df_type_to_np_type
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:
+    np = pd = None
+
+
+class PandasEngine(Engine):
+    """
+    Execute expressions of local data with pandas, no ODPS instance is involved.
+    """
+
+    def __init__(self, sources=None):
+        """
+        :param sources: dict of ids of source collections of ODPS tables to tuples of
+                        the collection, the table and the partition as a list of column names
+                        and values, the data of which are downloaded through tunnel
+        """
+        if pd is None:
+            raise DependencyNotInstalledError('pandas library is required by local execution')
+
+        self._sources = sources or dict()
+        self._frames = None
+
+    @classmethod
+    def _download(cls, table, partition, names):
+        partition_spec = None
+        if partition is not None:
+            partition_spec = ','.join('%s=%s' % it for it in partition)
+        with table.open_reader(reopen=True, partition=partition_spec) as reader:
+            batches = list(reader.read_batches())
+        data = pd.concat(batches, ignore_index=True) if batches else pd.DataFrame(columns=names)
+
+        # partition columns are not downloaded, all of the rows are in the partition
+        values = dict(partition or [])
+        frame = OrderedDict()
+        for name in names:
+            if name in values:
+                frame[name] = [values[name]] * len(data)
+            else:
+                frame[name] = data[name].values
+        return pd.DataFrame(frame, columns=names)
+
+    def _get_frames(self):
+        if self._frames is None:
+            self._frames = dict(
+                (source_id, self._download(table, partition, collection.schema.names))
+                for source_id, (collection, table, partition) in self._sources.items())
+        return self._frames
+
+    def _executor(self):
+        return PandasExecutor(self._get_frames())
+
+    @classmethod
+    def is_supported(cls, expr):
+        """
+        Check if the expression can be executed locally, by executing it over
+        empty data of its sources, so that nothing is downloaded.
+        """
+        frames = dict()
+        for node in expr.traverse(unique=True):
+            if isinstance(node, CollectionExpr) and \
+                    getattr(node, '_source_data', None) is not None:
+                frames[id(node)] = pd.DataFrame(OrderedDict(
+                    (col.name, pd.Series([], dtype=df_type_to_np_type(col.type)))
+                    for col in node.schema.columns), columns=node.schema.names)
+        try:
+            PandasExecutor(frames).execute(expr)
+        except NotImplementedError:
+            return False
+        except Exception:
+            # other errors are raised when the expression is executed
+            pass
+        return True
+
+    @classmethod
+    def _get_result_schema(cls, expr):
+        if isinstance(expr, (CollectionExpr, Summary)):
+            return expr._schema
+        return Schema.from_lists([expr.name], [expr._data_type])
+
+    @classmethod
+    def _to_python_value(cls, value):
+        if value is None or (isinstance(value, float) and value != value):
+            return
+        if isinstance(value, pd.Timestamp):
+            return value.to_pydatetime()
+        if hasattr(value, 'item'):
+            return value.item()
+        return value
+
+    def _execute_frame(self, expr):
+        result = self._executor().execute(expr)
+        if isinstance(result, pd.Series):
+            result = pd.DataFrame({expr.name: result.values}, columns=[expr.name])
+        return result
+
+    def _to_result_frame(self, frame, df_schema, index=None):
+        data = dict()
+        for col, name in zip(df_schema.columns, frame.columns):
+            values = frame[name]
+            dtype = df_type_to_np_type(col.type)
+            if values.notnull().all() and values.dtype != dtype:
+                values = values.astype(dtype)
+            elif values.dtype.kind == 'M' or not isinstance(values.dtype, np.dtype):
+                # nulls of datetimes and nullable integers are returned as None like other types
+                values = values.astype(object).where(values.notnull(), None)
+            data[col.name] = values.values
+        return ResultFrame(data, schema=df_schema, index=index)
+
+    def execute(self, expr, tail=None, **kw):
+        if isinstance(expr, Scalar) and expr.value is not None:
+            return expr.value
+
+        if isinstance(expr, Scalar):
+            return self._to_python_value(self._executor().execute(expr))
+
+        frame = self._execute_frame(expr)
+        if tail is not None:
+            frame = frame.iloc[max(len(frame) - tail, 0):]
+        return self._to_result_frame(frame.reset_index(drop=True),
+                                     self._get_result_schema(expr))
+
+    def iter_batches(self, expr, batch_size=None, batch_format=None):
+        """
+        Execute the expression and yield the result batch by batch.
+
+        :param expr: collection or sequence expression
+        :param batch_size: records of each batch
+        :param batch_format: ``pandas`` to yield pandas DataFrames, ``records`` to yield
+                             lists of records like the ODPS engine, default as ``pandas``
+        """
+        if isinstance(expr, Scalar):
+            raise ValueError('Scalar cannot be executed as batches')
+        batch_size = batch_size or options.df.batch_size
+        batch_format = batch_format or 'pandas'
+        if batch_format not in ('pandas', 'records'):
+            raise ValueError('Unknown batch format: %s' % batch_format)
+
+        frame = self._execute_frame(expr).reset_index(drop=True)
+        df_schema = self._get_result_schema(expr)
+        columns = df_schema_to_odps_schema(df_schema, ignorecase=True).columns
+        for start in range(0, len(frame), batch_size):
+            batch = frame.iloc[start: start + batch_size]
+            result = self._to_result_frame(batch, df_schema, index=batch.index)
+            if batch_format == 'pandas':
+                yield result.values
+            else:
+                yield [Record(columns=columns,
+                              values=[self._to_python_value(v) for v in row])
+                       for row in result.values.itertuples(index=False)]
+
+    def _convert_table(self, expr):
+        # sequences are executed directly, a projection is only needed
+        # when they are displayed as a collection
+        for node in expr.traverse(top_down=True, unique=True):
+            if isinstance(node, CollectionExpr):
+                return node[[expr, ]]
+
+        raise NotImplementedError
+
+    def compile(self, expr):
+        raise NotImplementedError('Local execution does not compile expressions')
+
+    def persist(self, expr, name, partitions=None):
+        raise NotImplementedError('Cannot persist local data, '
+                                  'create a DataFrame of an ODPS table instead')
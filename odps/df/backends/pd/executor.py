@@ -0,0 +1,997 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import inspect
+import operator
+import re
+from datetime import datetime
+from decimal import Decimal
+
+import six
+
+from ..core import Backend
+from ..errors import CompileError
+from ...expr.expressions import CollectionExpr, Summary, Scalar, Column, \
+    FilterCollectionExpr, SliceCollectionExpr
+from ...expr.collections import SortedCollectionExpr, SortedColumn
+from ...expr.merge import JoinCollectionExpr
+from ...expr.reduction import GroupedSequenceReduction
+from ...expr import arithmetic
+from ...expr import element
+from ...expr import strings
+from ...expr import window
+from ... import types as df_types
+from ....compat import OrderedDict
+from .types import df_type_to_np_type
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:
+    np = pd = None
+
+
+BINARY_OPS = {
+    'Add': operator.add,
+    'Substract': operator.sub,
+    'Multiply': operator.mul,
+    'Divide': operator.truediv,
+    'FloorDivide': operator.floordiv,
+    'Power': operator.pow,
+    'Greater': operator.gt,
+    'GreaterEqual': operator.ge,
+    'Less': operator.lt,
+    'LessEqual': operator.le,
+    'Equal': operator.eq,
+    'NotEqual': operator.ne,
+    'And': operator.and_,
+    'Or': operator.or_,
+}
+
+MATH_FUNCS = {
+    'Abs': 'abs',
+    'Sqrt': 'sqrt',
+    'Sin': 'sin',
+    'Sinh': 'sinh',
+    'Cos': 'cos',
+    'Cosh': 'cosh',
+    'Tan': 'tan',
+    'Tanh': 'tanh',
+    'Exp': 'exp',
+    'Expm1': 'expm1',
+    'Log10': 'log10',
+    'Log2': 'log2',
+    'Log1p': 'log1p',
+    'Arccos': 'arccos',
+    'Arccosh': 'arccosh',
+    'Arcsin': 'arcsin',
+    'Arcsinh': 'arcsinh',
+    'Arctan': 'arctan',
+    'Arctanh': 'arctanh',
+    'Radians': 'radians',
+    'Degrees': 'degrees',
+    'Ceil': 'ceil',
+    'Floor': 'floor',
+}
+
+# arguments of string operations passed to the methods of `Series.str`
+STRING_OP_ARGS = {
+    'Contains': ('pat', 'case', 'flags', 'regex'),
+    'Count': ('pat', 'flags'),
+    'Endswith': ('pat', ),
+    'Startswith': ('pat', ),
+    'Find': ('sub', 'start', 'end'),
+    'RFind': ('sub', 'start', 'end'),
+    'Replace': ('pat', 'repl', 'n', 'case', 'flags'),
+    'Get': ('i', ),
+    'Ljust': ('width', 'fillchar'),
+    'Rjust': ('width', 'fillchar'),
+    'Lstrip': ('to_strip', ),
+    'Rstrip': ('to_strip', ),
+    'Strip': ('to_strip', ),
+    'Pad': ('width', 'side', 'fillchar'),
+    'Repeat': ('repeats', ),
+    'Slice': ('start', 'stop', 'step'),
+    'Zfill': ('width', ),
+}
+
+# names of the expression attributes which differ from the arguments of `Series.str`
+STRING_OP_ATTRS = {
+    'i': 'index',
+    'stop': 'end',
+}
+
+DATETIME_FIELDS = {
+    'Year': 'year',
+    'Month': 'month',
+    'Day': 'day',
+    'Hour': 'hour',
+    'Minute': 'minute',
+    'Second': 'second',
+    'MicroSecond': 'microsecond',
+    'Week': 'week',
+    'WeekOfYear': 'weekofyear',
+    'WeekDay': 'weekday',
+    'DayOfYear': 'dayofyear',
+    'IsMonthStart': 'is_month_start',
+    'IsMonthEnd': 'is_month_end',
+    'IsYearStart': 'is_year_start',
+    'IsYearEnd': 'is_year_end',
+}
+
+REDUCTION_METHODS = {
+    'Min': 'min',
+    'Max': 'max',
+    'Count': 'count',
+    'Sum': 'sum',
+    'Var': 'var',
+    'Std': 'std',
+    'Mean': 'mean',
+    'Median': 'median',
+    'Any': 'any',
+    'All': 'all',
+}
+
+WINDOW_METHODS = {
+    'CumSum': 'sum',
+    'CumMax': 'max',
+    'CumMin': 'min',
+    'CumMean': 'mean',
+    'CumMedian': 'median',
+    'CumCount': 'count',
+    'CumStd': 'std',
+}
+
+JOIN_HOWS = {
+    'INNER': 'inner',
+    'LEFT OUTER': 'left',
+    'RIGHT OUTER': 'right',
+    'FULL OUTER': 'outer',
+}
+
+
+class _NullKey(object):
+    """
+    Placeholder of null keys, pandas drops the groups of NaN keys
+    while SQL keeps nulls as a group.
+    """
+
+    def __repr__(self):
+        return 'NULL'
+
+
+_NULL_KEY = _NullKey()
+
+
+# missing values of nullable integers
+_NA = getattr(pd, 'NA', None)
+
+
+def _is_null(value):
+    return value is None or value is _NA or (isinstance(value, float) and value != value)
+
+
+def _reduction_kind(expr):
+    name = type(expr).__name__
+    if name.startswith('Grouped'):
+        name = name[len('Grouped'):]
+    return name
+
+
+class PandasExecutor(Backend):
+    """
+    Evaluate an expression over pandas DataFrames.
+
+    Every collection is evaluated into a DataFrame once. Fields of a collection
+    are evaluated into Series aligned to the frame which they are selected from,
+    filters, sorts and slices keep the index of their input, so columns of
+    an upstream collection can be looked up in the frame of a downstream one.
+    """
+
+    def __init__(self, sources=None):
+        """
+        :param sources: dict of ids of source collections to the DataFrames of their data,
+                        used instead of the data the collections hold
+        """
+        self._sources = sources or dict()
+        self._frames = dict()
+
+        # states of the field being evaluated
+        self._values = None
+        self._collection = None
+        self._grouper = None
+
+    def execute(self, expr):
+        """
+        :return: a DataFrame for a collection, a Series for a sequence, a value for a scalar
+        """
+        if isinstance(expr, (CollectionExpr, Summary)):
+            return self._evaluate_collection(expr)
+        return self._evaluate_field(expr, None)
+
+    def _evaluate_collection(self, expr):
+        if id(expr) not in self._frames:
+            for child in expr.children():
+                if isinstance(child, CollectionExpr):
+                    self._evaluate_collection(child)
+            expr.accept(self)
+        return self._frames[id(expr)]
+
+    @classmethod
+    def _iter_field(cls, expr):
+        """
+        Iterate the nodes of a field bottom-up, collections are not entered.
+        """
+        traversed = set()
+
+        def walk(node):
+            if id(node) in traversed:
+                return
+            traversed.add(id(node))
+            if isinstance(node, (CollectionExpr, Summary)):
+                return
+
+            for child in node.children():
+                for n in walk(child):
+                    yield n
+            yield node
+
+        return walk(expr)
+
+    def _evaluate_field(self, expr, collection, grouper=None):
+        states = self._values, self._collection, self._grouper
+        self._values, self._collection, self._grouper = dict(), collection, grouper
+        try:
+            for node in self._iter_field(expr):
+                if type(node) is Scalar:
+                    # null literals cannot be visited
+                    self.visit_scalar(node)
+                else:
+                    node.accept(self)
+            return self._values[id(expr)]
+        finally:
+            self._values, self._collection, self._grouper = states
+
+    def _get(self, expr):
+        if expr is None:
+            return
+        return self._values[id(expr)]
+
+    def _current_index(self, expr):
+        collection = self._collection if self._collection is not None else expr
+        return self._evaluate_collection(collection).index
+
+    @classmethod
+    def _to_frame(cls, names, values, index):
+        data = OrderedDict()
+        for name, value in zip(names, values):
+            if isinstance(value, pd.Series):
+                if not value.index.equals(index):
+                    value = value.reindex(index)
+                data[name] = value.values
+            else:
+                data[name] = [value] * len(index)
+        return pd.DataFrame(data, index=index, columns=names)
+
+    @classmethod
+    def _to_mask(cls, value, index):
+        if isinstance(value, pd.Series):
+            if not value.index.equals(index):
+                value = value.reindex(index)
+            return value.fillna(False).astype(bool).values
+        return np.repeat(bool(value) and not _is_null(value), len(index))
+
+    @classmethod
+    def _fill_null_keys(cls, keys):
+        return keys.astype(object).where(keys.notnull(), _NULL_KEY)
+
+    @classmethod
+    def _apply(cls, value, func):
+        """
+        Apply a function of Series to a value, which is a Series or a scalar.
+        """
+        if isinstance(value, pd.Series):
+            return func(value)
+        if _is_null(value):
+            return
+        return func(pd.Series([value])).iloc[0]
+
+    def _column_name(self, collection, column):
+        """
+        Get the name of the column in the frame of the collection,
+        None if the column does not come from the collection.
+        """
+        if column.input is collection:
+            return column.source_name
+        if isinstance(collection, (FilterCollectionExpr, SliceCollectionExpr,
+                                   SortedCollectionExpr)):
+            return self._column_name(collection.input, column)
+        if isinstance(collection, JoinCollectionExpr):
+            for idx, side in enumerate((collection.lhs, collection.rhs)):
+                name = self._column_name(side, column)
+                if name is not None:
+                    renamed = collection._renamed_columns.get(name)
+                    return renamed[idx] if renamed else name
+
+    def _column_value(self, expr):
+        collection, name = self._collection, None
+        if collection is not None:
+            name = self._column_name(collection, expr)
+        if name is None:
+            collection, name = expr.input, expr.source_name
+        return self._evaluate_collection(collection)[name]
+
+    def visit_source_collection(self, expr):
+        frame = self._sources.get(id(expr), expr._source_data).reset_index(drop=True)
+        frame.columns = expr.schema.names
+        self._frames[id(expr)] = frame
+
+    def visit_project_collection(self, expr):
+        collection = expr.input
+        frame = self._evaluate_collection(collection)
+
+        fields = expr.args[1]
+        values = [self._evaluate_field(field, collection) for field in fields]
+        if isinstance(expr, Summary) and \
+                not any(isinstance(value, pd.Series) for value in values):
+            index = pd.RangeIndex(1)
+        else:
+            index = frame.index
+
+        self._frames[id(expr)] = self._to_frame(expr._schema.names, values, index)
+
+    def visit_filter_collection(self, expr):
+        frame = self._frames[id(expr.input)]
+        predicate = self._evaluate_field(expr.args[1], expr.input)
+
+        self._frames[id(expr)] = frame[self._to_mask(predicate, frame.index)]
+
+    def visit_slice_collection(self, expr):
+        frame = self._frames[id(expr.input)]
+        start, stop, step = (idx.value if idx is not None else None
+                             for idx in expr._indexes)
+
+        self._frames[id(expr)] = frame.iloc[start:stop:step]
+
+    @classmethod
+    def _sort_keys(cls, keys, names, ascending):
+        """
+        Sort the frame of keys. NULLs are taken as the smallest values like ODPS,
+        that is, they come first in ascending order and last in descending order.
+        """
+        by = []
+        for name, asc in zip(names, ascending):
+            keys[name + '_notnull'] = keys[name].notnull()
+            by.extend([name + '_notnull', name])
+        ascending = [asc for asc in ascending for _ in range(2)]
+        return keys.sort_values(by, ascending=ascending)
+
+    def _sort_positions(self, values, ascending, index):
+        names = ['_key%s' % i for i in range(len(values))]
+        keys = self._to_frame(names, values, index)
+        keys['_pos'] = np.arange(len(index))
+        # sort by the positions at last to keep the sort stable
+        keys = self._sort_keys(keys, names + ['_pos'], list(ascending) + [True])
+        return keys['_pos'].values
+
+    def visit_sort(self, expr):
+        frame = self._frames[id(expr.input)]
+        keys = expr.args[1]
+        values = [self._evaluate_field(key, expr.input) for key in keys]
+        positions = self._sort_positions(values, [key._ascending for key in keys], frame.index)
+
+        self._frames[id(expr)] = frame.iloc[positions]
+
+    def visit_distinct(self, expr):
+        frame = self._frames[id(expr.input)]
+        fields = expr.args[1]
+        values = [self._evaluate_field(field, expr.input) for field in fields]
+
+        distinct = self._to_frame(expr.schema.names, values, frame.index).drop_duplicates()
+        self._frames[id(expr)] = distinct
+
+    def visit_union(self, expr):
+        names = expr.schema.names
+        lhs, rhs = self._frames[id(expr.lhs)], self._frames[id(expr.rhs)]
+
+        frame = pd.concat([lhs[names], rhs[names]], ignore_index=True)
+        if expr._distinct:
+            frame = frame.drop_duplicates().reset_index(drop=True)
+        self._frames[id(expr)] = frame
+
+    def _split_predicate(self, predicate):
+        if isinstance(predicate, arithmetic.And):
+            return self._split_predicate(predicate.lhs) + self._split_predicate(predicate.rhs)
+        return [predicate]
+
+    def _is_from(self, expr, collection):
+        columns = [node for node in self._iter_field(expr) if isinstance(node, Column)]
+        return len(columns) > 0 and \
+            all(self._column_name(collection, col) is not None for col in columns)
+
+    def _join_keys(self, expr, predicate):
+        if not isinstance(predicate, arithmetic.Equal):
+            return
+        for left, right in ((predicate.lhs, predicate.rhs), (predicate.rhs, predicate.lhs)):
+            if self._is_from(left, expr.lhs) and self._is_from(right, expr.rhs):
+                return left, right
+
+    @classmethod
+    def _take(cls, frame, positions):
+        """
+        Take rows by positions, rows of null positions are filled with nulls.
+        """
+        frame = frame.reset_index(drop=True)
+        if pd.isnull(positions).any():
+            return frame.reindex(pd.Index(positions, dtype=object))
+        return frame.iloc[positions.astype('int64')]
+
+    def visit_join(self, expr):
+        left, right = self._frames[id(expr.lhs)], self._frames[id(expr.rhs)]
+        how = JOIN_HOWS[expr._how]
+
+        left_keys, right_keys, others = [], [], []
+        for predicate in self._split_predicate(expr.predicate):
+            keys = self._join_keys(expr, predicate)
+            if keys is None:
+                others.append(predicate)
+            else:
+                left_keys.append(keys[0])
+                right_keys.append(keys[1])
+        if others and how != 'inner':
+            raise CompileError('Only equal predicates are supported by %s join' % how)
+
+        names = ['_key%s' % i for i in range(len(left_keys))]
+        lkeys = self._to_frame(
+            names, [self._evaluate_field(key, expr.lhs) for key in left_keys], left.index)
+        rkeys = self._to_frame(
+            names, [self._evaluate_field(key, expr.rhs) for key in right_keys], right.index)
+        lkeys['_lpos'] = np.arange(len(left))
+        rkeys['_rpos'] = np.arange(len(right))
+        if not names:
+            names = ['_key']
+            lkeys['_key'] = rkeys['_key'] = 0
+
+        # null keys never equal to each other in SQL
+        lnull = lkeys[names].isnull().any(axis=1).values
+        rnull = rkeys[names].isnull().any(axis=1).values
+        merged = [lkeys[~lnull].merge(rkeys[~rnull], how=how, on=names)]
+        if how in ('left', 'outer'):
+            merged.append(lkeys[lnull])
+        if how in ('right', 'outer'):
+            merged.append(rkeys[rnull])
+        merged = pd.concat(merged, ignore_index=True)
+        if how != 'inner':
+            # keep the order of the outer side as the inner join does
+            order = ['_rpos', '_lpos'] if how == 'right' else ['_lpos', '_rpos']
+            merged = merged.sort_values(order, kind='mergesort')
+
+        joined = pd.concat([self._take(left, merged['_lpos'].values).reset_index(drop=True),
+                            self._take(right, merged['_rpos'].values).reset_index(drop=True)],
+                           axis=1)
+        joined.columns = expr.schema.names
+        self._frames[id(expr)] = joined
+
+        for predicate in others:
+            mask = self._evaluate_field(predicate, expr)
+            joined = joined[self._to_mask(mask, joined.index)]
+            self._frames[id(expr)] = joined
+
+    def _is_grouped(self, expr):
+        return any(isinstance(node, GroupedSequenceReduction)
+                   for node in self._iter_field(expr))
+
+    def _evaluate_grouped(self, expr, collection, grouper):
+        value = self._evaluate_field(expr, collection, grouper=grouper)
+        if isinstance(value, pd.Series) and not self._is_grouped(expr):
+            # fields grouped by, take the value of each group
+            value = value.groupby(grouper, sort=False).first()
+        return value
+
+    def visit_groupby(self, expr):
+        bys, having, aggs, fields = tuple(expr.args[1:])
+        if fields is None:
+            fields = bys + aggs
+
+        collection = expr.input
+        frame = self._frames[id(collection)]
+        names = ['_by%s' % i for i in range(len(bys))]
+        keys = self._to_frame(names, [self._evaluate_field(by, collection) for by in bys],
+                              frame.index)
+        keys = self._fill_null_keys(keys)
+        grouper = [keys[name] for name in names]
+        index = pd.Series(0, index=frame.index).groupby(grouper, sort=False).size().index
+
+        values = [self._evaluate_grouped(field, collection, grouper) for field in fields]
+        grouped = self._to_frame(expr.schema.names, values, index)
+        if having is not None:
+            mask = self._evaluate_grouped(having, collection, grouper)
+            grouped = grouped[self._to_mask(mask, index)]
+
+        self._frames[id(expr)] = grouped.reset_index(drop=True)
+
+    def visit_mutate(self, expr):
+        bys, mutates = tuple(expr.args[1:])
+
+        frame = self._frames[id(expr.input)]
+        values = [self._evaluate_field(field, expr.input) for field in bys + mutates]
+        self._frames[id(expr)] = self._to_frame(expr.schema.names, values, frame.index)
+
+    def visit_value_counts(self, expr):
+        by = self._evaluate_field(expr._by, expr.input)
+        counts = by.value_counts(sort=expr._sort.value)
+
+        frame = pd.DataFrame(OrderedDict(zip(expr.schema.names, [counts.index, counts.values])),
+                             columns=expr.schema.names)
+        self._frames[id(expr)] = frame
+
+    def visit_column(self, expr):
+        self._values[id(expr)] = self._column_value(expr)
+
+    def visit_sequence(self, expr):
+        if not isinstance(expr, SortedColumn):
+            raise NotImplementedError
+
+        if isinstance(expr.input, CollectionExpr):
+            self._values[id(expr)] = self._column_value(expr)
+        else:
+            self._values[id(expr)] = self._get(expr.input)
+
+    def visit_scalar(self, expr):
+        self._values[id(expr)] = expr._value
+
+    def visit_binary_op(self, expr):
+        lhs, rhs = self._get(expr.lhs), self._get(expr.rhs)
+
+        try:
+            op = BINARY_OPS[expr.node_name]
+        except KeyError:
+            raise NotImplementedError
+        self._values[id(expr)] = op(lhs, rhs)
+
+    def visit_unary_op(self, expr):
+        value = self._get(expr.input)
+
+        if isinstance(expr, (arithmetic.Negate, arithmetic.Invert)) and \
+                expr.input.dtype == df_types.boolean:
+            result = ~value.astype(bool) if isinstance(value, pd.Series) else not value
+        elif isinstance(expr, arithmetic.Negate):
+            result = -value
+        elif isinstance(expr, arithmetic.Abs):
+            result = abs(value)
+        else:
+            raise NotImplementedError
+        self._values[id(expr)] = result
+
+    def visit_math(self, expr):
+        value = self._get(expr.input)
+
+        if expr.node_name in MATH_FUNCS:
+            result = getattr(np, MATH_FUNCS[expr.node_name])(value)
+        elif expr.node_name == 'Log':
+            result = np.log(value)
+            if expr._base is not None:
+                result = result / np.log(self._get(expr._base))
+        elif expr.node_name == 'Trunc':
+            if expr._decimals is None:
+                result = np.trunc(value)
+            else:
+                scale = 10 ** self._get(expr._decimals)
+                result = np.trunc(value * scale) / scale
+        else:
+            raise NotImplementedError
+        self._values[id(expr)] = result
+
+    def visit_string_op(self, expr):
+        value = self._get(expr.input)
+        class_name = type(expr).__name__
+
+        if isinstance(expr, strings.Extract):
+            regex = re.compile(expr.pat, expr.flags or 0)
+            group = expr.group or 0
+
+            def extract(s):
+                match = regex.search(s)
+                return match.group(group) if match else None
+
+            func = lambda series: series.map(lambda s: extract(s) if not _is_null(s) else None)
+        else:
+            kw = dict()
+            for arg in STRING_OP_ARGS.get(class_name, ()):
+                kw[arg] = getattr(expr, STRING_OP_ATTRS.get(arg, arg))
+            if kw.get('to_strip') is None:
+                kw.pop('to_strip', None)
+            method = class_name.lower()
+
+            func = lambda series: getattr(series.str, method)(**kw)
+
+        self._values[id(expr)] = self._apply(value, func)
+
+    def visit_datetime_op(self, expr):
+        value = self._get(expr.input)
+        class_name = type(expr).__name__
+
+        if class_name in DATETIME_FIELDS:
+            field = DATETIME_FIELDS[class_name]
+            func = lambda series: getattr(pd.to_datetime(series).dt, field)
+        elif class_name == 'Date':
+            func = lambda series: pd.to_datetime(series).dt.normalize()
+        elif class_name == 'Strftime':
+            date_format = expr._date_format
+            if isinstance(date_format, Scalar):
+                date_format = date_format.value
+            func = lambda series: pd.to_datetime(series).dt.strftime(date_format)
+        else:
+            raise NotImplementedError
+
+        self._values[id(expr)] = self._apply(value, func)
+
+    @classmethod
+    def _select(cls, conditions, thens, default, index):
+        """
+        Choose values of the first met conditions, like `CASE WHEN` in SQL.
+        """
+        def to_array(value, dtype=None):
+            if isinstance(value, pd.Series):
+                if not value.index.equals(index):
+                    value = value.reindex(index)
+                return value.values
+            return np.repeat(np.array([value], dtype=dtype), len(index))
+
+        conditions = [np.asarray(cls._to_mask(cond, index)) for cond in conditions]
+        thens = [to_array(then, dtype=object) for then in thens]
+        default = to_array(default, dtype=object)
+        result = np.select(conditions, thens, default=default) if conditions else default
+        return pd.Series(result, index=index)
+
+    def _element_index(self, values):
+        for value in values:
+            if isinstance(value, pd.Series):
+                return value.index
+
+    def visit_element_op(self, expr):
+        value = self._get(expr.input)
+
+        if isinstance(expr, element.IsNull):
+            result = pd.isnull(value)
+        elif isinstance(expr, element.NotNull):
+            result = pd.notnull(value)
+        elif isinstance(expr, element.FillNa):
+            fill_value = self._get(expr._value)
+            if isinstance(value, pd.Series):
+                result = value.where(value.notnull(), fill_value)
+            else:
+                result = fill_value if _is_null(value) else value
+        elif isinstance(expr, (element.IsIn, element.NotIn)):
+            values = [self._get(it) for it in expr._values]
+            if len(values) == 1 and isinstance(values[0], pd.Series):
+                values = values[0].dropna().unique()
+            if isinstance(value, pd.Series):
+                result = value.isin(values)
+                if isinstance(expr, element.NotIn):
+                    result = ~result
+            else:
+                result = (value in values) != isinstance(expr, element.NotIn)
+        elif isinstance(expr, element.Between):
+            left, right = self._get(expr._left), self._get(expr._right)
+            if expr.inclusive:
+                result = (value >= left) & (value <= right)
+            else:
+                result = (value > left) & (value < right)
+        elif isinstance(expr, (element.IfElse, element.Switch, element.Cut)):
+            if isinstance(expr, element.IfElse):
+                conditions = [value]
+                thens = [self._get(expr._then)]
+                default = self._get(expr._else)
+            elif isinstance(expr, element.Switch):
+                conditions = [self._get(cond) for cond in expr._conditions]
+                if expr._case is not None:
+                    case = self._get(expr._case)
+                    conditions = [case == cond for cond in conditions]
+                thens = [self._get(then) for then in expr._thens]
+                default = self._get(expr._default)
+            else:
+                conditions, thens = self._cut_conditions(expr, value)
+                default = None
+
+            index = self._element_index(conditions + thens + [default])
+            if index is None:
+                # all of the values are scalars
+                met = [i for i, cond in enumerate(conditions) if cond]
+                result = thens[met[0]] if met else default
+            else:
+                result = self._select(conditions, thens, default, index)
+        else:
+            raise NotImplementedError
+
+        self._values[id(expr)] = result
+
+    def _cut_conditions(self, expr, value):
+        bins = [self._get(b) for b in expr._bins]
+        labels = [self._get(label) for label in expr._labels]
+
+        conditions, thens = [], []
+        if expr.include_under:
+            if expr.right and not expr.include_lowest:
+                conditions.append(value <= bins[0])
+            else:
+                conditions.append(value < bins[0])
+            thens.append(labels[0])
+        for i, upper in enumerate(bins[1:]):
+            lower = bins[i]
+            if not expr.right or (i == 0 and expr.include_lowest):
+                condition = value >= lower
+            else:
+                condition = value > lower
+            if expr.right:
+                condition = condition & (value <= upper)
+            else:
+                condition = condition & (value < upper)
+            conditions.append(condition)
+            thens.append(labels[i + 1] if expr.include_under else labels[i])
+        if expr.include_over:
+            if expr.right:
+                conditions.append(value > bins[-1])
+            else:
+                conditions.append(value >= bins[-1])
+            thens.append(labels[-1])
+        return conditions, thens
+
+    def visit_map(self, expr):
+        value = self._get(expr.input)
+
+        func = expr._func
+        if inspect.isclass(func):
+            func = func()
+        # null values are passed as None as what the UDFs receive
+        wrapped = lambda v: func(None if _is_null(v) else v)
+
+        if isinstance(value, pd.Series):
+            self._values[id(expr)] = value.astype(object).map(wrapped)
+        else:
+            self._values[id(expr)] = wrapped(value)
+
+    @classmethod
+    def _cast_value(cls, value, source_type, to_type):
+        if _is_null(value):
+            return
+        if isinstance(source_type, df_types.Integer) and to_type == df_types.datetime:
+            return datetime.fromtimestamp(value)
+        if isinstance(to_type, df_types.Integer):
+            return int(value)
+        if isinstance(to_type, df_types.Float):
+            return float(value)
+        if to_type == df_types.boolean:
+            return bool(value)
+        if to_type == df_types.decimal:
+            return Decimal(str(value))
+        if to_type == df_types.string:
+            if isinstance(value, datetime):
+                return value.strftime('%Y-%m-%d %H:%M:%S')
+            return six.text_type(value)
+        if to_type == df_types.datetime and isinstance(value, six.string_types):
+            return datetime.strptime(value, '%Y-%m-%d %H:%M:%S')
+        return value
+
+    def visit_cast(self, expr):
+        value = self._get(expr.input)
+        source_type, to_type = expr.source_type, expr.dtype
+
+        if isinstance(value, pd.Series):
+            if to_type == df_types.datetime and \
+                    str(value.dtype).startswith('datetime64'):
+                result = value
+            else:
+                if str(value.dtype).startswith('datetime64'):
+                    value = value.astype(object)
+                result = value.map(lambda v: self._cast_value(v, source_type, to_type))
+                if result.notnull().all():
+                    result = result.astype(df_type_to_np_type(to_type))
+        else:
+            result = self._cast_value(value, source_type, to_type)
+        self._values[id(expr)] = result
+
+    def visit_reduction(self, expr):
+        input = expr.args[0]
+        grouped = self._grouper is not None and isinstance(expr, GroupedSequenceReduction)
+
+        if isinstance(input, CollectionExpr):
+            # count of collection
+            frame = self._evaluate_collection(input)
+            if grouped:
+                result = pd.Series(0, index=frame.index).groupby(
+                    self._grouper, sort=False).size()
+            else:
+                result = len(frame)
+            self._values[id(expr)] = result
+            return
+
+        kind = _reduction_kind(expr)
+        method = REDUCTION_METHODS[kind]
+        kw = dict()
+        if kind in ('Var', 'Std'):
+            kw['ddof'] = expr._ddof
+        elif kind == 'Sum':
+            # sum of NULLs is NULL as ODPS does
+            kw['min_count'] = 1
+
+        value = self._get(input)
+        if not isinstance(value, pd.Series):
+            value = pd.Series([value])
+        if input.dtype == df_types.boolean and kind == 'Sum':
+            value = value.astype(float)
+
+        if kind == 'Sum' and input.dtype == df_types.string:
+            func = lambda s: ''.join(s.dropna()) if s.notnull().any() else None
+        elif kind in ('Any', 'All'):
+            func = lambda s: getattr(s.dropna().astype(bool), method)()
+        else:
+            func = None
+
+        if grouped:
+            result = value.groupby(self._grouper, sort=False)
+            result = result.agg(func) if func is not None else getattr(result, method)(**kw)
+        else:
+            if func is None:
+                func = lambda s: getattr(s, method)(**kw)
+            result = func(value)
+            if hasattr(result, 'item'):
+                result = result.item()
+        self._values[id(expr)] = result
+
+    def _window_order(self, expr, index):
+        """
+        Order rows by the partition and order keys of the window.
+
+        :return: frame of ordered keys which is indexed by the original index,
+                 and holds the partition id as `_group`
+        """
+        partition_by = expr._partition_by or []
+        order_by = expr._order_by or []
+        part_names = ['_by%s' % i for i in range(len(partition_by))]
+        order_names = ['_order%s' % i for i in range(len(order_by))]
+
+        keys = self._to_frame(part_names + order_names,
+                              [self._get(by) for by in partition_by + order_by], index)
+        if part_names:
+            group = self._fill_null_keys(keys[part_names]).groupby(
+                part_names, sort=False).ngroup().values
+        else:
+            group = np.zeros(len(index), dtype='int64')
+        keys['_group'] = group
+        keys['_pos'] = np.arange(len(index))
+
+        ascending = [True] + [by._ascending for by in order_by] + [True]
+        keys = self._sort_keys(keys, ['_group'] + order_names + ['_pos'], ascending)
+        return keys, order_names
+
+    @classmethod
+    def _group_positions(cls, group):
+        """
+        :return: positions of rows in their groups and sizes of their groups
+        """
+        n = len(group)
+        arange = np.arange(n)
+        first = np.r_[True, group[1:] != group[:-1]] if n > 0 else np.array([], dtype=bool)
+        starts = np.maximum.accumulate(np.where(first, arange, 0)) if n > 0 else arange
+        counts = pd.Series(group).value_counts()
+        sizes = pd.Series(group).map(counts).values
+        return arange - starts, sizes, first
+
+    @classmethod
+    def _window_bounds(cls, i, n, preceding, following):
+        if isinstance(preceding, tuple):
+            start, end = preceding
+            lower, upper = (0 if start is None else i - start), i - end
+        elif isinstance(following, tuple):
+            start, end = following
+            lower, upper = i + start, (n - 1 if end is None else i + end)
+        else:
+            lower = 0 if preceding is None and following is None else \
+                i - (preceding or 0)
+            upper = i + (following or 0)
+        return max(lower, 0), min(upper, n - 1)
+
+    def visit_cum_window(self, expr):
+        value = self._get(expr.input)
+        index = value.index
+        if expr.input.dtype == df_types.boolean:
+            value = value.astype(float)
+
+        method = WINDOW_METHODS[expr.node_name]
+        kw = dict(ddof=0) if method == 'std' else dict()
+        func = lambda s: getattr(s, method)(**kw)
+
+        keys, order_names = self._window_order(expr, index)
+        ordered = pd.Series(value.reindex(keys.index).values)
+        grouped = ordered.groupby(keys['_group'].values, sort=False)
+        preceding, following = expr.preceding, expr.following
+
+        if expr.distinct:
+            result = grouped.transform(lambda s: func(s.drop_duplicates()))
+        elif not order_names and preceding is None and following is None:
+            # the window is the whole partition without order
+            result = grouped.transform(func)
+        elif preceding is None and following is None and \
+                ordered.dtype.kind in 'biuf':
+            result = grouped.transform(
+                lambda s: getattr(s.expanding(min_periods=1), method)(**kw))
+        else:
+            def rolling(s):
+                n = len(s)
+                values = []
+                for i in range(n):
+                    lower, upper = self._window_bounds(i, n, preceding, following)
+                    values.append(func(s.iloc[lower:upper + 1]) if lower <= upper else None)
+                return pd.Series(values, index=s.index)
+
+            result = grouped.transform(rolling)
+
+        self._values[id(expr)] = pd.Series(result.values, index=keys.index).reindex(index)
+
+    def visit_rank_window(self, expr):
+        index = self._current_index(expr.input)
+        keys, order_names = self._window_order(expr, index)
+
+        group = keys['_group'].values
+        positions, sizes, first = self._group_positions(group)
+        # rows are tied when all of their order keys equal to those of the previous row
+        tied = ~first
+        for name in order_names:
+            values = keys[name].values
+            tied &= np.r_[False, values[1:] == values[:-1]] if len(values) > 0 else tied
+
+        row_number = positions + 1
+        rank = pd.Series(np.where(tied, np.nan, row_number)).ffill().values
+        if isinstance(expr, window.RowNumber):
+            result = row_number
+        elif isinstance(expr, window.Rank):
+            result = rank
+        elif isinstance(expr, window.DenseRank):
+            changes = np.cumsum(~tied)
+            result = changes - changes[np.maximum.accumulate(
+                np.where(first, np.arange(len(group)), 0))] + 1
+        elif isinstance(expr, window.PercentRank):
+            result = np.where(sizes > 1, (rank - 1) / np.maximum(sizes - 1, 1), 0.0)
+        else:
+            raise NotImplementedError
+
+        self._values[id(expr)] = pd.Series(result, index=keys.index).reindex(index)
+
+    def visit_shift_window(self, expr):
+        value = self._get(expr.input)
+        index = value.index
+        offset = expr._offset if expr._offset is not None else 1
+        if isinstance(expr, window.Lead):
+            offset = -offset
+
+        keys, _ = self._window_order(expr, index)
+        group = keys['_group'].values
+        ordered = pd.Series(value.reindex(keys.index).values)
+        result = ordered.groupby(group, sort=False).shift(offset)
+
+        if expr._default is not None:
+            positions, sizes, _ = self._group_positions(group)
+            if offset > 0:
+                missing = positions < offset
+            else:
+                missing = positions >= sizes + offset
+            result = result.astype(object).where(~missing, expr._default)
+
+        self._values[id(expr)] = pd.Series(result.values, index=keys.index).reindex(index)
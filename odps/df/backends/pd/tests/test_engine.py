@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from datetime import datetime
+
+from odps.tests.core import TestBase
+from odps.compat import unittest
+from odps.models import Record
+from odps.df import DataFrame, Scalar
+from odps.df import types as df_types
+from odps.df.engines import get_default_engine, available_engines, Engines
+from odps.df.backends.frame import ResultFrame
+
+try:
+    import pandas as pd
+    from odps.df.backends.pd.engine import PandasEngine
+except ImportError:
+    pd = None
+
+
+@unittest.skipIf(pd is None, 'pandas not installed')
+class Test(TestBase):
+    def setup(self):
+        self.data = [
+            ['name1', 4, 5.3, True, datetime(2016, 1, 1, 10, 0, 0)],
+            ['name2', 2, 3.5, False, datetime(2016, 1, 2, 10, 0, 0)],
+            ['name1', 4, 4.2, True, datetime(2016, 1, 3, 10, 0, 0)],
+            ['name1', 3, 2.2, None, datetime(2016, 1, 4, 10, 0, 0)],
+            ['name2', 3, 4.1, False, datetime(2016, 1, 5, 10, 0, 0)],
+        ]
+        self.pd_df = pd.DataFrame(self.data, columns=['name', 'id', 'fid', 'isMale', 'birth'])
+        self.df = DataFrame(self.pd_df)
+        self.engine = PandasEngine()
+
+    def testSchema(self):
+        self.assertEqual(self.df.schema.names, ['name', 'id', 'fid', 'isMale', 'birth'])
+        self.assertEqual(self.df.schema.types, [df_types.string, df_types.int64, df_types.float64,
+                                                df_types.boolean, df_types.datetime])
+        self.assertEqual(available_engines(self.df), set([Engines.PANDAS]))
+        self.assertIsInstance(get_default_engine(self.df), PandasEngine)
+
+    def testFilterProjection(self):
+        expr = self.df[self.df.id > 2]
+        expr = expr[expr.name, (expr.fid + 1).rename('fid1')]
+        res = self.engine.execute(expr)
+
+        self.assertIsInstance(res, ResultFrame)
+        self.assertEqual([list(r) for r in res.values.values],
+                         [['name1', 6.3], ['name1', 5.2], ['name1', 3.2], ['name2', 5.1]])
+
+        res = self.engine.execute(self.df.isMale.isnull().sum())
+        self.assertEqual(res, 1)
+
+        res = self.engine.execute(self.df[self.df.name.isin(['name2'])].id.sum())
+        self.assertEqual(res, 5)
+        self.assertIsInstance(res, int)
+
+    def testSortSlice(self):
+        expr = self.df.sort(['id', 'fid'], ascending=[False, True])[:3]
+        res = self.engine.execute(expr)
+
+        self.assertEqual(list(res.values['fid']), [4.2, 5.3, 2.2])
+
+        res = self.engine.execute(self.df.id, tail=2)
+        self.assertEqual(list(res.values['id']), [3, 3])
+
+    def testGroupby(self):
+        expr = self.df.groupby('name').agg(self.df.id.sum().rename('id_sum'),
+                                           self.df.id.count().rename('count'))
+        res = self.engine.execute(expr.sort('name'))
+
+        self.assertEqual([list(r) for r in res.values.values],
+                         [['name1', 3, 11], ['name2', 2, 5]])
+
+        expr = self.df.groupby('name').agg(fid_max=self.df.fid.max())
+        expr = expr[expr.fid_max > 5]
+        res = self.engine.execute(expr)
+        self.assertEqual([list(r) for r in res.values.values], [['name1', 5.3]])
+
+        res = self.engine.execute(self.df.name.value_counts())
+        self.assertEqual([list(r) for r in res.values.values], [['name1', 3], ['name2', 2]])
+
+    def testNullSemantics(self):
+        pd_df = pd.DataFrame([['a', None], ['b', 1.0], ['a', None], ['c', None], ['c', 2.0]],
+                             columns=['name', 'fid'])
+        df = DataFrame(pd_df)
+        to_lists = lambda res: [list(r) for r in res.values.astype(object).where(
+            res.values.notnull(), None).values]
+
+        # sums of NULLs are NULL as ODPS does
+        self.assertIsNone(self.engine.execute(df[df.name == 'a'].fid.sum()))
+        expr = df.groupby('name').agg(fid_sum=df.fid.sum()).sort('name')
+        self.assertEqual(to_lists(self.engine.execute(expr)),
+                         [['a', None], ['b', 1.0], ['c', 2.0]])
+
+        # NULLs are the smallest values in sorting
+        res = self.engine.execute(df.sort('fid'))
+        self.assertEqual([r[1] for r in to_lists(res)], [None, None, None, 1.0, 2.0])
+        res = self.engine.execute(df.sort(['fid', 'name'], ascending=[False, True]))
+        self.assertEqual(to_lists(res), [['c', 2.0], ['b', 1.0], ['a', None],
+                                         ['a', None], ['c', None]])
+
+    def testJoinUnion(self):
+        pd_df2 = pd.DataFrame([['name1', 'a'], ['name3', 'b']], columns=['name', 'tag'])
+        df2 = DataFrame(pd_df2)
+
+        expr = self.df.join(df2, on='name')[self.df.id, df2.tag]
+        res = self.engine.execute(expr)
+        self.assertEqual([list(r) for r in res.values.values], [[4, 'a'], [4, 'a'], [3, 'a']])
+
+        expr = self.df.left_join(df2, on='name')[self.df.id, df2.tag]
+        res = self.engine.execute(expr)
+        self.assertEqual([list(r) for r in res.values.astype(object).where(
+            res.values.notnull(), None).values],
+            [[4, 'a'], [2, None], [4, 'a'], [3, 'a'], [3, None]])
+
+        expr = self.df['name', ].union(df2['name', ], distinct=True)
+        res = self.engine.execute(expr)
+        self.assertEqual(sorted(res.values['name']), ['name1', 'name2', 'name3'])
+
+    def testWindow(self):
+        grouped = self.df.groupby('name').sort('fid')
+        expr = self.df['name', 'fid', grouped.fid.cumsum(), grouped.row_number(),
+                       grouped.id.lag(1, default=0).rename('id_lag')]
+        res = self.engine.execute(expr)
+
+        values = [list(r) for r in res.values.values]
+        self.assertEqual([r[2] for r in values], [11.7, 3.5, 6.4, 2.2, 7.6])
+        self.assertEqual([r[3] for r in values], [3, 1, 2, 1, 2])
+        self.assertEqual([r[4] for r in values], [4, 0, 3, 0, 2])
+
+    def testMapAndElement(self):
+        expr = self.df.name.map(lambda v: v.upper())
+        res = self.engine.execute(expr)
+        self.assertEqual(list(res.values['name']), ['NAME1', 'NAME2', 'NAME1', 'NAME1', 'NAME2'])
+
+        expr = self.df.id.switch(4, 'four', 3, 'three', default='other')
+        res = self.engine.execute(expr)
+        self.assertEqual(list(res.values.iloc[:, 0]), ['four', 'other', 'four', 'three', 'three'])
+
+        res = self.engine.execute(self.df.birth.day.max())
+        self.assertEqual(res, 5)
+
+    def testExecute(self):
+        self.assertEqual(self.df[self.df.id > 3].count().execute(), 2)
+        self.assertEqual(self.engine.execute(Scalar(1)), 1)
+
+        res = self.df.sort('fid')[:2].execute()
+        df = DataFrame(res)
+        self.assertEqual(df.schema.names, self.df.schema.names)
+        self.assertEqual(df.fid.sum().execute(), 2.2 + 3.5)
+
+        batches = list(self.df.iter_batches(batch_size=2))
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        self.assertEqual(list(batches[-1].index), [4])
+
+        batches = list(self.engine.iter_batches(self.df, batch_size=2, batch_format='records'))
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        self.assertTrue(all(isinstance(r, Record) for r in batches[0]))
+        self.assertEqual(batches[0][0].values, self.data[0])
+        self.assertEqual(batches[0][0]['name'], self.data[0][0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from datetime import datetime
+from decimal import Decimal
+
+import six
+
+from ....models import Schema
+from ... import types as df_types
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:
+    np = pd = None
+
+
+_np_kind_to_df_types = {
+    'b': df_types.boolean,
+    'i': df_types.int64,
+    'u': df_types.int64,
+    'f': df_types.float64,
+    'M': df_types.datetime,
+}
+
+_np_to_df_types = {
+    'int8': df_types.int8,
+    'int16': df_types.int16,
+    'int32': df_types.int32,
+    'int64': df_types.int64,
+    'float32': df_types.float32,
+    'float64': df_types.float64,
+}
+
+
+def _infer_object_type(values):
+    for value in values:
+        if value is None or (isinstance(value, float) and value != value):
+            continue
+        if isinstance(value, bool):
+            return df_types.boolean
+        if isinstance(value, six.integer_types):
+            return df_types.int64
+        if isinstance(value, float):
+            return df_types.float64
+        if isinstance(value, Decimal):
+            return df_types.decimal
+        if isinstance(value, datetime):
+            return df_types.datetime
+        if isinstance(value, six.string_types + (six.binary_type, )):
+            return df_types.string
+        raise ValueError('Cannot infer the type of value: %r' % value)
+    # all values are null
+    return df_types.string
+
+
+def pd_type_to_df_type(dtype, values=None):
+    """
+    Get the DataFrame type of a pandas column by its NumPy dtype,
+    the type of object columns is inferred from their values.
+    """
+    dtype = np.dtype(dtype)
+    if dtype.name in _np_to_df_types:
+        return _np_to_df_types[dtype.name]
+    if dtype.kind in _np_kind_to_df_types:
+        return _np_kind_to_df_types[dtype.kind]
+    if dtype.kind in ('O', 'S', 'U'):
+        return _infer_object_type(values if values is not None else [])
+    raise ValueError('Unknown dtype: %s' % dtype)
+
+
+def pd_to_df_schema(pd_df):
+    names = [str(name) for name in pd_df.columns]
+    types = [pd_type_to_df_type(pd_df[name].dtype, pd_df[name].values)
+             for name in pd_df.columns]
+
+    return Schema.from_lists(names, types)
+
+
+_df_to_np_types = {
+    df_types.int8: 'int64',
+    df_types.int16: 'int64',
+    df_types.int32: 'int64',
+    df_types.int64: 'int64',
+    df_types.float32: 'float64',
+    df_types.float64: 'float64',
+    df_types.boolean: 'bool',
+    df_types.datetime: 'datetime64[ns]',
+}
+
+
+def df_type_to_np_type(df_type):
+    """
+    Get the NumPy dtype holding values of the DataFrame type,
+    ``object`` for strings and decimals.
+    """
+    return np.dtype(_df_to_np_types.get(df_type, 'object'))
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import array
+from datetime import datetime
+
+from odps.tests.core import TestBase
+from odps.compat import unittest, OrderedDict
+from odps.df.backends.frame import ResultFrame, ResultColumns, iter_result_batches
+from odps.df.types import validate_data_type
+from odps.models import Schema
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:
+    pd = None
+
+
+class Test(TestBase):
+    def setup(self):
+        datatypes = lambda *types: [validate_data_type(t) for t in types]
+        self.schema = Schema.from_lists(['name', 'id', 'fid', 'dt'],
+                                        datatypes('string', 'int64', 'float64', 'datetime'))
+        self.data = [
+            ['name1', 1, 1.5, datetime(2016, 1, 1)],
+            ['name2', None, None, None],
+            ['name3', 3, 3.5, datetime(2016, 1, 3)],
+        ]
+
+    def testColumns(self):
+        data = ResultColumns(self.schema.columns)
+        data.extend(self.data)
+        data.append(['name4', 2 ** 64, 4.5, datetime(2016, 1, 4)])
+        self.assertEqual(len(data), 4)
+        self.assertRaises(ValueError, data.append, ['name5'])
+
+        columns = data.to_columns()
+        self.assertEqual(columns[0], ['name1', 'name2', 'name3', 'name4'])
+        # the typed array falls back to a list when a value overflows
+        self.assertEqual(columns[1], [1, None, 3, 2 ** 64])
+        self.assertEqual(columns[2], [1.5, None, 3.5, 4.5])
+
+        data = ResultColumns(self.schema.columns)
+        data.extend([self.data[0], self.data[2]])
+        columns = data.to_columns()
+        self.assertIsInstance(columns[1], array.array)
+        self.assertEqual(list(columns[1]), [1, 3])
+
+    def testNonPandasFrame(self):
+        frame = ResultFrame(self.data, schema=self.schema, pandas=False)
+        self.assertEqual(len(frame), 3)
+        self.assertEqual(frame.index, [0, 1, 2])
+        self.assertEqual(frame.values, self.data)
+        # rows are built once
+        self.assertIs(frame.values, frame.values)
+        self.assertEqual(list(frame), self.data)
+        self.assertEqual(frame[2], self.data[2])
+        self.assertEqual(frame[1:, 0], ['name2', 'name3'])
+        self.assertEqual(frame[1:][:, 1:3].values, [[None, None], [3, 3.5]])
+
+        concated = frame[:1].concat(frame[-1:])
+        self.assertEqual(concated.values, [self.data[0], self.data[2]])
+        self.assertEqual(concated.index, [0, 2])
+        concated = frame[:, :1].concat(frame[:, 2:3], axis=1)
+        self.assertEqual(concated.values, [[r[0], r[2]] for r in self.data])
+
+        columns = OrderedDict(zip(self.schema.names, zip(*self.data)))
+        frame = ResultFrame(columns, schema=self.schema, pandas=False)
+        self.assertEqual(frame.values, self.data)
+
+    @unittest.skipIf(pd is None, 'pandas not installed')
+    def testPandasFrame(self):
+        frame = ResultFrame(self.data, schema=self.schema)
+        expected = pd.DataFrame(self.data, columns=self.schema.names)
+        self.assertTrue(frame.values.equals(expected))
+        self.assertEqual(list(frame.values.dtypes), list(expected.dtypes))
+
+        data = ResultColumns(self.schema.columns)
+        data.extend([self.data[0], self.data[2]])
+        frame = ResultFrame(data, schema=self.schema)
+        self.assertEqual(frame.values['id'].dtype, np.int64)
+        self.assertEqual(list(frame.values['id']), [1, 3])
+
+        ids = np.arange(3)
+        columns = OrderedDict([('name', ['a', 'b', 'c']), ('id', ids),
+                               ('fid', np.ones(3)), ('dt', [datetime(2016, 1, 1)] * 3)])
+        frame = ResultFrame(columns, schema=self.schema)
+        self.assertEqual(list(frame.values.columns), self.schema.names)
+        self.assertEqual(list(frame.values['id']), [0, 1, 2])
+        self.assertEqual(frame.values['id'].dtype, np.int64)
+
+    def testIterResultBatches(self):
+        batches = list(iter_result_batches(iter(self.data), self.schema.columns, 2,
+                                           batch_format='records'))
+        self.assertEqual(batches, [self.data[:2], self.data[2:]])
+        self.assertEqual(list(iter_result_batches([], self.schema.columns, 2)), [])
+
+        if pd is None:
+            return
+        batches = list(iter_result_batches(iter(self.data), self.schema.columns, 2))
+        self.assertEqual([2, 1], [len(b) for b in batches])
+        self.assertTrue(pd.concat(batches).equals(
+            pd.DataFrame(self.data, columns=self.schema.names)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from __future__ import print_function
+
+from ...config import options
+from ...models import Table
+from ..expr.expressions import CollectionExpr, Column, FilterCollectionExpr
+
+
+def _to_stdout(msg):
+    print(msg)
+
+
+def log(msg):
+    """
+    Log the message by ``options.verbose_log``, or print it, if ``options.verbose`` is set.
+    """
+    if options.verbose:
+        (options.verbose_log or _to_stdout)(msg)
+
+
+def _is_table_source(expr):
+    return isinstance(expr, CollectionExpr) and isinstance(expr._source_data, Table)
+
+
+def table_source_partitions(expr):
+    """
+    Find the source collections of ODPS tables and the partitions read from them.
+    A table is only read through partitions if all the references of its collection
+    are filters on its whole partitions.
+
+    :return: dict of ids of the collections to tuples of the collection, the table
+             and the list of partitions, each as a tuple of column names and values in
+             the order of the partition columns, or None if the whole table is read
+    """
+    from .odpssql.engine import ODPSEngine
+
+    sources = dict()
+    users = dict()
+    filters = dict()
+    predicate_nodes = set()
+
+    for node in expr.traverse(unique=True):
+        if _is_table_source(node):
+            sources[id(node)] = node
+        for child in node.children():
+            if _is_table_source(child):
+                users.setdefault(id(child), []).append(node)
+        if isinstance(node, FilterCollectionExpr) and _is_table_source(node.input):
+            partition = ODPSEngine._filter_on_partition(node)
+            if partition:
+                filters[id(node)] = partition
+                predicate_nodes.update(id(n) for n in node.predicate.traverse(unique=True))
+
+    result = dict()
+    for source_id, source in sources.items():
+        table = source._source_data
+        partition_names = [p.name for p in table.schema._partitions or []]
+
+        partitions = []
+        for user in users.get(source_id, []):
+            if isinstance(user, Column) and id(user) in predicate_nodes:
+                continue
+            values = dict(filters.get(id(user)) or [])
+            if not partition_names or sorted(values) != sorted(partition_names):
+                partitions = None
+                break
+            partition = tuple((name, values[name]) for name in partition_names)
+            if partition not in partitions:
+                partitions.append(partition)
+
+        result[source_id] = (source, table, partitions or None)
+    return result
@@ -17,17 +17,25 @@
 # specific language governing permissions and limitations
 # under the License.
 
-from ..models import Table
+from ..models import Table, Schema
 from .expr.utils import get_attrs
 from .expr.expressions import CollectionExpr
+from .backends.frame import ResultFrame
 from .backends.odpssql.types import odps_schema_to_df_schema
+from .backends.pd.types import pd_to_df_schema
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
 
 
 class DataFrame(CollectionExpr):
     """
     Main entrance of PyOdps DataFrame.
 
-    Users can initial a DataFrame by :class:`odps.models.Table`.
+    Users can initial a DataFrame by :class:`odps.models.Table`, a pandas DataFrame
+    or the result of an execution. DataFrames of local data are executed by pandas.
 
     :Example:
 
@@ -56,18 +64,33 @@ class DataFrame(CollectionExpr):
     >>>
     >>> # We can use the `value_counts` to reach the same goal
     >>> df.movie_id.value_counts()[:25]
+    >>>
+    >>> # Local data is executed locally
+    >>> local_df = DataFrame(pd.DataFrame({'a': [1, 2, 3]}))
+    >>> local_df[local_df.a > 1].a.sum()
+    5
     """
 
     __slots__ = ()
 
     def __init__(self, data, **kwargs):
         """
-        :param data: ODPS table
+        :param data: ODPS table, pandas DataFrame or result frame
         :type data: :class:`odps.models.Table`
         """
         if isinstance(data, Table):
             schema = odps_schema_to_df_schema(data.schema)
             super(DataFrame, self).__init__(_source_data=data, _schema=schema, **kwargs)
+        elif isinstance(data, ResultFrame):
+            schema = Schema.from_lists([col.name for col in data.columns],
+                                       [col.type for col in data.columns])
+            values = data.values
+            if pd is not None and not isinstance(values, pd.DataFrame):
+                values = pd.DataFrame(values, columns=schema.names)
+            super(DataFrame, self).__init__(_source_data=values, _schema=schema, **kwargs)
+        elif pd is not None and isinstance(data, pd.DataFrame):
+            schema = pd_to_df_schema(data)
+            super(DataFrame, self).__init__(_source_data=data, _schema=schema, **kwargs)
         else:
             raise ValueError('Unknown type: %s' % data)
 
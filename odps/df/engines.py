@@ -20,14 +20,28 @@
 from enum import Enum
 
 from .backends.odpssql.engine import ODPSEngine
+from .backends.pd.engine import PandasEngine
+from .backends.utils import log, table_source_partitions
 from .errors import NoBackendFound
+from .. import types as odps_types
+from ..errors import ODPSError
 from ..models import Table
 from ..config import options
 from .. import ODPS
 
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
 
 class Engines(Enum):
     ODPS = 'ODPS'
+    PANDAS = 'PANDAS'
+
+
+def _is_local_data(src):
+    return pd is not None and isinstance(src, pd.DataFrame)
 
 
 def available_engines(expr):
@@ -36,6 +50,8 @@ def available_engines(expr):
     for src in expr.data_source():
         if isinstance(src, Table):
             engines.add(Engines.ODPS)
+        elif _is_local_data(src):
+            engines.add(Engines.PANDAS)
 
     return engines
 
@@ -51,9 +67,141 @@ def _build_odps_from_table(table):
                 project, endpoint=endpoint)
 
 
-def get_default_engine(expr):
-    for src in expr.data_source():
-        if isinstance(src, Table):
-            return ODPSEngine(_build_odps_from_table(src))
+class EnginePlan(object):
+    """
+    Decision of the engine which executes an expression.
+
+    :ivar engine: the engine chosen
+    :ivar reason: why the engine is chosen
+    :ivar sizes: list of the ODPS sources and their estimated sizes in bytes
+    """
+
+    def __init__(self, engine, reason, sizes=None):
+        self.engine = engine
+        self.reason = reason
+        self.sizes = sizes or []
+
+    def __str__(self):
+        lines = ['Engine: %s' % type(self.engine).__name__,
+                 'Reason: %s' % self.reason]
+        if self.sizes:
+            lines.append('Sources:')
+            lines.extend('  %s: %s bytes' % it for it in self.sizes)
+        return '\n'.join(lines)
+
+    __repr__ = __str__
+
+
+# estimated bytes of each value when the size of a table is unknown
+_VALUE_SIZES = {
+    odps_types.boolean: 1,
+    odps_types.string: 32,
+    odps_types.decimal: 16,
+}
+
+
+def _format_partition(partition):
+    return ','.join('%s=%s' % it for it in partition)
+
+
+def _estimate_size(table, partition=None):
+    """
+    Estimate the bytes of a table or its partition by the size in its meta,
+    the physical size if unknown, or the record count of a download session at last.
+    """
+    spec = _format_partition(partition) if partition is not None else None
+    meta = table.get_partition(spec) if spec is not None else table
+    for attr in ('size', 'physical_size'):
+        try:
+            size = getattr(meta, attr)
+        except ODPSError:
+            size = None
+        if size:
+            return size
+
+    with table.open_reader(reopen=True, partition=spec) as reader:
+        record_size = sum(_VALUE_SIZES.get(col.type, 8) for col in table.schema.columns)
+        return reader.count * record_size
+
+
+def _table_sources(expr):
+    """
+    Find the source collections of ODPS tables which can be downloaded.
+    A partitioned table must be filtered by one whole partition,
+    so that only the partition is downloaded.
+
+    :return: dict of ids of the collections to tuples of the collection, the table and
+             the partition as a list of column names and values, None if any table
+             cannot be downloaded
+    """
+    result = dict()
+    for source_id, (source, table, partitions) in table_source_partitions(expr).items():
+        if not table.schema._partitions:
+            result[source_id] = (source, table, None)
+        elif partitions is not None and len(partitions) == 1:
+            result[source_id] = (source, table, list(partitions[0]))
+        else:
+            return
+    return result
+
+
+def plan_engine(expr, local=True):
+    """
+    Choose the engine to execute the expression.
+
+    Expressions of local data are executed by pandas. Expressions of ODPS tables are
+    executed locally as well if the tables can be downloaded, the expression is supported
+    by pandas and their estimated size is within ``options.df.local_memory_limit``, which
+    saves the cost of scheduling ODPS instances for small data, otherwise they are
+    executed by ODPS.
+
+    :param expr: expression to execute
+    :param local: if False, ODPS tables are always executed by ODPS
+    :return: :class:`odps.df.engines.EnginePlan`
+    """
+    engines = available_engines(expr)
+    if not engines:
+        raise NoBackendFound('No backend found for expression: %s' % expr)
+    if engines == set([Engines.PANDAS]):
+        return EnginePlan(PandasEngine(), 'all of the sources are local data')
+
+    def odps_plan(reason, sizes=None):
+        if Engines.PANDAS in engines:
+            raise NoBackendFound('Cannot execute expression of both ODPS tables and '
+                                 'local data as %s' % reason)
+        table = next(src for src in expr.data_source() if isinstance(src, Table))
+        return EnginePlan(ODPSEngine(_build_odps_from_table(table)), reason, sizes)
+
+    limit = options.df.local_memory_limit
+    if not local:
+        return odps_plan('the expression is required to run on ODPS')
+    if pd is None:
+        return odps_plan('pandas is not installed')
+    if limit is None:
+        return odps_plan('local execution is disabled by options.df.local_memory_limit')
+
+    sources = _table_sources(expr)
+    if sources is None:
+        return odps_plan('partitioned tables are not filtered by a whole partition')
+    if not PandasEngine.is_supported(expr):
+        return odps_plan('the expression is not supported by local execution')
+
+    sizes = []
+    for _, table, partition in sources.values():
+        name = table.name if partition is None \
+            else '%s(%s)' % (table.name, _format_partition(partition))
+        sizes.append((name, _estimate_size(table, partition)))
+    total = sum(size for _, size in sizes)
+
+    if total > limit:
+        return odps_plan('estimated size %s exceeds the local memory limit %s'
+                         % (total, limit), sizes)
+    return EnginePlan(PandasEngine(sources),
+                      'estimated size %s is within the local memory limit %s, '
+                      'tables are downloaded through tunnel' % (total, limit), sizes)
+
 
-    raise NoBackendFound('No backend found for expression: %s' % expr)
+def get_default_engine(expr, local=True):
+    plan = plan_engine(expr, local=local)
+    log('Execute with %s as %s' % (type(plan.engine).__name__, plan.reason))
+    return plan.engine
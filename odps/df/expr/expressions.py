@@ -72,13 +72,21 @@ class Expr(Node):
             return repr(self.__execution)
 
     @run_at_once
-    def execute(self, use_cache=None):
+    def execute(self, use_cache=None, stream=False, batch_size=None):
         """
         :param use_cache: use the executed result if has been executed
+        :param stream: if True, return an iterator of result batches instead,
+                       see :meth:`odps.df.expr.expressions.CollectionExpr.iter_batches`
+        :param batch_size: records of each batch when ``stream`` is True
         :return: execution result
         :rtype: :class:`odps.df.backends.frame.ResultFrame`
         """
 
+        if stream:
+            from ..engines import get_default_engine
+
+            return get_default_engine(self).iter_batches(self, batch_size=batch_size)
+
         if use_cache is None:
             use_cache = options.df.use_cache
         if use_cache and self.__execution:
@@ -100,9 +108,27 @@ class Expr(Node):
 
         from ..engines import get_default_engine
 
-        engine = get_default_engine(self)
+        engine = get_default_engine(self, local=False)
         return engine.compile(self)
 
+    def explain(self):
+        """
+        Explain which engine executes this expression and why,
+        the compiled ODPS SQL is included if executed by ODPS.
+
+        :return: explanation
+        :rtype: str
+        """
+
+        from ..engines import plan_engine
+        from ..backends.odpssql.engine import ODPSEngine
+
+        plan = plan_engine(self)
+        explanation = str(plan)
+        if isinstance(plan.engine, ODPSEngine):
+            explanation += '\nSQL:\n' + plan.engine.compile(self)
+        return explanation
+
     @run_at_once
     def persist(self, name, partitions=None):
         """
@@ -124,7 +150,7 @@ class Expr(Node):
 
         from ..engines import get_default_engine
 
-        engine = get_default_engine(self)
+        engine = get_default_engine(self, local=False)
         return engine.persist(self, name, partitions=partitions)
 
     def verify(self):
@@ -556,13 +582,7 @@ class CollectionExpr(Expr):
         from ..engines import get_default_engine
 
         engine = get_default_engine(self)
-        result = engine._handle_cases(self, tail=n)
-
-        if result:
-            return result
-
-        # TODO: The tail will not be supported until the instance tunnel is ready
-        raise NotImplementedError
+        return engine.execute(self, tail=n)
 
     @run_at_once
     def to_pandas(self, use_cache=None):
@@ -581,6 +601,29 @@ class CollectionExpr(Expr):
 
         return self.execute(use_cache=use_cache).values
 
+    @run_at_once
+    def iter_batches(self, batch_size=None, batch_format=None):
+        """
+        Execute and iterate over the result batch by batch. Batches are yielded
+        as soon as they are read from tunnel or the instance result, so results
+        larger than memory can be processed.
+
+        :param batch_size: records of each batch, default as ``options.df.batch_size``
+        :param batch_format: ``pandas`` to yield pandas DataFrames, ``records`` to yield
+                             lists of records, default as ``pandas`` if pandas is installed
+        :return: iterator of batches
+
+        :Example:
+
+        >>> for batch in df.iter_batches(batch_size=10000):
+        >>>     # process each pandas DataFrame
+        """
+
+        from ..engines import get_default_engine
+
+        engine = get_default_engine(self)
+        return engine.iter_batches(self, batch_size=batch_size, batch_format=batch_format)
+
     @property
     def dtypes(self):
         return self.schema
@@ -748,7 +791,8 @@ class SequenceExpr(TypedExpr):
 
         engine = get_default_engine(self)
 
-        collection = engine._ctx.get_replaced_expr(self)
+        ctx = getattr(engine, '_ctx', None)
+        collection = ctx.get_replaced_expr(self) if ctx is not None else None
         if collection is None:
             collection = engine._convert_table(self)
         return collection.head(n=n)
@@ -766,7 +810,8 @@ class SequenceExpr(TypedExpr):
 
         engine = get_default_engine(self)
 
-        collection = engine._ctx.get_replaced_expr(self)
+        ctx = getattr(engine, '_ctx', None)
+        collection = ctx.get_replaced_expr(self) if ctx is not None else None
         if collection is None:
             collection = engine._convert_table(self)
         return collection.tail(n=n)
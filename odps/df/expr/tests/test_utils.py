@@ -37,5 +37,44 @@ class Test(TestBase):
                     '_source_name', '_engine', '_cached_args')
         self.assertSequenceEqual(expected, get_attrs(expr.id + 1))
 
+    def testStructuralHash(self):
+        schema = Schema.from_lists(['name', 'id'], [types.string, types.int64])
+        table = MockTable(name='pyodps_test_expr_table', schema=schema)
+        table2 = MockTable(name='pyodps_test_expr_table2', schema=schema)
+
+        def build(table, value=1, func=lambda v: v + 1):
+            expr = CollectionExpr(_source_data=table, _schema=schema)
+            expr = expr[expr.id > value]
+            return expr.groupby('name').agg(expr.id.map(func).sum())
+
+        self.assertEqual(structural_hash(build(table)), structural_hash(build(table)))
+        self.assertNotEqual(structural_hash(build(table)), structural_hash(build(table2)))
+        self.assertNotEqual(structural_hash(build(table)), structural_hash(build(table, 2)))
+        self.assertNotEqual(structural_hash(build(table)),
+                            structural_hash(build(table, func=lambda v: v + 2)))
+
+        n = 1
+        self.assertNotEqual(structural_hash(build(table, func=lambda v: v + n)),
+                            structural_hash(build(table, func=lambda v: v + n + 1)))
+
+        obj = object()
+        self.assertRaises(UnhashableExpr, structural_hash, build(table, func=lambda v: obj))
+
+        class Conf(object):
+            factor = 2
+
+        class SubConf(Conf):
+            pass
+
+        func = lambda v: v * SubConf.factor
+        h = structural_hash(build(table, func=func))
+        self.assertEqual(structural_hash(build(table, func=func)), h)
+        Conf.factor = 3
+        self.assertNotEqual(structural_hash(build(table, func=func)), h)
+
+        # user-defined objects held by classes cannot be hashed
+        Conf.default = obj
+        self.assertRaises(UnhashableExpr, structural_hash, build(table, func=func))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
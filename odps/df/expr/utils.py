@@ -17,14 +17,18 @@
 # specific language governing permissions and limitations
 # under the License.
 
+import hashlib
 import itertools
 import inspect
 import traceback
+from datetime import datetime
+from decimal import Decimal
 
 import six
 
 from .. import types
 from ... import compat
+from ...models import Schema
 
 
 def add_method(expr, methods):
@@ -75,3 +79,157 @@ def get_attrs(node):
 
 def is_called_by_inspector():
     return any(1 for v in traceback.extract_stack() if 'oinspect' in v[0].lower() and 'ipython' in v[0].lower())
+
+
+class UnhashableExpr(Exception):
+    """
+    Raised when an expression holds values whose structure cannot be hashed.
+    """
+
+
+# attributes which do not change the result of an expression
+_unhashed_attrs = frozenset(['_cached_args', '_engine'])
+
+
+def _hash_code(code, parts):
+    parts.append(code.co_code)
+    parts.append(repr(code.co_names))
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            _hash_code(const, parts)
+        else:
+            parts.append(repr(const))
+
+
+# attributes of classes which are set up by Python itself
+_unhashed_class_attrs = frozenset(['__dict__', '__weakref__', '__module__', '__qualname__'])
+
+
+def _hash_class(cls, parts, hash_value):
+    parts.append('class:%s' % cls.__name__)
+    # methods may read any attribute of the class or its bases
+    for base in inspect.getmro(cls):
+        if base is object:
+            continue
+        parts.append('base:%s.%s' % (base.__module__, base.__name__))
+        for name, attr in sorted(six.iteritems(base.__dict__), key=lambda it: it[0]):
+            if name in _unhashed_class_attrs:
+                continue
+            parts.append(name)
+            if isinstance(attr, (staticmethod, classmethod)):
+                attr = attr.__func__
+            if inspect.isfunction(attr):
+                _hash_function(attr, parts, hash_value)
+            elif isinstance(attr, property):
+                for accessor in (attr.fget, attr.fset, attr.fdel):
+                    hash_value(accessor)
+            else:
+                hash_value(attr)
+
+
+def _hash_function(func, parts, hash_value):
+    if inspect.isclass(func):
+        _hash_class(func, parts, hash_value)
+        return
+
+    code = six.get_function_code(func)
+    parts.append('func:%s' % func.__name__)
+    _hash_code(code, parts)
+    hash_value(six.get_function_defaults(func))
+    for cell in six.get_function_closure(func) or ():
+        hash_value(cell.cell_contents)
+    # referenced globals are part of the function as well
+    func_globals = six.get_function_globals(func)
+    for name in code.co_names:
+        if name in func_globals:
+            value = func_globals[name]
+            if inspect.ismodule(value):
+                parts.append('module:%s' % value.__name__)
+            else:
+                hash_value(value)
+
+
+def structural_hash(expr):
+    """
+    Hash the structure of an expression, including the class of every node,
+    its attributes like names, types and literals, the bytecode of functions
+    and the tables it is built from.
+
+    Expressions built in the same way have the same hash even if they are
+    different objects, so that they can share compiled results.
+
+    :return: hex digest
+    :raise UnhashableExpr: if the expression refers to values which cannot be hashed
+    """
+    from .core import Node
+    from ...models import Table
+
+    memo = dict()
+    functions = set()
+
+    def hash_node(node):
+        if id(node) in memo:
+            return memo[id(node)]
+
+        parts = [type(node).__module__, type(node).__name__]
+        arg_names = set(node._args)
+        for name, value in zip(node._args, node.args):
+            parts.append(name)
+            parts.append(hash_value(value))
+        for attr in get_attrs(node):
+            if attr in arg_names or attr in _unhashed_attrs:
+                continue
+            value = getattr(node, attr, None)
+            parts.append(attr)
+            if attr == '_source_data' and value is not None:
+                if not isinstance(value, Table):
+                    raise UnhashableExpr('Cannot hash data source: %s' % type(value))
+                # tables of the same name may belong to other services or accounts
+                client = getattr(value, '_client', None)
+                account = getattr(client, 'account', None)
+                parts.append('table:%s:%s:%s.%s' % (
+                    getattr(client, 'endpoint', None), getattr(account, 'access_id', None),
+                    value.project.name, value.name))
+            else:
+                parts.append(hash_value(value))
+
+        digest = _digest(parts)
+        memo[id(node)] = digest
+        return digest
+
+    def hash_value(value):
+        if isinstance(value, Node):
+            return hash_node(value)
+        if value is None or isinstance(value, (bool, float, Decimal, datetime) +
+                                       six.integer_types + six.string_types):
+            return '%s:%r' % (type(value).__name__, value)
+        if isinstance(value, (list, tuple)):
+            return '%s:[%s]' % (type(value).__name__,
+                                ','.join(hash_value(it) for it in value))
+        if isinstance(value, dict):
+            return 'dict:{%s}' % ','.join(
+                '%s=%s' % (hash_value(k), hash_value(v))
+                for k, v in sorted(six.iteritems(value), key=lambda it: repr(it[0])))
+        if isinstance(value, (types.DataType, Schema)):
+            return '%s:%s' % (type(value).__name__, value)
+        if inspect.isfunction(value) or inspect.isclass(value):
+            if id(value) in functions:
+                # recursive references
+                return 'func:%s' % value.__name__
+            functions.add(id(value))
+            parts = []
+            _hash_function(value, parts, lambda v: parts.append(hash_value(v)))
+            return _digest(parts)
+        raise UnhashableExpr('Cannot hash value of type %s' % type(value))
+
+    return hash_node(expr)
+
+
+def _digest(parts):
+    md5 = hashlib.md5()
+    for part in parts:
+        if not isinstance(part, six.binary_type):
+            part = six.text_type(part).encode('utf-8')
+        md5.update(part)
+        md5.update(b'\0')
+    return md5.hexdigest()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import contextlib
+
+from odps.tests.core import TestBase
+from odps.compat import unittest
+from odps.config import options
+from odps.models import Schema
+from odps.df import DataFrame
+from odps.df.errors import NoBackendFound
+from odps.df.engines import plan_engine, get_default_engine
+from odps.df.expr.tests.core import MockTable
+from odps.df.backends.odpssql.engine import ODPSEngine
+
+try:
+    import pandas as pd
+    from odps.df.backends.pd.engine import PandasEngine
+except ImportError:
+    pd = None
+
+
+class MockDownloadTable(MockTable):
+    __slots__ = 'data', 'partition_sizes', 'downloads'
+
+    def __init__(self, **kwargs):
+        self.data = kwargs.pop('data')
+        self.partition_sizes = kwargs.pop('partition_sizes', None)
+        self.downloads = []
+
+        super(MockDownloadTable, self).__init__(**kwargs)
+
+    def get_partition(self, partition_spec):
+        return type('Partition', (object, ), dict(
+            size=self.partition_sizes[partition_spec], physical_size=None))()
+
+    @contextlib.contextmanager
+    def open_reader(self, partition=None, **kw):
+        self.downloads.append(partition)
+
+        class Reader(object):
+            count = len(self.data)
+
+            def read_batches(reader):
+                yield self.data
+
+        yield Reader()
+
+
+@unittest.skipIf(pd is None, 'pandas not installed')
+class Test(TestBase):
+    def setup(self):
+        self._local_memory_limit = options.df.local_memory_limit
+
+        schema = Schema.from_lists(['name', 'id'], ['string', 'bigint'])
+        data = pd.DataFrame([['name1', 1], ['name2', 2], ['name1', 3]], columns=['name', 'id'])
+        self.table = MockDownloadTable(name='pyodps_test_engines_table', schema=schema,
+                                       data=data, size=1024, client=self.odps.rest)
+
+        schema = Schema.from_lists(['name', 'id'], ['string', 'bigint'], ['ds'], ['string'])
+        self.part_table = MockDownloadTable(
+            name='pyodps_test_engines_part_table', schema=schema, data=data, size=1 << 30,
+            partition_sizes={'ds=20160101': 2048}, client=self.odps.rest)
+
+    def teardown(self):
+        options.df.local_memory_limit = self._local_memory_limit
+
+    def testDefaultOdps(self):
+        options.df.local_memory_limit = None
+        df = DataFrame(self.table)
+
+        plan = plan_engine(df.id.sum())
+        self.assertIsInstance(plan.engine, ODPSEngine)
+        self.assertIn('local_memory_limit', plan.reason)
+
+        df2 = DataFrame(pd.DataFrame({'id': [1, 2]}))
+        self.assertRaises(NoBackendFound, lambda: get_default_engine(df['id', ].union(df2)))
+
+    def testLocalBySize(self):
+        options.df.local_memory_limit = 4096
+        df = DataFrame(self.table)
+
+        plan = plan_engine(df.id.sum())
+        self.assertIsInstance(plan.engine, PandasEngine)
+        self.assertEqual(plan.sizes, [('pyodps_test_engines_table', 1024)])
+        self.assertEqual(plan.engine.execute(df.id.sum()), 6)
+        self.assertEqual(self.table.downloads, [None])
+        self.assertIn('PandasEngine', df.explain())
+
+        self.assertIsInstance(plan_engine(df.id.sum(), local=False).engine, ODPSEngine)
+
+        options.df.local_memory_limit = 512
+        plan = plan_engine(df.id.sum())
+        self.assertIsInstance(plan.engine, ODPSEngine)
+        self.assertIn('exceeds', plan.reason)
+
+    @unittest.skipIf(pd is None or not hasattr(pd, 'Int64Dtype'), 'nullable integers not supported')
+    def testLocalNullableBigint(self):
+        options.df.local_memory_limit = 4096
+        schema = Schema.from_lists(['name', 'id'], ['string', 'bigint'])
+        # bigint columns with nulls are downloaded as nullable integers
+        data = pd.DataFrame({'name': ['name1', 'name2'],
+                             'id': pd.array([2 ** 53 + 1, None], dtype='Int64')},
+                            columns=['name', 'id'])
+        table = MockDownloadTable(name='pyodps_test_engines_table', schema=schema,
+                                  data=data, size=1024, client=self.odps.rest)
+        df = DataFrame(table)
+
+        res = get_default_engine(df).execute(df)
+        self.assertEqual([list(r) for r in res.values.values],
+                         [['name1', 2 ** 53 + 1], ['name2', None]])
+
+    def testUnsupportedLocally(self):
+        options.df.local_memory_limit = 4096
+        df = DataFrame(self.table)
+
+        plan = plan_engine(df.name.unique())
+        self.assertIsInstance(plan.engine, ODPSEngine)
+        self.assertIn('not supported', plan.reason)
+        self.assertEqual(plan.sizes, [])
+        self.assertEqual(self.table.downloads, [])
+
+    def testLocalPartition(self):
+        options.df.local_memory_limit = 4096
+        df = DataFrame(self.part_table)
+
+        plan = plan_engine(df.id.sum())
+        self.assertIsInstance(plan.engine, ODPSEngine)
+
+        expr = df[df.ds == '20160101']
+        expr = expr.groupby('name').agg(expr.id.sum().rename('id_sum'))
+        plan = plan_engine(expr)
+        self.assertIsInstance(plan.engine, PandasEngine)
+        self.assertEqual(plan.sizes, [('pyodps_test_engines_part_table(ds=20160101)', 2048)])
+
+        res = plan.engine.execute(expr)
+        self.assertEqual([list(r) for r in res.values.values], [['name1', 4], ['name2', 2]])
+        self.assertEqual(self.part_table.downloads, ['ds=20160101'])
+
+        # local data is joined with the downloaded partition
+        df2 = DataFrame(pd.DataFrame({'name': ['name1'], 'tag': ['a']}))
+        expr = df[df.ds == '20160101'].join(df2, on='name')
+        plan = plan_engine(expr)
+        self.assertIsInstance(plan.engine, PandasEngine)
+        self.assertEqual(len(plan.engine.execute(expr).values), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
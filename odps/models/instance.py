@@ -28,6 +28,7 @@ from enum import Enum
 
 from .core import LazyLoad, XMLRemoteModel
 from .job import Job
+from ..config import options
 from .. import serializers, utils, errors, compat, readers
 
 
@@ -51,9 +52,14 @@ class Instance(LazyLoad):
     >>> instance = odps.execute_sql('desc dual')  # this sql do not return structured data
     >>> with instance.open_reader() as reader:
     >>>    print(reader.raw)  # just return the raw result
+    >>>
+    >>> instance = odps.execute_sql('select * from dual')
+    >>> with instance.open_reader(tunnel=True) as reader:
+    >>>     # download the typed records through the instance tunnel
     """
 
-    __slots__ = '_task_results', '_is_sync'
+    __slots__ = '_task_results', '_is_sync', '_instance_tunnel', '_task_statuses', \
+        '_terminated_task_results'
 
     def __init__(self, **kwargs):
         if 'task_results' in kwargs:
@@ -224,12 +230,18 @@ class Instance(LazyLoad):
     def get_task_results_without_format(self):
         if self._is_sync:
             return self._task_results
+        if self._terminated_task_results is not None:
+            return self._terminated_task_results
 
         params = {'result': ''}
         resp = self._client.get(self.resource(), params=params)
 
         instance_result = Instance.InstanceResult.parse(self._client, resp)
-        return compat.OrderedDict([(r.name, r.result) for r in instance_result.task_results])
+        results = compat.OrderedDict([(r.name, r.result) for r in instance_result.task_results])
+        if self._task_statuses is not None:
+            # results will not change once the instance and its tasks have terminated
+            self._terminated_task_results = results
+        return results
 
     def get_task_results(self):
         """
@@ -274,6 +286,34 @@ class Instance(LazyLoad):
 
                 return summary
 
+    def _reload_task_statuses(self):
+        """
+        Fetch the status of the instance together with the statuses of its tasks
+        in one request. The task statuses are cached once the instance terminates.
+        """
+        if self._task_statuses is not None:
+            return self._task_statuses
+
+        # use `_getattr` so that unknown fields do not trigger a full reload
+        last_status = self._getattr('_status')
+        params = {'taskstatus': ''}
+        resp = self._client.get(self.resource(), params=params)
+        # parse into another object, as the instance may be read by other threads meanwhile
+        info = Instance.parse(self._client, resp)
+        if info._getattr('_status') is None:
+            self.reload()
+        else:
+            self._tasks = info._getattr('_tasks')
+            self._status = info._getattr('_status')
+
+        statuses = dict([(task.name, task) for task in self._getattr('_tasks') or []])
+        if self._status == Instance.Status.TERMINATED:
+            if last_status != Instance.Status.TERMINATED:
+                # fields like `end_time` are only refreshed by a full reload
+                self.reload()
+            self._task_statuses = statuses
+        return statuses
+
     def get_task_statuses(self):
         """
         Get all tasks' statuses
@@ -282,12 +322,24 @@ class Instance(LazyLoad):
         :rtype: dict
         """
 
-        params = {'taskstatus': ''}
+        return dict(self._reload_task_statuses())
 
-        resp = self._client.get(self.resource(), params=params)
-        self.parse(self._client, resp, obj=self)
+    def get_status_info(self, with_results=True):
+        """
+        Get the status of the instance, the statuses of its tasks and, if terminated,
+        the task results at once. Requests are only sent for the parts not known yet,
+        so nothing is fetched again once the instance has terminated.
 
-        return dict([(task.name, task) for task in self._tasks])
+        :param with_results: if True, fetch the task results when the instance has terminated
+        :return: tuple of status, dict of task statuses and dict of task results, which is
+                 None if the instance has not terminated or ``with_results`` is False
+        """
+
+        task_statuses = self.get_task_statuses()
+        task_results = None
+        if with_results and self._status == Instance.Status.TERMINATED:
+            task_results = self.get_task_results()
+        return self._status, task_statuses, task_results
 
     def get_task_names(self):
         """
@@ -301,8 +353,8 @@ class Instance(LazyLoad):
 
     @property
     def status(self):
-        if self._status != Instance.Status.TERMINATED:
-            self.reload()
+        if self._getattr('_status') != Instance.Status.TERMINATED:
+            self._reload_task_statuses()
 
         return self._status
 
@@ -324,47 +376,88 @@ class Instance(LazyLoad):
         :rtype: bool
         """
 
-        if not self.is_terminated():
+        status, task_statuses, _ = self.get_status_info(with_results=False)
+        if status != Instance.Status.TERMINATED:
             return False
         return all(task.status == Instance.Task.TaskStatus.SUCCESS
-                   for task in self.get_task_statuses().values())
+                   for task in task_statuses.values())
 
     @property
     def is_sync(self):
         return self._is_sync
 
-    def wait_for_completion(self, interval=1):
+    def wait_for_completion(self, interval=1, max_interval=None, poller=None):
         """
         Wait for the instance to complete, and neglect the consequence.
 
-        :param interval: time interval to check
+        The status is checked after ``interval`` seconds at first, and the interval
+        grows up to ``max_interval`` seconds while the instance is running.
+
+        :param interval: initial time interval to check
+        :param max_interval: max time interval to check, ``options.max_poll_interval`` by default
+        :param poller: if provided, wait by the poller shared with other instances
+        :type poller: :class:`odps.models.poller.InstancePoller`
         :return: None
         """
 
+        if poller is not None:
+            try:
+                poller.wait(self)
+            except KeyboardInterrupt:
+                pass
+            return
+
+        if max_interval is None:
+            max_interval = options.max_poll_interval
+        backoff = utils.Backoff(interval, max_interval)
         while not self.is_terminated():
             try:
-                time.sleep(interval)
+                time.sleep(backoff.next())
             except KeyboardInterrupt:
                 break
 
-    def wait_for_success(self, interval=1):
+    def wait_for_success(self, interval=1, max_interval=None, poller=None):
         """
         Wait for instance to complete, and check if the instance is successful.
 
-        :param interval: time interval to check
+        :param interval: initial time interval to check
+        :param max_interval: max time interval to check, ``options.max_poll_interval`` by default
+        :param poller: if provided, wait by the poller shared with other instances
         :return: None
         :raise: :class:`odps.errors.ODPSError` if the instance failed
         """
 
-        self.wait_for_completion(interval=interval)
+        self.wait_for_completion(interval=interval, max_interval=max_interval, poller=poller)
 
         if not self.is_successful():
-            for task_name, task in six.iteritems(self.get_task_statuses()):
+            _, task_statuses, task_results = self.get_status_info()
+            for task_name, task in six.iteritems(task_statuses):
                 if task.status == Instance.Task.TaskStatus.FAILED:
-                    raise errors.ODPSError(self.get_task_result(task_name))
+                    # results are not fetched if the instance is still running
+                    if task_results is None:
+                        raise errors.ODPSError(self.get_task_result(task_name))
+                    raise errors.ODPSError(task_results.get(task_name))
                 elif task.status != Instance.Task.TaskStatus.SUCCESS:
                     raise errors.ODPSError('%s, status=%s' % (task_name, task.status.value))
 
+    def wait(self, interval=1, max_interval=None):
+        """
+        Coroutine to wait for the instance to complete on the event loop,
+        requires Python 3.5+.
+
+        :param interval: initial time interval to check
+        :param max_interval: max time interval to check, ``options.max_poll_interval`` by default
+
+        :Example:
+
+        >>> await instance.wait()
+
+        .. seealso:: :mod:`odps.aio`
+        """
+        from .. import aio
+
+        return aio.wait_for_completion(self, interval=interval, max_interval=max_interval)
+
     def get_task_progress(self, task_name):
         """
         Get task's current progress
@@ -399,8 +492,38 @@ class Instance(LazyLoad):
         job = self._get_job()
         return job.priority
 
+    def _create_instance_tunnel(self, endpoint=None):
+        if self._instance_tunnel is not None:
+            return self._instance_tunnel
+
+        from ..tunnel import InstanceTunnel
+
+        self._instance_tunnel = InstanceTunnel(client=self._client, project=self.project,
+                                               endpoint=endpoint or options.tunnel_endpoint)
+        return self._instance_tunnel
+
     @contextlib.contextmanager
-    def open_reader(self, schema=None, task_name=None):
+    def open_reader(self, schema=None, task_name=None, tunnel=False, **kw):
+        """
+        Open the reader to read the records of the SQL task result.
+
+        By default the result is fetched as text, which is limited in size and
+        all the values are parsed from strings. When ``tunnel`` is True, the result
+        is downloaded through the instance tunnel in the binary format of tunnel,
+        the records are typed and read in ranges just like ``table.open_reader``.
+        Both readers can read the records into columns with ``reader.read_batches``.
+
+        :param schema: schema of the result, only for the text result
+        :param task_name: name of the SQL task, required if the job has more than one
+        :param tunnel: if True, download the result through the instance tunnel
+        :type tunnel: bool
+        :param endpoint: the tunnel service URL
+        :param compress_option: compression algorithm, level and strategy
+        :type compress_option: :class:`odps.tunnel.CompressOption`
+        :param workers: if greater than 1, ``reader.read`` splits the records into ranges
+                        and downloads them in parallel with this number of threads
+        :return: reader, ``count`` means the size of the result when using tunnel
+        """
         if not self.is_successful():
             raise errors.ODPSError(
                 'Cannot open reader, instance(%s) may fail or has not finished yet' % self.id)
@@ -420,6 +543,15 @@ class Instance(LazyLoad):
             raise errors.ODPSError(
                 'Cannot open reader, job has no sql task')
 
+        if tunnel:
+            endpoint = kw.pop('endpoint', None)
+            workers = kw.pop('workers', None)
+
+            instance_tunnel = self._create_instance_tunnel(endpoint=endpoint)
+            download_session = instance_tunnel.create_download_session(instance=self, **kw)
+            yield readers.TunnelRecordReader(download_session, workers=workers)
+            return
+
         result = self.get_task_result(task_name)
         with readers.RecordReader(schema, result) as reader:
             yield reader
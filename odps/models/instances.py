@@ -19,13 +19,41 @@
 
 import uuid
 from datetime import datetime
+from multiprocessing.pool import ThreadPool
 
 import six
 
 from .core import Iterable
 from .instance import Instance
 from .job import Job
-from .. import serializers, errors, utils
+from .. import serializers, errors, utils, compat
+from ..config import options
+
+
+def map_instances(func, instances, workers=None):
+    """
+    Call ``func`` on every instance on a pool of threads, which share the
+    pooled connections of the client.
+
+    :param workers: number of threads, ``options.pool_maxsize`` by default
+    :return: list of (result, error) in the order of the instances
+    """
+    def call(instance):
+        try:
+            return func(instance), None
+        except Exception as e:
+            return None, e
+
+    instances = list(instances)
+    if len(instances) <= 1:
+        return [call(instance) for instance in instances]
+
+    pool = ThreadPool(min(workers or options.pool_maxsize, len(instances)))
+    try:
+        return pool.map(call, instances)
+    finally:
+        pool.close()
+        pool.join()
 
 
 class Instances(Iterable):
@@ -96,6 +124,26 @@ class Instances(Iterable):
             for instance in instances:
                 yield instance
 
+    def get_statuses(self, ids, workers=None):
+        """
+        Get the statuses of many instances, which are fetched concurrently.
+        Instances known to have terminated are not fetched again.
+
+        :param ids: ids of the instances or the instances
+        :param workers: number of concurrent requests, ``options.pool_maxsize`` by default
+        :return: ordered dict of instance id to :class:`odps.models.Instance.Status`
+        """
+        instances = [self._get(id_) if isinstance(id_, six.string_types) else id_
+                     for id_ in ids]
+        results = map_instances(lambda instance: instance.status, instances, workers=workers)
+
+        statuses = compat.OrderedDict()
+        for instance, (status, error) in zip(instances, results):
+            if error is not None:
+                raise error
+            statuses[instance.id] = status
+        return statuses
+
     @classmethod
     def _create_job(cls, job=None, task=None, priority=None, running_cluster=None, uuid_=None):
         job = job or Job()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import threading
+import time
+
+from .instances import map_instances
+from .. import utils
+from ..config import options
+
+
+class _Waiter(object):
+    __slots__ = 'instance', 'event', 'error'
+
+    def __init__(self, instance):
+        self.instance = instance
+        self.event = threading.Event()
+        self.error = None
+
+
+class InstancePoller(object):
+    """
+    Poll the status of many instances in one background thread, so that
+    threads waiting for different instances share the status queries.
+
+    The interval of polling grows from ``interval`` up to ``max_interval``
+    while no instance terminates, and is reset when a new instance is waited for.
+
+    :Example:
+
+    >>> poller = InstancePoller()
+    >>> instances = [odps.run_sql(sql) for sql in sqls]
+    >>> poller.wait_all(instances)
+    """
+
+    def __init__(self, interval=1, max_interval=None):
+        self._interval = interval
+        self._max_interval = max_interval
+        self._cond = threading.Condition()
+        self._waiters = dict()
+        self._thread = None
+        self._reset = False
+
+    def _register(self, instance):
+        waiter = _Waiter(instance)
+        with self._cond:
+            self._waiters.setdefault(instance.id, []).append(waiter)
+            self._reset = True
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run)
+                self._thread.daemon = True
+                self._thread.start()
+            else:
+                self._cond.notify()
+        return waiter
+
+    def _unregister(self, waiter):
+        with self._cond:
+            waiters = self._waiters.get(waiter.instance.id, [])
+            if waiter in waiters:
+                waiters.remove(waiter)
+            if not waiters:
+                self._waiters.pop(waiter.instance.id, None)
+
+    def _poll(self, instances):
+        """
+        Query the status of the instances concurrently.
+
+        :return: dict of id to error of the terminated instances, error is None if
+                 the status is fetched successfully
+        """
+        results = map_instances(lambda instance: instance.is_terminated(), instances)
+
+        terminated = dict()
+        for instance, (is_terminated, error) in zip(instances, results):
+            if error is not None or is_terminated:
+                terminated[instance.id] = error
+        return terminated
+
+    def _run(self):
+        max_interval = self._max_interval
+        if max_interval is None:
+            max_interval = options.max_poll_interval
+        backoff = utils.Backoff(self._interval, max_interval)
+
+        while True:
+            with self._cond:
+                if not self._waiters:
+                    self._thread = None
+                    return
+                if self._reset:
+                    backoff.reset()
+                    self._reset = False
+                instances = [waiters[0].instance for waiters in self._waiters.values()]
+
+            terminated = self._poll(instances)
+
+            with self._cond:
+                for instance_id, error in terminated.items():
+                    for waiter in self._waiters.pop(instance_id, []):
+                        waiter.error = error
+                        waiter.event.set()
+                if terminated:
+                    backoff.reset()
+                if self._waiters and not self._reset:
+                    self._cond.wait(backoff.next())
+
+    def wait(self, instance, timeout=None):
+        """
+        Wait for the instance to terminate.
+
+        :param instance: instance to wait for
+        :param timeout: seconds to wait, None means waiting until terminated
+        :return: True if terminated, False if timed out
+        """
+        return self.wait_all([instance], timeout=timeout)
+
+    def wait_all(self, instances, timeout=None):
+        """
+        Wait for all the instances to terminate.
+
+        :param instances: instances to wait for
+        :param timeout: seconds to wait, None means waiting until all terminated
+        :return: True if all terminated, False if timed out
+        """
+        waiters = [self._register(instance) for instance in instances]
+        deadline = time.time() + timeout if timeout is not None else None
+        try:
+            for waiter in waiters:
+                # wait with a timeout so that KeyboardInterrupt can be received
+                while not waiter.event.wait(1 if deadline is None
+                                            else max(min(deadline - time.time(), 1), 0)):
+                    if deadline is not None and time.time() >= deadline:
+                        return False
+                if waiter.error is not None:
+                    raise waiter.error
+            return True
+        finally:
+            for waiter in waiters:
+                if not waiter.event.is_set():
+                    self._unregister(waiter)
+
+
+_default_poller = None
+_default_poller_lock = threading.Lock()
+
+
+def get_default_poller():
+    """
+    Get the poller shared in the process.
+    """
+    global _default_poller
+
+    with _default_poller_lock:
+        if _default_poller is None:
+            _default_poller = InstancePoller()
+        return _default_poller
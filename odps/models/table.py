@@ -19,6 +19,7 @@
 
 from datetime import datetime
 import contextlib
+import sys
 
 import six
 
@@ -241,7 +242,7 @@ class Table(LazyLoad):
 
         return buf.getvalue()
 
-    def head(self, limit, partition=None, columns=None):
+    def head(self, limit, partition=None, columns=None, as_batches=False, batch_format='pandas'):
         """
         Get the head records of a table or its partition.
 
@@ -249,6 +250,9 @@ class Table(LazyLoad):
         :param partition: partition of this table
         :param columns: the columns which is subset of the table columns
         :type columns: list
+        :param as_batches: if True, return the records as one batch of columns
+        :param batch_format: ``pandas`` for a pandas DataFrame, ``numpy`` for an ordered
+                             dict of column name to NumPy array, work when ``as_batches`` is True
         :return: records
         :rtype: list
 
@@ -269,6 +273,10 @@ class Table(LazyLoad):
 
         resp = self._client.get(self.resource(), params=params, stream=True)
         with readers.RecordReader(self.schema, resp) as reader:
+            if as_batches:
+                for batch in reader.read_batches(batch_size=limit, batch_format=batch_format):
+                    yield batch
+                return
             for record in reader:
                 yield record
 
@@ -297,6 +305,8 @@ class Table(LazyLoad):
                               can be ``zlib``, ``snappy``
         :param compress_level: used for ``zlib``, work when ``compress_option`` is not provided
         :param compress_strategy: used for ``zlib``, work when ``compress_option`` is not provided
+        :param workers: if greater than 1, ``reader.read`` splits the records into ranges
+                        and downloads them in parallel with this number of threads
         :return: reader, ``count`` means the full size, ``status`` means the tunnel status
 
         :Example:
@@ -305,10 +315,14 @@ class Table(LazyLoad):
         >>>     count = reader.count  # How many records of a table or its partition
         >>>     for record in record[0: count]:
         >>>         # read all data, actually better to split into reading for many times
+        >>> with table.open_reader(workers=4) as reader:
+        >>>     for record in reader.read(ordered=False):
+        >>>         # read all data with 4 threads, records may be out of order
         """
 
         reopen = kw.pop('reopen', False)
         endpoint = kw.pop('endpoint', None)
+        default_workers = kw.pop('workers', None)
 
         tunnel = self._create_table_tunnel(endpoint=endpoint)
         download_id = self._download_id if not reopen else None
@@ -316,43 +330,7 @@ class Table(LazyLoad):
                                                           download_id=download_id, **kw)
         self._download_id = download_session.id
 
-        class RecordReader(readers.AbstractRecordReader):
-            def __init__(self):
-                self._it = iter(self)
-
-            @property
-            def count(self):
-                return download_session.count
-
-            @property
-            def status(self):
-                return download_session.status
-
-            def __iter__(self):
-                for record in self.read():
-                    yield record
-
-            def __next__(self):
-                return next(self._it)
-
-            next = __next__
-
-            def _iter(self, start=None, end=None, step=None):
-                count = self._calc_count(start, end, step)
-                return self.read(start=start, count=count, step=step)
-
-            def read(self, start=None, count=None, step=None,
-                     compress=False, columns=None):
-                start = start or 0
-                step = step or 1
-                count = count*step if count is not None else self.count-start
-
-                with download_session.open_record_reader(
-                        start, count, compress=compress, columns=columns) as reader:
-                    for record in reader[::step]:
-                        yield record
-
-        yield RecordReader()
+        yield readers.TunnelRecordReader(download_session, workers=default_workers)
 
     @contextlib.contextmanager
     def open_writer(self, partition=None, blocks=None, **kw):
@@ -370,6 +348,13 @@ class Table(LazyLoad):
                               can be ``zlib``, ``snappy``
         :param compress_level: used for ``zlib``, work when ``compress_option`` is not provided
         :param compress_strategy: used for ``zlib``, work when ``compress_option`` is not provided
+        :param workers: if provided, a :class:`odps.tunnel.parallel.ParallelRecordWriter`
+                        is opened, which shards the records into blocks and uploads
+                        them with this number of threads, ``blocks`` will be ignored
+        :param block_size: max records of each block when ``workers`` is provided,
+                           encoded data of up to ``workers`` blocks is held in memory
+        :param compress: if True, the data will be compressed during uploading,
+                         used when ``workers`` is provided
         :return: writer, status means the tunnel writer status
 
         :Example:
@@ -379,11 +364,16 @@ class Table(LazyLoad):
         >>> with table.open_writer(partition='pt=test', blocks=[0, 1]):
         >>>     writer.write(0, gen_records(block=0))
         >>>     writer.write(1, gen_records(block=1))  # we can do this parallel
+        >>> with table.open_writer(workers=4) as writer:
+        >>>     writer.write(records)  # blocks are allocated automatically
         """
 
         reopen = kw.pop('reopen', False)
         commit = kw.pop('commit', True)
         endpoint = kw.pop('endpoint', None)
+        workers = kw.pop('workers', None)
+        block_size = kw.pop('block_size', None)
+        compress = kw.pop('compress', False)
 
         tunnel = self._create_table_tunnel(endpoint=endpoint)
         upload_id = self._upload_id if not reopen else None
@@ -391,6 +381,22 @@ class Table(LazyLoad):
                                                       upload_id=upload_id, **kw)
         self._upload_id = upload_session.id
 
+        if workers is not None:
+            from ..tunnel.parallel import ParallelRecordWriter
+
+            writer = ParallelRecordWriter(upload_session, workers=workers,
+                                          block_size=block_size, compress=compress)
+            try:
+                yield writer
+            except Exception:
+                writer.__exit__(*sys.exc_info())
+                raise
+            writer.close()
+            if commit:
+                upload_session.commit(writer.blocks)
+                self._upload_id = None
+            return
+
         blocks = blocks or [0, ]
         blocks_writes = [False] * len(blocks)
 
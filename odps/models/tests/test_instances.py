@@ -22,10 +22,10 @@ import time
 
 import six
 
-from odps.tests.core import TestBase, to_str
+from odps.tests.core import TestBase, MockODPSServer, to_str
 from odps.compat import unittest
 from odps.models import Instance, SQLTask, Schema
-from odps import errors, compat
+from odps import ODPS, errors, compat, options
 
 expected_xml_template = '''<?xml version="1.0" ?>
 <Instance>
@@ -168,6 +168,92 @@ class Test(TestBase):
         # test stop
         self.assertRaises(errors.InvalidStateSetting, instance.stop)
 
+    def _create_mock_odps(self, polls_to_terminate):
+        server = MockODPSServer(polls_to_terminate=polls_to_terminate)
+        server.start()
+        self.addCleanup(server.stop)
+
+        tunnel_endpoint = options.tunnel_endpoint
+        odps = ODPS('access_id', 'secret_access_key', 'mock_project', endpoint=server.endpoint)
+        options.tunnel_endpoint = tunnel_endpoint
+        return server, odps
+
+    def testCachedTerminalStatus(self):
+        server, odps = self._create_mock_odps(polls_to_terminate=2)
+
+        instance = odps.run_sql('select 1')
+        self.assertFalse(instance.is_successful())
+        self.assertEqual(len(server.requests), 1)
+
+        instance.wait_for_success(interval=0.01)
+        del server.requests[:]
+        self.assertTrue(instance.is_terminated())
+        self.assertTrue(instance.is_successful())
+        status, task_statuses, task_results = instance.get_status_info()
+        self.assertEqual(status, Instance.Status.TERMINATED)
+        self.assertEqual(task_results, {'AnonymousSQLTask': 'OK'})
+        instance.get_status_info()
+        self.assertEqual(len(server.requests), 1)
+        self.assertIn('result', server.requests[0][1])
+
+        instance = odps.run_sql('select fail')
+        self.assertRaises(errors.ODPSError, instance.wait_for_success, interval=0.01)
+        try:
+            instance.wait_for_success()
+        except errors.ODPSError as e:
+            self.assertIn('mock error', str(e))
+
+    def testEmptyTaskResultsOnCreation(self):
+        server, odps = self._create_mock_odps(polls_to_terminate=2)
+
+        # instances created without task results in the response
+        submitted = odps.run_sql('select 1')
+        instance = Instance(name=submitted.id, task_results=dict(),
+                            parent=submitted.parent, client=submitted._client)
+        self.assertFalse(instance.is_sync)
+        instance.wait_for_completion(interval=0.01)
+        self.assertEqual(instance.get_task_results(), {'AnonymousSQLTask': 'OK'})
+
+    def testRefreshOnTermination(self):
+        server, odps = self._create_mock_odps(polls_to_terminate=2)
+
+        instance = odps.run_sql('select 1')
+        self.assertIsNone(instance.end_time)
+        instance.wait_for_completion(interval=0.01)
+        self.assertIsNotNone(instance.end_time)
+
+    def testTaskFailedWhileRunning(self):
+        server, odps = self._create_mock_odps(polls_to_terminate=100)
+
+        # the waiting is interrupted while the instance is still running
+        wait_for_completion = Instance.wait_for_completion
+        Instance.wait_for_completion = lambda *_, **__: None
+        try:
+            instance = odps.run_sql('select failfast')
+            try:
+                instance.wait_for_success()
+                self.fail('ODPSError not raised')
+            except errors.ODPSError as e:
+                self.assertIn('mock error', str(e))
+        finally:
+            Instance.wait_for_completion = wait_for_completion
+
+    def testGetStatuses(self):
+        server, odps = self._create_mock_odps(polls_to_terminate=2)
+
+        instances = [odps.run_sql('select %d' % i) for i in range(10)]
+        project = odps.get_project()
+        statuses = project.instances.get_statuses([inst.id for inst in instances])
+        self.assertEqual(list(statuses), [inst.id for inst in instances])
+        self.assertTrue(all(s == Instance.Status.RUNNING for s in statuses.values()))
+
+        statuses = project.instances.get_statuses(instances, workers=3)
+        self.assertTrue(all(s == Instance.Status.TERMINATED for s in statuses.values()))
+
+        del server.requests[:]
+        project.instances.get_statuses(instances)
+        self.assertEqual(len(server.requests), 0)
+
     def testReadSQLInstance(self):
         test_table = 'pyodps_t_tmp_read_sql_instance'
         self.odps.delete_table(test_table, if_exists=True)
@@ -210,6 +296,28 @@ class Test(TestBase):
 
         table.drop()
 
+    def testReadSQLInstanceByTunnel(self):
+        test_table = 'pyodps_t_tmp_read_sql_instance_tunnel'
+        self.odps.delete_table(test_table, if_exists=True)
+        table = self.odps.create_table(
+            test_table, schema=Schema.from_lists(['size', 'name'], ['bigint', 'string']),
+            if_not_exists=True)
+        self.odps.write_table(
+            table, 0, [table.new_record([i, 'name%d' % i]) for i in range(10)])
+
+        instance = self.odps.execute_sql('select * from %s' % test_table)
+        with instance.open_reader(tunnel=True) as reader:
+            self.assertEqual(reader.count, 10)
+            records = list(reader)
+            self.assertEqual(sorted(r['size'] for r in records), list(range(10)))
+            self.assertIsInstance(records[0]['size'], six.integer_types)
+
+            self.assertEqual(len(list(reader.read(start=8))), 2)
+            self.assertEqual(len(list(reader[1::2])), 5)
+            self.assertEqual(len(list(reader.read(workers=3, ordered=False))), 10)
+
+        table.drop()
+
     def testReadChineseSQLInstance(self):
         test_table = 'pyodps_t_tmp_read_chn_sql_instance'
         self.odps.delete_table(test_table, if_exists=True)
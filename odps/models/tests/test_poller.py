@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import threading
+
+from odps.models.poller import InstancePoller
+from odps.tests.core import TestBase
+from odps.compat import unittest
+from odps import errors
+
+
+class FakeInstance(object):
+    def __init__(self, id_, polls_to_terminate, error=None):
+        self.id = id_
+        self.polls = 0
+        self._polls_to_terminate = polls_to_terminate
+        self._error = error
+
+    def is_terminated(self):
+        self.polls += 1
+        if self._error is not None:
+            raise self._error
+        return self.polls >= self._polls_to_terminate
+
+
+class Test(TestBase):
+
+    def testWaitAll(self):
+        poller = InstancePoller(interval=0.01, max_interval=0.05)
+        instances = [FakeInstance('inst%d' % i, i + 1) for i in range(5)]
+
+        self.assertTrue(poller.wait_all(instances))
+        self.assertEqual([inst.polls for inst in instances], [1, 2, 3, 4, 5])
+
+    def testWaitConcurrently(self):
+        poller = InstancePoller(interval=0.01, max_interval=0.05)
+        instances = [FakeInstance('inst%d' % i, 3) for i in range(10)]
+        results = []
+
+        def wait(inst):
+            results.append(poller.wait(inst))
+
+        threads = [threading.Thread(target=wait, args=(inst, )) for inst in instances]
+        [t.start() for t in threads]
+        [t.join() for t in threads]
+
+        self.assertEqual(results, [True] * 10)
+        self.assertEqual([inst.polls for inst in instances], [3] * 10)
+
+    def testTimeoutAndError(self):
+        poller = InstancePoller(interval=0.01, max_interval=0.05)
+
+        self.assertFalse(poller.wait(FakeInstance('running', 10 ** 6), timeout=0.1))
+        self.assertEqual(len(poller._waiters), 0)
+
+        failed = FakeInstance('failed', 1, error=errors.ODPSError('poll failed'))
+        self.assertRaises(errors.ODPSError, poller.wait, failed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -17,13 +17,16 @@
 # specific language governing permissions and limitations
 # under the License.
 
+import codecs
 import csv
 import math
+from datetime import datetime
+from decimal import Decimal
 
 from requests import Response
 import six
 
-from . import types
+from . import types, utils
 
 
 class AbstractRecordReader(object):
@@ -96,46 +99,271 @@ class AbstractRecordReader(object):
                     return
 
 
+def _to_bigint(value):
+    try:
+        return int(value)
+    except ValueError:
+        return int(float(value))
+
+
+def _to_boolean(value):
+    if value == 'true':
+        return True
+    elif value == 'false':
+        return False
+    return types.validate_value(value, types.boolean)
+
+
+def _to_datetime(value):
+    return datetime.strptime(value, '%Y-%m-%d %H:%M:%S')
+
+
+_converters = {
+    types.string: utils.to_text,
+    types.bigint: _to_bigint,
+    types.double: float,
+    types.boolean: _to_boolean,
+    types.datetime: _to_datetime,
+    types.decimal: Decimal,
+}
+
+
+def _get_converter(data_type):
+    """
+    Get the function converting a CSV field into the value of given type.
+    """
+    try:
+        return _converters[data_type]
+    except (KeyError, TypeError):
+        return lambda value: types.validate_value(value, data_type)
+
+
+class TunnelRecordReader(AbstractRecordReader):
+    """
+    Reader of records in a tunnel download session, records are downloaded
+    in the range when reading.
+
+    :param download_session: table or instance download session
+    :param workers: if greater than 1, ``read`` splits the records into ranges
+                    and downloads them in parallel with this number of threads
+    """
+
+    def __init__(self, download_session, workers=None):
+        self._download_session = download_session
+        self._workers = workers
+        self._it = iter(self)
+
+    @property
+    def count(self):
+        return self._download_session.count
+
+    @property
+    def status(self):
+        return self._download_session.status
+
+    @property
+    def schema(self):
+        return self._download_session.schema
+
+    def __iter__(self):
+        for record in self.read():
+            yield record
+
+    def __next__(self):
+        return next(self._it)
+
+    next = __next__
+
+    def _iter(self, start=None, end=None, step=None):
+        count = self._calc_count(start, end, step)
+        return self.read(start=start, count=count, step=step)
+
+    def read(self, start=None, count=None, step=None,
+             compress=False, columns=None, workers=None, ordered=True):
+        start = start or 0
+        step = step or 1
+        count = count*step if count is not None else self.count-start
+        workers = workers or self._workers
+        download_session = self._download_session
+
+        if workers is not None and workers > 1:
+            from .tunnel.parallel import ParallelRecordReader
+
+            def open_range_reader(range_start, range_count):
+                return download_session.open_record_reader(
+                    range_start, range_count, compress=compress, columns=columns)
+
+            with ParallelRecordReader(open_range_reader, start, count, workers=workers,
+                                      ordered=ordered, step=step) as reader:
+                for record in reader:
+                    yield record
+            return
+
+        with download_session.open_record_reader(
+                start, count, compress=compress, columns=columns) as reader:
+            for record in reader[::step]:
+                yield record
+
+    def read_batches(self, start=None, count=None, batch_size=None, batch_format='pandas',
+                     compress=False, columns=None):
+        """
+        Read the records in the range into columns batch by batch.
+
+        :param start: start of the range
+        :param count: records in the range, default to the rest of the records
+        :param batch_size: records of each batch
+        :param batch_format: ``pandas`` to read pandas DataFrames, ``numpy`` to read
+                             ordered dicts of column name to NumPy array
+        """
+        start = start or 0
+        count = count if count is not None else self.count-start
+
+        with self._download_session.open_record_reader(
+                start, count, compress=compress, columns=columns, as_batches=True,
+                batch_size=batch_size, batch_format=batch_format) as reader:
+            for batch in reader:
+                yield batch
+
+
+def _iter_lines(chunks):
+    """
+    Split chunks of text into lines. Line endings are kept, so that csv
+    can handle the quoted fields which contain new lines.
+    """
+    pending = None
+    for chunk in chunks:
+        if not chunk:
+            continue
+        sep = b'\n' if isinstance(chunk, six.binary_type) else u'\n'
+        buf = chunk if pending is None else pending + chunk
+        start = 0
+        while True:
+            end = buf.find(sep, start)
+            if end < 0:
+                break
+            yield buf[start:end + 1]
+            start = end + 1
+        pending = buf[start:] or None
+    if pending:
+        yield pending
+
+
 class RecordReader(AbstractRecordReader):
+    """
+    Reader of records in CSV format, which is the format of table heads and
+    the text results of SQL tasks. The response is decoded in chunks of
+    ``READ_CHUNK_SIZE`` bytes, and every field is converted according to the
+    type of its column. The chunks decoded are kept, so that the raw text is
+    still available after reading records.
+    """
+
     NULL_TOKEN = '\\N'
+    READ_CHUNK_SIZE = 64 * 1024
 
     def __init__(self, schema, stream, **kwargs):
         self._schema = schema
         self._columns = None
+        self._name_indexes = None
+        self._decoders = None
         self._fp = stream
-        if isinstance(self._fp, Response):
-            self.raw = self._fp.content if six.PY2 else self._fp.text
-        else:
-            self.raw = self._fp
-        self._csv = csv.reader(self.raw.splitlines())
+        self._raw = None if isinstance(stream, Response) else stream
+        self._csv = None
+        self._chunks = []
+        self._chunk_iter = None
+
+    @property
+    def raw(self):
+        if self._raw is None:
+            if self._csv is None:
+                self._raw = self._fp.content if six.PY2 else self._fp.text
+            else:
+                # records are being read, fetch the rest of the chunks
+                while self._fetch_chunk():
+                    pass
+                self._raw = ''.join(self._chunks)
+        return self._raw
+
+    def _decode_chunks(self):
+        chunks = self._fp.iter_content(self.READ_CHUNK_SIZE)
+        if six.PY2:
+            for chunk in chunks:
+                yield chunk
+            return
+
+        decoder = codecs.getincrementaldecoder(self._fp.encoding or 'utf-8')(errors='replace')
+        for chunk in chunks:
+            yield decoder.decode(chunk)
+        yield decoder.decode(b'', final=True)
+
+    def _fetch_chunk(self):
+        if self._chunk_iter is None:
+            self._chunk_iter = self._decode_chunks()
+        try:
+            self._chunks.append(next(self._chunk_iter))
+            return True
+        except StopIteration:
+            return False
+
+    def _iter_chunks(self):
+        if self._raw is not None:
+            yield self._raw
+            return
+
+        i = 0
+        while i < len(self._chunks) or self._fetch_chunk():
+            yield self._chunks[i]
+            i += 1
 
     def _readline(self):
+        if self._csv is None:
+            self._csv = csv.reader(_iter_lines(self._iter_chunks()))
         try:
-            values = next(self._csv)
-            res = []
-            for i, value in enumerate(values):
-                if value == self.NULL_TOKEN:
-                    res.append(None)
-                elif self._columns and self._columns[i].type == types.boolean:
-                    if value == 'true':
-                        res.append(True)
-                    elif value == 'false':
-                        res.append(False)
-                    else:
-                        res.append(value)
-                else:
-                    res.append(value)
-            return res
+            return next(self._csv)
         except StopIteration:
             return
 
-    def __next__(self):
+    def _read_values(self, decoders=None):
         self._load_columns()
 
         values = self._readline()
+        if values is None:
+            return
+
+        null_token = self.NULL_TOKEN
+        if len(values) != len(self._columns):
+            return [None if value == null_token else value for value in values]
+        return [None if value == null_token else decode(value)
+                for decode, value in zip(decoders or self._decoders, values)]
+
+    def _read_columns(self, count, decoders=None):
+        """
+        Read at most ``count`` records into lists of their columns.
+
+        :param decoders: decoders of the columns, default as those of the reader
+        :return: tuple of the list of columns and the number of records read
+        """
+        self._load_columns()
+
+        columns = [[] for _ in self._columns]
+        appends = [col.append for col in columns]
+        n_records = 0
+        while n_records < count:
+            values = self._read_values(decoders=decoders)
+            if values is None:
+                break
+            for append, value in zip(appends, values):
+                append(value)
+            n_records += 1
+        return columns, n_records
+
+    def __next__(self):
+        values = self._read_values()
         if values is None:
             raise StopIteration
-        return types.Record(self._columns, values=values)
+        if len(values) != len(self._columns):
+            return types.Record(self._columns, values=values)
+        return types.Record._from_decoded(self._columns, values,
+                                          name_indexes=self._name_indexes)
 
     next = __next__
 
@@ -152,7 +380,7 @@ class RecordReader(AbstractRecordReader):
         if self._columns is not None:
             return
 
-        values = self._readline()
+        values = self._readline() or []
         self._columns = []
         for value in values:
             if self._schema is None:
@@ -162,6 +390,31 @@ class RecordReader(AbstractRecordReader):
                     self._columns.append(self._schema.get_partition(value))
                 else:
                     self._columns.append(self._schema.get_column(value))
+        self._name_indexes = types.build_column_indexes(self._columns)
+        self._decoders = self._compile_decoders()
+
+    def _compile_decoders(self, raw_datetime=False):
+        decoders = []
+        for col in self._columns:
+            if raw_datetime and col.type == types.datetime:
+                decoders.append(lambda value: utils.to_milliseconds(_to_datetime(value)))
+            else:
+                decoders.append(_get_converter(col.type))
+        return decoders
+
+    def read_batches(self, batch_size=None, batch_format='pandas'):
+        """
+        Read the records into columns batch by batch.
+
+        :param batch_size: records of each batch
+        :param batch_format: ``pandas`` to read pandas DataFrames, ``numpy`` to read
+                             ordered dicts of column name to NumPy array
+        :return: :class:`odps.tunnel.reader.TunnelBatchReader`
+        """
+        from .tunnel.reader import TunnelBatchReader
+
+        self._load_columns()
+        return TunnelBatchReader(self, batch_size=batch_size, batch_format=batch_format)
 
     def close(self):
         if hasattr(self._fp, 'close'):
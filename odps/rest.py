@@ -20,6 +20,8 @@
 from __future__ import absolute_import
 import logging
 import platform
+import threading
+import time
 
 import six
 import requests
@@ -58,6 +60,18 @@ class RestClient(object):
         self._user_agent = user_agent or default_user_agent()
         self.project = project
 
+        self._session = None
+        self._session_key = None
+        self._last_used = None
+        self._session_lock = threading.Lock()
+
+    def __getstate__(self):
+        return self._account, self._endpoint, self.project, self._user_agent
+
+    def __setstate__(self, state):
+        account, endpoint, project, user_agent = state
+        self.__init__(account, endpoint, project=project, user_agent=user_agent)
+
     @property
     def endpoint(self):
         return self._endpoint
@@ -66,23 +80,64 @@ class RestClient(object):
     def account(self):
         return self._account
 
+    @staticmethod
+    def _create_session():
+        session = requests.Session()
+        # mount adapters with retry times
+        for prefix in ('http://', 'https://'):
+            session.mount(prefix, requests.adapters.HTTPAdapter(
+                pool_connections=options.pool_connections,
+                pool_maxsize=options.pool_maxsize,
+                max_retries=options.retry_times))
+        return session
+
+    def _get_session(self):
+        """
+        Get the session shared by requests of this client. The session is
+        rebuilt when it has been idle for more than ``options.pool_max_idle_time``
+        seconds, as the server may have closed idle connections, or when the
+        pool options are changed.
+        """
+        if not options.keep_alive:
+            return self._create_session()
+
+        key = (options.pool_connections, options.pool_maxsize, options.retry_times)
+        with self._session_lock:
+            now = time.time()
+            max_idle_time = options.pool_max_idle_time
+            if self._session is not None and (
+                    self._session_key != key or (max_idle_time is not None and
+                                                 now - self._last_used > max_idle_time)):
+                self._session.close()
+                self._session = None
+            if self._session is None:
+                self._session = self._create_session()
+                self._session_key = key
+            self._last_used = now
+            return self._session
+
+    def close(self):
+        """
+        Close the pooled connections of this client.
+        """
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
     def request(self, url, method, stream=False, **kwargs):
         LOG.debug('Start request.')
         LOG.debug('url: ' + url)
-        session = requests.Session()
+        session = self._get_session()
         if LOG.level == logging.DEBUG:
             for k, v in kwargs.items():
                 LOG.debug(k + ': ' + utils.to_text(v))
 
-        # mount adapters with retry times
-        session.mount(
-            'http://', requests.adapters.HTTPAdapter(max_retries=options.retry_times))
-        session.mount(
-            'https://', requests.adapters.HTTPAdapter(max_retries=options.retry_times))
-
         # Construct user agent without handling the letter case.
         headers = kwargs.setdefault('headers', {})
         headers['User-Agent'] = self._user_agent
+        if not options.keep_alive:
+            headers['Connection'] = 'close'
         params = kwargs.setdefault('params', {})
         if 'curr_project' not in params and self.project is not None:
             params['curr_project'] = self.project
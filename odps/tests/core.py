@@ -16,13 +16,18 @@
 # under the License.
 
 import os
+import itertools
+import threading
 
 import six
 from six.moves import configparser as ConfigParser
+from six.moves import BaseHTTPServer
+from six.moves.urllib.parse import urlparse, parse_qs
 
 from .. import compat
 from .. import ODPS
 from ..tunnel import TableTunnel
+from ..utils import gen_rfc822
 
 LOGGING_CONFIG = {
     'version': 1,
@@ -120,3 +125,115 @@ class TestBase(compat.unittest.TestCase):
 
     def teardown(self):
         pass
+
+
+INSTANCE_XML = '''<?xml version="1.0" encoding="UTF-8"?>
+<Instance>
+  <Status>%(status)s</Status>
+  <Tasks>
+    <Task Type="SQL">
+      <Name>AnonymousSQLTask</Name>
+      <Status>%(task_status)s</Status>
+    </Task>
+  </Tasks>
+</Instance>'''
+
+INSTANCE_RESULT_XML = '''<?xml version="1.0" encoding="UTF-8"?>
+<Instance>
+  <Tasks>
+    <Task Type="SQL">
+      <Name>AnonymousSQLTask</Name>
+      <Result Format="text">%(result)s</Result>
+    </Task>
+  </Tasks>
+</Instance>'''
+
+
+class MockODPSHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """
+    Serve instance creation, status and results of a fake ODPS service. An instance
+    terminates after ``polls_to_terminate`` status requests, and fails if
+    the SQL contains ``fail``, its task fails before the instance terminates
+    if the SQL contains ``failfast``.
+    """
+
+    def log_message(self, *_):
+        pass
+
+    def _send(self, code, content=b'', headers=None):
+        self.send_response(code)
+        for k, v in six.iteritems(headers or dict()):
+            self.send_header(k, v)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        with server.lock:
+            instance_id = 'instance%d' % next(server.ids)
+            server.instances[instance_id] = {'polls': 0, 'failed': b'fail' in body,
+                                             'fails_early': b'failfast' in body}
+        self._send(201, headers={'Location': 'http://%s:%d%s/%s' % (
+            server.server_address[0], server.server_address[1],
+            urlparse(self.path).path, instance_id)})
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        instance_id = url.path.rsplit('/', 1)[1]
+        query = parse_qs(url.query, keep_blank_values=True)
+        with server.lock:
+            server.requests.append((instance_id, sorted(query)))
+            instance = server.instances[instance_id]
+            if 'result' not in query:
+                instance['polls'] += 1
+            terminated = instance['polls'] >= server.polls_to_terminate
+
+        if 'result' in query:
+            result = 'mock error' if instance['failed'] else 'OK'
+            content = INSTANCE_RESULT_XML % dict(result=result)
+        elif not terminated:
+            task_status = 'Failed' if instance['fails_early'] else 'Running'
+            content = INSTANCE_XML % dict(status='Running', task_status=task_status)
+        else:
+            task_status = 'Failed' if instance['failed'] else 'Success'
+            content = INSTANCE_XML % dict(status='Terminated', task_status=task_status)
+
+        headers = {
+            'Content-Type': 'application/xml',
+            'x-odps-owner': 'mock',
+            'x-odps-start-time': gen_rfc822(),
+        }
+        if terminated:
+            headers['x-odps-end-time'] = gen_rfc822()
+        self._send(200, content.encode('utf-8'), headers=headers)
+
+
+class MockODPSServer(BaseHTTPServer.HTTPServer):
+    """
+    Local HTTP server of a fake ODPS service for instances, ``requests``
+    records (instance id, query params) of every GET request.
+    """
+
+    def __init__(self, polls_to_terminate):
+        BaseHTTPServer.HTTPServer.__init__(self, ('127.0.0.1', 0), MockODPSHandler)
+        self.polls_to_terminate = polls_to_terminate
+        self.lock = threading.Lock()
+        self.ids = itertools.count()
+        self.instances = dict()
+        self.requests = []
+
+    @property
+    def endpoint(self):
+        return 'http://%s:%d/api' % self.server_address
+
+    def start(self):
+        thread = threading.Thread(target=self.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import sys
+
+from odps import ODPS, errors, options
+from odps.compat import unittest
+from odps.tests.core import MockODPSServer
+
+try:
+    import asyncio
+    from odps import aio
+except (ImportError, SyntaxError):
+    asyncio = None
+
+
+@unittest.skipIf(asyncio is None or sys.version_info[:2] < (3, 5), 'asyncio requires Python 3.5+')
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockODPSServer(polls_to_terminate=3)
+        self.server.start()
+
+        # ODPS resets the global tunnel endpoint
+        self._tunnel_endpoint = options.tunnel_endpoint
+        self.odps = ODPS('access_id', 'secret_access_key', 'mock_project',
+                         endpoint=self.server.endpoint)
+        self.executor = aio.AsyncExecutor(concurrency=4)
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        options.tunnel_endpoint = self._tunnel_endpoint
+        self.loop.close()
+        self.executor.shutdown()
+        self.server.stop()
+
+    def testRunAndWaitMany(self):
+        count = 20
+        run = lambda sql: aio.run_sql(self.odps, sql, executor=self.executor)
+        instances = self.loop.run_until_complete(
+            asyncio.gather(*[run('select %d' % i) for i in range(count)]))
+        self.assertEqual(len(set(inst.id for inst in instances)), count)
+
+        wait = lambda inst: aio.wait_for_success(inst, interval=0.01, max_interval=0.05,
+                                                 executor=self.executor)
+        self.loop.run_until_complete(asyncio.gather(*[wait(inst) for inst in instances]))
+        self.assertTrue(all(inst.is_terminated() for inst in instances))
+
+    def testCoroutineMethods(self):
+        instance = self.loop.run_until_complete(self.odps.async_run_sql('select 1'))
+        self.loop.run_until_complete(instance.wait(interval=0.01, max_interval=0.05))
+        self.assertTrue(instance.is_successful())
+
+        instance = self.loop.run_until_complete(self.odps.async_execute_sql('select 2'))
+        self.assertTrue(instance.is_successful())
+
+    def testFailedInstance(self):
+        self.assertRaises(errors.ODPSError, self.loop.run_until_complete,
+                          aio.execute_sql(self.odps, 'select fail', executor=self.executor))
+
+
+if __name__ == '__main__':
+    unittest.main()
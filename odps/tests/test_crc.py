@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import os
+
+from odps.crc import Crc32c, crc32c_backends
+from odps.tests.core import TestBase
+from odps.compat import unittest
+
+
+class Test(TestBase):
+
+    def testCrc32cCheckValue(self):
+        for backend in crc32c_backends():
+            crc = Crc32c(backend=backend)
+            crc.update(bytearray(b'123456789'), 0, 9)
+            self.assertEqual(crc.getvalue(), 0xe3069283)
+
+    def testCrc32cBackendsAgree(self):
+        for size in (0, 1, 7, 8, 15, 16, 17, 63, 64, 1001, 65537):
+            data = bytearray(os.urandom(size))
+            half = size // 2
+
+            values = []
+            for backend in crc32c_backends():
+                crc = Crc32c(backend=backend)
+                crc.update(data, 0, half)
+                crc.update(data, half, size - half)
+                values.append(crc.getvalue())
+
+                crc.reset()
+                crc.update(data)
+                values.append(crc.getvalue())
+            self.assertEqual(len(set(values)), 1)
+
+    def testUnknownBackend(self):
+        self.assertRaises(ValueError, lambda: Crc32c(backend='unknown'))
+
+if __name__ == '__main__':
+    unittest.main()
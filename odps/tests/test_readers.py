@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from datetime import datetime
+from decimal import Decimal
+from io import BytesIO
+
+from requests import Response
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from odps.readers import RecordReader
+from odps.models import Schema
+from odps.tests.core import TestBase
+from odps.compat import unittest
+
+
+class Test(TestBase):
+
+    def testReadCSV(self):
+        schema = Schema.from_lists(
+            ['id', 'num', 'name', 'dt', 'flag', 'dec'],
+            ['bigint', 'double', 'string', 'datetime', 'boolean', 'decimal'])
+        data = '\n'.join([
+            'name,id,flag,dec,num,dt',
+            'hello,1,true,3.14,2.5,2016-01-02 03:04:05',
+            '\\N,\\N,false,\\N,\\N,\\N',
+        ])
+
+        records = list(RecordReader(schema, data))
+        self.assertEqual([col.name for col in records[0]._columns],
+                         ['name', 'id', 'flag', 'dec', 'num', 'dt'])
+        self.assertEqual(records[0].values,
+                         ['hello', 1, True, Decimal('3.14'), 2.5, datetime(2016, 1, 2, 3, 4, 5)])
+        self.assertEqual(records[1].values, [None, None, False, None, None, None])
+
+        records = list(RecordReader(None, 'a,b\nx,\\N'))
+        self.assertEqual(records[0]['a'], 'x')
+        self.assertIsNone(records[0]['b'])
+
+    def _make_response(self, data):
+        resp = Response()
+        resp.raw = BytesIO(data.encode('utf-8'))
+        resp.encoding = 'utf-8'
+        return resp
+
+    def testReadCSVStream(self):
+        schema = Schema.from_lists(['id', 'name'], ['bigint', 'string'])
+        data = u'id,name\n' + u''.join(u'%d,"名字\n%d"\n' % (i, i) for i in range(1000))
+
+        reader = RecordReader(schema, self._make_response(data))
+        reader.READ_CHUNK_SIZE = 7
+        records = list(reader)
+        self.assertEqual(len(records), 1000)
+        self.assertEqual(records[999].values, [999, u'名字\n999'])
+        self.assertEqual(reader.raw, data)
+
+        # the raw text is available while reading records
+        reader = RecordReader(schema, self._make_response(data))
+        reader.READ_CHUNK_SIZE = 7
+        self.assertEqual(next(reader).values, [0, u'名字\n0'])
+        self.assertEqual(reader.raw, data)
+        self.assertEqual(len(list(reader)), 999)
+
+        reader = RecordReader(schema, self._make_response(data))
+        self.assertEqual(reader.raw, data)
+        self.assertEqual(len(list(reader)), 1000)
+
+    @unittest.skipIf(np is None, 'numpy not installed')
+    def testReadCSVBatches(self):
+        schema = Schema.from_lists(['id', 'num', 'dt'], ['bigint', 'double', 'datetime'])
+        data = '\n'.join(['id,num,dt'] + [
+            '%d,%s,2016-01-02 03:04:%02d' % (i, i * 0.5 if i % 3 else '\\N', i) for i in range(25)
+        ])
+
+        batches = list(RecordReader(schema, data).read_batches(batch_size=10, batch_format='numpy'))
+        self.assertEqual([len(b['id']) for b in batches], [10, 10, 5])
+        self.assertEqual(batches[0]['id'].dtype, np.int64)
+        self.assertTrue(batches[0]['num'].mask[0])
+        self.assertEqual(batches[0]['num'][1], 0.5)
+        self.assertEqual(batches[2]['dt'][4], np.datetime64('2016-01-02T03:04:24'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import pickle
+import socket
+import threading
+from multiprocessing.pool import ThreadPool
+
+from six.moves import BaseHTTPServer, socketserver
+
+from odps.tests.core import TestBase
+from odps.compat import unittest
+from odps.accounts import AliyunAccount
+from odps.config import options
+from odps.rest import RestClient
+
+
+class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    connections = set()
+    lock = threading.Lock()
+
+    def setup(self):
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        BaseHTTPServer.BaseHTTPRequestHandler.setup(self)
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        with self.lock:
+            self.connections.add(self.client_address)
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+
+class ThreadingHTTPServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+class Test(TestBase):
+    def setup(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+        self.endpoint = 'http://127.0.0.1:%s' % self.server.server_address[1]
+        self.client = RestClient(AliyunAccount('access_id', 'secret_access_key'),
+                                 self.endpoint, project='test_project')
+        self.old_options = (options.keep_alive, options.pool_max_idle_time)
+        Handler.connections.clear()
+
+    def teardown(self):
+        options.keep_alive, options.pool_max_idle_time = self.old_options
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def testKeepAlive(self):
+        for _ in range(5):
+            self.assertEqual(self.client.get(self.endpoint + '/projects').content, b'ok')
+        self.assertEqual(len(Handler.connections), 1)
+
+        # the pool is rebuilt after it has been idle for too long
+        options.pool_max_idle_time = -1
+        self.client.get(self.endpoint + '/projects')
+        self.assertEqual(len(Handler.connections), 2)
+
+        Handler.connections.clear()
+        options.keep_alive = False
+        for _ in range(3):
+            self.client.get(self.endpoint + '/projects')
+        self.assertEqual(len(Handler.connections), 3)
+
+    def testConcurrentRequests(self):
+        pool = ThreadPool(4)
+        try:
+            results = pool.map(lambda _: self.client.get(self.endpoint + '/projects').content,
+                               range(40))
+        finally:
+            pool.terminate()
+        self.assertEqual(results, [b'ok'] * 40)
+        self.assertLessEqual(len(Handler.connections), options.pool_maxsize)
+
+    def testPickle(self):
+        self.client.get(self.endpoint + '/projects')
+        client = pickle.loads(pickle.dumps(self.client))
+        self.assertEqual(client.endpoint, self.endpoint)
+        self.assertEqual(client.project, 'test_project')
+        self.assertEqual(client.get(self.endpoint + '/projects').content, b'ok')
+
+
+if __name__ == '__main__':
+    unittest.main()
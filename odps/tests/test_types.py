@@ -34,5 +34,65 @@ class Test(TestBase):
         r = Record(schema=s, values=[None]*8)
         self.assertSequenceEqual(r.values, [None]*8)
 
+    def testRecordColumnIndexes(self):
+        s = Schema.from_lists(['name', 'id'], ['string', 'bigint'])
+        r1 = Record(schema=s, values=['a', 1])
+        r2 = Record(schema=s, values=['b', 2])
+        self.assertIs(r1._name_indexes, r2._name_indexes)
+        self.assertFalse(hasattr(r1, '__dict__'))
+
+        self.assertEqual(r1.name, 'a')
+        self.assertEqual(r1['id'], 1)
+        self.assertEqual(r1[1], 1)
+        self.assertEqual(r1['name', 'id'], ['a', 1])
+        self.assertIn('name', r1)
+
+        r1.name = 'c'
+        r1['id'] = 3
+        self.assertEqual(r1.values, ['c', 3])
+        self.assertEqual(r2.values, ['b', 2])
+        self.assertRaises(AttributeError, lambda: r1.not_exist)
+
+        # columns returned are copies which do not change the schema
+        s.columns.append(Column(name='value', typo='double'))
+        self.assertEqual(len(s.columns), 2)
+        self.assertEqual(len(Record(schema=s)._name_indexes), 2)
+
+        # columns changed, so the index is rebuilt
+        s.update(s.columns + [Column(name='value', typo='double')], None)
+        r3 = Record(schema=s, values=['d', 4, 1.0])
+        self.assertIsNot(r1._name_indexes, r3._name_indexes)
+        self.assertEqual(r3.value, 1.0)
+
+    def testReadOnlyRecord(self):
+        s = Schema.from_lists(['name', 'id'], ['string', 'bigint'])
+        r = ReadOnlyRecord(schema=s, values=['a', 1])
+        self.assertIsInstance(r.values, tuple)
+        self.assertEqual(r.name, 'a')
+        self.assertEqual(r['id'], 1)
+        self.assertEqual(r[0:2], ('a', 1))
+        self.assertEqual(r, Record(schema=s, values=['a', 1]))
+        self.assertEqual(Record(schema=s, values=['a', 1]), r)
+
+        def set_value():
+            r.name = 'b'
+        self.assertRaises(TypeError, set_value)
+        self.assertRaises(TypeError, lambda: r.__setitem__(1, 2))
+
+    def testRecordFromDecoded(self):
+        s = Schema.from_lists(['name', 'id'], ['string', 'bigint'])
+        values = ['a', 1]
+        r = Record._from_decoded(s.columns, values, name_indexes=s.get_column_indexes())
+        self.assertIs(r.values, values)
+        self.assertEqual(r, Record(schema=s, values=['a', 1]))
+        self.assertIs(r._name_indexes, Record(schema=s)._name_indexes)
+        self.assertEqual(Record._from_decoded(s.columns, ['b', 2])['id'], 2)
+        r.id = 2
+        self.assertEqual(r['id'], 2)
+
+        r = ReadOnlyRecord._from_decoded(s.columns, ['a', 1])
+        self.assertIsInstance(r, ReadOnlyRecord)
+        self.assertEqual(r.values, ('a', 1))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
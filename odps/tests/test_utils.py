@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import os
+import time
+from datetime import datetime
+
+from odps import utils
+from odps.tests.core import TestBase
+from odps.compat import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class Test(TestBase):
+
+    def _set_timezone(self, tz):
+        old_tz = os.environ.get('TZ')
+        os.environ['TZ'] = tz
+        time.tzset()
+        utils.clear_utc_offset_cache()
+
+        def restore():
+            if old_tz is None:
+                del os.environ['TZ']
+            else:
+                os.environ['TZ'] = old_tz
+            time.tzset()
+            utils.clear_utc_offset_cache()
+        self.addCleanup(restore)
+
+    def testMillisecondsConversion(self):
+        for ms in (0, 999, -1, -1001, 1442599885033, 1583769600000, -2 ** 40 + 7):
+            dt = utils.to_datetime(ms)
+            expected = datetime.fromtimestamp(ms // 1000).replace(microsecond=ms % 1000 * 1000)
+            self.assertEqual(dt, expected)
+            self.assertEqual(utils.to_milliseconds(dt), ms)
+            self.assertEqual(utils.to_timestamp(dt), ms // 1000)
+
+    @unittest.skipIf(not hasattr(time, 'tzset'), 'time.tzset is not supported')
+    def testDaylightSavingTime(self):
+        self._set_timezone('America/New_York')
+
+        # clocks go back from 2015-11-01 02:00 EDT to 01:00 EST
+        dt = datetime(2015, 11, 1, 1, 30)
+        self.assertEqual(utils.to_milliseconds(dt), 1446355800000)
+        if hasattr(dt, 'fold'):
+            self.assertEqual(utils.to_milliseconds(dt.replace(fold=1)), 1446359400000)
+
+        start = 1446336000000  # 2015-11-01 00:00 UTC
+        for ms in range(start, start + 12 * 3600000, 600000 + 7):
+            dt = utils.to_datetime(ms)
+            self.assertEqual(dt, datetime.fromtimestamp(ms // 1000).replace(
+                microsecond=ms % 1000 * 1000))
+            self.assertEqual(utils.get_utc_offset(ms // 1000),
+                             -4 * 3600 if ms < 1446357600000 else -5 * 3600)
+
+    @unittest.skipIf(np is None, 'numpy not installed')
+    def testDatetime64Conversion(self):
+        ms = np.arange(-10 ** 9, 10 ** 12, 997 * 10 ** 5 + 3, dtype=np.int64)
+        dts = utils.to_datetime64(ms)
+        self.assertEqual(dts.dtype, np.dtype('datetime64[ms]'))
+        self.assertEqual(list(dts.astype(datetime)), [utils.to_datetime(int(v)) for v in ms])
+        self.assertTrue((utils.datetime64_to_milliseconds(dts) ==
+                         [utils.to_milliseconds(dt) for dt in dts.astype(datetime)]).all())
+        self.assertEqual(len(utils.to_datetime64([])), 0)
+
+    def testBackoff(self):
+        backoff = utils.Backoff(1, 5, factor=2)
+        self.assertEqual([backoff.next() for _ in range(5)], [1, 2, 4, 5, 5])
+        backoff.reset()
+        self.assertEqual(backoff.next(), 1)
+
+        backoff = utils.Backoff(2, 1)
+        self.assertEqual([backoff.next() for _ in range(2)], [2, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
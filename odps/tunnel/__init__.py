@@ -18,8 +18,9 @@
 
 from odps.tunnel.io import CompressOption
 from odps.tunnel.tabletunnel import TableTunnel
+from odps.tunnel.instancetunnel import InstanceTunnel
 from odps.tunnel.uploadsession import UploadSession
-from odps.tunnel.downloadsession import DownloadSession
+from odps.tunnel.downloadsession import DownloadSession, InstanceDownloadSession
 
 UploadStatus = UploadSession.Status
 DownloadStatus = DownloadSession.Status
@@ -27,45 +27,82 @@ from .. import utils
 
 
 class Checksum(object):
+    """
+    CRC32C checksum of tunnel records.
+
+    In batch mode the bytes fed by ``update_*`` methods are accumulated into
+    a reusable buffer and hashed at once when :meth:`getvalue` is called,
+    which produces the same value as hashing them one by one.
+    """
+
     TRUE = bytearray([1])
     FALSE = bytearray([0])
-    
-    def __init__(self):
+
+    _INT = struct.Struct('<i')
+    _LONG = struct.Struct('<q')
+    _DOUBLE = struct.Struct('<d')
+
+    def __init__(self, batch=False):
         self.crc = Crc32c()
+        self._batch = batch
+        self._buffer = bytearray()
+
+    @property
+    def buffer(self):
+        """
+        The buffer of batch mode, bytes appended to it will be hashed
+        when :meth:`getvalue` is called.
+        """
+        if not self._batch:
+            raise ValueError('Buffer is only available in batch mode.')
+        return self._buffer
 
     def update_bool(self, val):
         assert isinstance(val, bool)
 
         val = self.TRUE if val else self.FALSE
-        self.update(val)
+        self._update(val)
 
     def update_int(self, val):
         assert isinstance(val, six.integer_types)
 
-        val = struct.pack('<i', val)
-        self.update(val)
+        self._update(self._INT.pack(val))
 
     def update_long(self, val):
         assert isinstance(val, six.integer_types)
 
-        val = struct.pack('<q', val)
-        self.update(val)
+        self._update(self._LONG.pack(val))
 
     def update_float(self, val):
         assert isinstance(val, float)
 
-        val = struct.pack('<d', val)
-        self.update(val)
-            
+        self._update(self._DOUBLE.pack(val))
+
+    def _update(self, b):
+        if self._batch:
+            self._buffer.extend(b)
+        else:
+            self.crc.update(b, 0, len(b))
+
     def update(self, b, off=None, length=None):
-        b = bytearray(utils.to_binary(b))
+        if not isinstance(b, (six.binary_type, bytearray)):
+            b = utils.to_binary(b)
 
         off = off or 0
         length = length or len(b)
-        self.crc.update(b, off, length)
-        
+        if off != 0 or length != len(b):
+            b = b[off: off+length]
+        self._update(b)
+
+    def _flush(self):
+        if self._buffer:
+            self.crc.update(self._buffer, 0, len(self._buffer))
+            del self._buffer[:]
+
     def getvalue(self):
+        self._flush()
         return self.crc.getvalue()
-    
+
     def reset(self):
+        del self._buffer[:]
         return self.crc.reset()
@@ -23,7 +23,7 @@ from .. import serializers, types
 from ..models import Schema
 from .io import CompressOption
 from .errors import TunnelError
-from .reader import TunnelReader
+from .reader import TunnelReader, TunnelBatchReader
 
 
 class DownloadSession(serializers.JSONSerializableModel):
@@ -61,6 +61,9 @@ class DownloadSession(serializers.JSONSerializableModel):
             self.reload()
         self._compress_option = compress_option
 
+    def _resource(self):
+        return self._table.resource()
+
     def _init(self):
         params = {'downloads': ''}
         headers = {'Content-Length': 0}
@@ -68,7 +71,7 @@ class DownloadSession(serializers.JSONSerializableModel):
                 len(self._partition_spec) > 0:
             params['partition'] = self._partition_spec
 
-        url = self._table.resource()
+        url = self._resource()
         resp = self._client.post(url, {}, params=params, headers=headers)
         if self._client.is_ok(resp):
             self.parse(resp, obj=self)
@@ -83,7 +86,7 @@ class DownloadSession(serializers.JSONSerializableModel):
                 len(self._partition_spec) > 0:
             params['partition'] = self._partition_spec
 
-        url = self._table.resource()
+        url = self._resource()
         resp = self._client.get(url, params=params, headers=headers)
         if self._client.is_ok(resp):
             self.parse(resp, obj=self)
@@ -91,7 +94,19 @@ class DownloadSession(serializers.JSONSerializableModel):
             e = TunnelError.parse(resp)
             raise e
             
-    def open_record_reader(self, start, count, compress=False, columns=None):
+    def open_record_reader(self, start, count, compress=False, columns=None,
+                           as_batches=False, batch_size=None, batch_format='pandas',
+                           read_only=False):
+        """
+        Open a reader of records in range [start, start+count).
+
+        If ``read_only`` is True, compact :class:`odps.types.ReadOnlyRecord` objects
+        are returned, whose values cannot be changed.
+
+        If ``as_batches`` is True, a :class:`odps.tunnel.reader.TunnelBatchReader`
+        is returned, which yields pandas DataFrames (``batch_format='pandas'``) or
+        dicts of NumPy arrays (``batch_format='numpy'``) of ``batch_size`` records.
+        """
         compress_option = self._compress_option or CompressOption()
 
         params = {}
@@ -115,12 +130,12 @@ class DownloadSession(serializers.JSONSerializableModel):
             col_name = lambda col: col.name if isinstance(col, types.Column) else col
             params['columns'] = ','.join(col_name(col) for col in columns)
 
-        url = self._table.resource()
-        resp = self._client.get(url, params=params, headers=headers)
+        url = self._resource()
+        resp = self._client.get(url, params=params, headers=headers, stream=True)
         if not self._client.is_ok(resp):
             e = TunnelError.parse(resp)
             raise e
-        
+
         content_encoding = resp.headers.get('Content-Encoding')
         if content_encoding is not None:
             if content_encoding == 'deflate':
@@ -136,4 +151,24 @@ class DownloadSession(serializers.JSONSerializableModel):
             compress = False
         
         option = compress_option if compress else None
-        return TunnelReader(self.schema, resp.content, option, columns=columns)
+        reader = TunnelReader(self.schema, resp, option, columns=columns, read_only=read_only)
+        if as_batches:
+            return TunnelBatchReader(reader, batch_size=batch_size, batch_format=batch_format)
+        return reader
+
+
+class InstanceDownloadSession(DownloadSession):
+    """
+    Download session of the result of a SQL instance, whose records are read
+    in the same binary format as tables, see :class:`DownloadSession`.
+    """
+
+    __slots__ = '_instance',
+
+    def __init__(self, client, instance, download_id=None, compress_option=None):
+        self._instance = instance
+        super(InstanceDownloadSession, self).__init__(
+            client, None, None, download_id=download_id, compress_option=compress_option)
+
+    def _resource(self):
+        return self._instance.resource()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import six
+
+from .base import BaseTunnel
+from .downloadsession import InstanceDownloadSession
+from .io import CompressOption
+from ..models import Projects
+
+
+class InstanceTunnel(BaseTunnel):
+    """
+    Tunnel to download results of SQL instances as typed records in the
+    binary format of tunnel, which is not limited in size like the task results.
+
+    :Example:
+
+    >>> tunnel = InstanceTunnel(odps)
+    >>> download_session = tunnel.create_download_session(instance)
+    >>> with download_session.open_record_reader(0, download_session.count) as reader:
+    >>>     for record in reader:
+    >>>         # handle each record
+    """
+
+    def create_download_session(self, instance, download_id=None, compress_option=None,
+                                compress_algo=None, compres_level=None, compress_strategy=None):
+        if not isinstance(instance, six.string_types):
+            instance = instance.id
+        instance = Projects(client=self.tunnel_rest)[self._project.name].instances[instance]
+        compress_option = compress_option
+        if compress_option is None and compress_algo is not None:
+            compress_option = CompressOption(
+                compress_algo=compress_algo, level=compres_level, strategy=compress_strategy)
+
+        return InstanceDownloadSession(self.tunnel_rest, instance,
+                                       download_id=download_id,
+                                       compress_option=compress_option)
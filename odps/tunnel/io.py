@@ -17,19 +17,16 @@
 # specific language governing permissions and limitations
 # under the License.
 
+import time
 import zlib
 
 from enum import Enum
 import six
 from six.moves import queue as Queue
-from google.protobuf.internal.encoder import _EncodeSignedVarint, _EncodeVarint
-from google.protobuf.internal.encoder import *
-from google.protobuf.internal.decoder import _DecodeSignedVarint32
-from google.protobuf.internal.decoder import *
-from google.protobuf.internal import wire_format
 
 from odps import errors
 from odps import compat
+from . import wireformat as wf
 
 
 class CompressOption(object):
@@ -83,20 +80,31 @@ class ProtobufWriter(object):
             content = self._compressobj.compress(data)
             six.BytesIO.write(self, content)
 
-    def __init__(self, compress_option=None, buffer_size=None, encoding='utf-8'):
+    def __init__(self, compress_option=None, buffer_size=None, encoding='utf-8',
+                 queue_size=None):
         self._buffer = ProtobufWriter._get_buffer(compress_option)
-        self._queue = Queue.Queue()
+        self._raw = compress_option is None or \
+            compress_option.algorithm == CompressOption.CompressAlgorithm.ODPS_RAW
+        # the queue is bounded so that encoding blocks when uploading is slower
+        self._queue = Queue.Queue(queue_size or 0)
 
         self._buffer_size = buffer_size or self.BUFFER_SIZE
-        self._curr_cursor = 0
+        # encoded but not yet compressed data, the same bytearray is reused
+        # for every chunk since encoders keep a reference to it
+        self._data = bytearray()
         self._n_total = 0
 
         self._encoding = encoding
 
+        self._exhausted = False
+        self._n_chunks = 0
+        self._producer_blocked_time = 0.0
+        self._consumer_blocked_time = 0.0
+
     @classmethod
     def _get_buffer(cls, compress_option=None):
         if compress_option is None or \
-                        compress_option == CompressOption.CompressAlgorithm.ODPS_RAW:
+                compress_option.algorithm == CompressOption.CompressAlgorithm.ODPS_RAW:
             return compat.BytesIO()
         elif compress_option.algorithm == \
                 CompressOption.CompressAlgorithm.ODPS_ZLIB:
@@ -111,27 +119,83 @@ class ProtobufWriter(object):
         else:
             raise IOError('Invalid compression option.')
 
-    def flush(self):
-        self._buffer.flush()
-        if self._curr_cursor > 0:
-            self._queue.put(self._buffer.getvalue())
-            self._buffer = compat.BytesIO()
+    def _flush_data(self):
+        if self._data:
+            self._n_total += len(self._data)
+            if self._raw:
+                self._put_chunk(bytes(self._data))
+            else:
+                self._buffer.write(self._data)
+            del self._data[:]
+
+    def _put_chunk(self, content):
+        start = time.time()
+        self._queue.put(content)
+        self._producer_blocked_time += time.time() - start
+        if content is not None:
+            self._n_chunks += 1
+
+    def _put_buffer(self):
+        content = self._buffer.getvalue()
+        if content:
+            self._put_chunk(content)
+            self._buffer.seek(0)
+            self._buffer.truncate()
 
-            self._curr_cursor = 0
+    def flush(self):
+        # the compressed stream is only finished when closing,
+        # so the compressor keeps its state between chunks
+        self._flush_data()
+        self._put_buffer()
 
     def close(self):
-        self.flush()
-        self._queue.put(None)  # put None to remind the receiver that it is closed
+        self._flush_data()
+        self._buffer.flush()
+        self._put_buffer()
+        self._put_chunk(None)  # put None to remind the receiver that it is closed
 
         self._buffer.close()
 
     @property
     def n_bytes(self):
-        return self._n_total
+        return self._n_total + len(self._data)
 
     def __len__(self):
         return self.n_bytes
 
+    @property
+    def buffer(self):
+        """
+        The bytearray that encoded data are appended to,
+        call :meth:`check_flush` after appending data to it.
+        """
+        return self._data
+
+    @property
+    def n_chunks(self):
+        """
+        Number of chunks handed to the consumer.
+        """
+        return self._n_chunks
+
+    @property
+    def producer_blocked_time(self):
+        """
+        Seconds that encoding waited for the consumer because the queue was full.
+        """
+        return self._producer_blocked_time
+
+    @property
+    def consumer_blocked_time(self):
+        """
+        Seconds that the consumer waited for encoded chunks.
+        """
+        return self._consumer_blocked_time
+
+    def check_flush(self):
+        if len(self._data) >= self._buffer_size:
+            self.flush()
+
     def _write(self, b, off=None, length=None):
         if isinstance(b, six.text_type):
             b = b.encode(self._encoding)
@@ -141,60 +205,77 @@ class ProtobufWriter(object):
         length = length or len(b)-off
         length = min(length, rest)
 
-        self._buffer.write(b[off: off+length])
-
-        self._curr_cursor += length
-        self._n_total += length
-
-        if self._curr_cursor >= self._buffer_size:
-            self.flush()
+        if off == 0 and length == len(b):
+            self._data.extend(b)
+        else:
+            self._data.extend(b[off: off+length])
+        self.check_flush()
 
     def write_bool(self, field_num, val):
-        BoolEncoder(field_num, False, False)(self._write, val)
+        data = self._data
+        data.extend(wf.tag_bytes(field_num, wf.WIRETYPE_VARINT))
+        data.append(1 if val else 0)
+        self.check_flush()
 
     def write_int32(self, field_num, val):
-        Int32Encoder(field_num, False, False)(self._write, val)
+        data = self._data
+        data.extend(wf.tag_bytes(field_num, wf.WIRETYPE_VARINT))
+        wf.encode_varint(data, val)
+        self.check_flush()
 
     def write_sint32(self, field_num, val):
-        SInt32Encoder(field_num, False, False)(self._write, val)
+        data = self._data
+        data.extend(wf.tag_bytes(field_num, wf.WIRETYPE_VARINT))
+        wf.encode_varint(data, (val << 1) ^ (val >> 31))
+        self.check_flush()
 
-    def write_uint32(self, field_num, val):
-        UInt32Encoder(field_num, False, False)(self._write, val)
+    write_uint32 = write_int32
 
     def write_long(self, field_num, val):
-        SInt64Encoder(field_num, False, False)(self._write, val)
+        data = self._data
+        data.extend(wf.tag_bytes(field_num, wf.WIRETYPE_VARINT))
+        wf.encode_varint(data, wf.zigzag_encode(val))
+        self.check_flush()
 
     def write_double(self, field_num, val):
-        DoubleEncoder(field_num, False, False)(self._write, val)
+        data = self._data
+        data.extend(wf.tag_bytes(field_num, wf.WIRETYPE_FIXED64))
+        wf.encode_double(data, val)
+        self.check_flush()
 
     def write_string(self, field_num, val):
         if isinstance(val, six.text_type):
             val = val.encode(self._encoding)
 
-        self.write_length_delimited_tag(field_num)
-        self.write_raw_varint32(len(val))  # write length
-        self._write(val)
+        data = self._data
+        data.extend(wf.tag_bytes(field_num, wf.WIRETYPE_LENGTH_DELIMITED))
+        wf.encode_length_delimited(data, val)
+        self.check_flush()
 
     write_raw_bytes = _write
 
     def write_length_delimited_tag(self, field_num):
-        self.write_tag(field_num, wire_format.WIRETYPE_LENGTH_DELIMITED)
+        self.write_tag(field_num, wf.WIRETYPE_LENGTH_DELIMITED)
 
     def write_tag(self, field_num, tag):
-        self._write(TagBytes(field_num, tag))
+        self._data.extend(wf.tag_bytes(field_num, tag))
+        self.check_flush()
 
     def write_raw_varint32(self, val):
-        _EncodeSignedVarint(self._write, val)
+        wf.encode_varint(self._data, val)
+        self.check_flush()
 
     def write_long_no_tag(self, val):
-        _EncodeVarint(self._write, wire_format.ZigZagEncode(val))
+        wf.encode_varint(self._data, wf.zigzag_encode(val))
+        self.check_flush()
 
     def write_double_no_tag(self, val):
-        self._write(struct.pack('<d', val))
+        wf.encode_double(self._data, val)
+        self.check_flush()
 
     def write_bool_no_tag(self, val):
-        val = bytearray([1]) if val else bytearray([0])
-        self._write(val)
+        self._data.append(1 if val else 0)
+        self.check_flush()
 
     def __next__(self):
         """
@@ -202,10 +283,16 @@ class ProtobufWriter(object):
         remember to do the iteration in a separate thread,
         or the queue will block current thread
         """
+        if self._exhausted:
+            raise StopIteration
+
+        start = time.time()
         val = self._queue.get()
+        self._consumer_blocked_time += time.time() - start
         if val is not None:
             return val
         else:
+            self._exhausted = True
             raise StopIteration
 
     next = __next__
@@ -221,42 +308,103 @@ class ProtobufWriter(object):
 
 
 class ProtobufReader(object):
-    def __init__(self, stream, compress_option=None, encoding='utf-8'):
+    """
+    Decode protobuf fields incrementally from a stream.
+
+    The stream can be bytes, text, a file-like object or a ``requests``
+    response opened with ``stream=True``. Data are pulled in chunks of
+    ``READ_CHUNK_SIZE`` bytes and consumed bytes are discarded, so the memory
+    used does not depend on the size of the whole stream.
+    """
+
+    READ_CHUNK_SIZE = 64 * 1024
+    # max bytes that a varint can take
+    MAX_VARINT_SIZE = 10
+
+    def __init__(self, stream, compress_option=None, encoding='utf-8', chunk_size=None):
         self._encoding = encoding
-        self._data = ProtobufReader._get_data(
-            stream, compress_option=compress_option, encoding=encoding)
+        self._stream = stream
+        self._chunk_size = chunk_size or self.READ_CHUNK_SIZE
+        self._chunks = ProtobufReader._get_chunks(
+            stream, compress_option=compress_option, encoding=encoding,
+            chunk_size=self._chunk_size)
 
+        self._data = bytearray()
         self._curr_cursor = 0
-        self._n_totals = len(self._data)
+        self._n_totals = 0
+        self._eof = False
 
     @classmethod
-    def _get_data(cls, stream, encoding='utf-8', compress_option=None):
+    def _iter_stream(cls, stream, encoding='utf-8', chunk_size=None):
         if isinstance(stream, six.text_type):
-            data = stream.encode(encoding)
-        elif isinstance(stream, six.binary_type):
-            data = stream
+            yield stream.encode(encoding)
+        elif isinstance(stream, (six.binary_type, bytearray)):
+            yield six.binary_type(stream)
+        elif hasattr(stream, 'iter_content'):
+            # requests decompress the deflate content automatically
+            for chunk in stream.iter_content(chunk_size):
+                yield chunk
         else:
-            data = stream.read()  # due to the restriction of protobuf api, just read the data all
-            stream.close()  # directly close the stream
-            if isinstance(data, six.text_type):
-                data = data.encode(encoding)
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                if isinstance(chunk, six.text_type):
+                    chunk = chunk.encode(encoding)
+                yield chunk
+
+    @classmethod
+    def _get_chunks(cls, stream, encoding='utf-8', compress_option=None, chunk_size=None):
+        chunks = cls._iter_stream(stream, encoding=encoding, chunk_size=chunk_size)
 
         if compress_option is None or \
                 compress_option.algorithm == CompressOption.CompressAlgorithm.ODPS_RAW:
-            return data
+            return chunks
         elif compress_option.algorithm == CompressOption.CompressAlgorithm.ODPS_ZLIB:
-            return data  # because requests do the unzip automatically, thanks to them O.O
+            return chunks  # because requests do the unzip automatically, thanks to them O.O
         elif compress_option.algorithm == CompressOption.CompressAlgorithm.ODPS_SNAPPY:
             try:
                 import snappy
             except ImportError:
                 raise errors.DependencyNotInstalledError(
                     'python-snappy library is required for snappy support')
-            data = snappy.decompress(data)
-            return data
+
+            def decompress(chunks):
+                decompressor = snappy.StreamDecompressor()
+                for chunk in chunks:
+                    data = decompressor.decompress(chunk)
+                    if data:
+                        yield data
+                decompressor.flush()
+            return decompress(chunks)
         else:
             raise IOError('invalid compression option.')
 
+    def _fill(self, size):
+        """
+        Make sure at least `size` bytes can be read from current cursor
+        unless the stream reaches its end.
+        """
+        if self._eof or len(self._data) - self._curr_cursor >= size:
+            return
+
+        # drop the consumed bytes
+        del self._data[:self._curr_cursor]
+        self._curr_cursor = 0
+
+        while len(self._data) < size:
+            try:
+                chunk = next(self._chunks)
+            except StopIteration:
+                self._eof = True
+                break
+            self._data.extend(chunk)
+            self._n_totals += len(chunk)
+
+    def close(self):
+        if hasattr(self._stream, 'close'):
+            self._stream.close()
+
     @property
     def n_bytes(self):
         return self._n_totals
@@ -264,37 +412,43 @@ class ProtobufReader(object):
     def __len__(self):
         return self.n_bytes
 
-    def _decode_value(self, decoder, new_default=None, msg=None):
-        # tricky operations due to the hidden protobuf api which we need to hack into
-        decode_key = '__decode_key'
-        decode_dict = {}
-        decode = decoder(None, False, False, decode_key, new_default)
-        self._curr_cursor = \
-            decode(self._data, self._curr_cursor, self._n_totals, msg, decode_dict)
-        return decode_dict[decode_key]
-
     def read_field_num(self):
-        tag, self._curr_cursor = _DecodeSignedVarint32(self._data, self._curr_cursor)
-        return wire_format.UnpackTag(tag)[0]
+        self._fill(self.MAX_VARINT_SIZE)
+        tag, self._curr_cursor = wf.decode_signed_varint32(self._data, self._curr_cursor)
+        return wf.unpack_tag(tag)[0]
 
     def read_bool(self):
-        val, self._curr_cursor = _DecodeSignedVarint32(self._data, self._curr_cursor)
+        self._fill(self.MAX_VARINT_SIZE)
+        val, self._curr_cursor = wf.decode_signed_varint32(self._data, self._curr_cursor)
         return val != 0
 
     def read_sint32(self):
-        return self._decode_value(SInt32Decoder)
+        self._fill(self.MAX_VARINT_SIZE)
+        val, self._curr_cursor = wf.decode_sint32(self._data, self._curr_cursor)
+        return val
 
     def read_uint32(self):
-        return self._decode_value(UInt32Decoder)
+        self._fill(self.MAX_VARINT_SIZE)
+        val, self._curr_cursor = wf.decode_uint32(self._data, self._curr_cursor)
+        return val
 
     def read_long(self):
-        return self._decode_value(SInt64Decoder)
+        self._fill(self.MAX_VARINT_SIZE)
+        val, self._curr_cursor = wf.decode_sint64(self._data, self._curr_cursor)
+        return val
 
     def read_double(self):
-        return self._decode_value(DoubleDecoder)
+        self._fill(8)
+        val, self._curr_cursor = wf.decode_double(self._data, self._curr_cursor)
+        return val
 
     def read_string(self):
-        return bytearray(self._decode_value(BytesDecoder, bytearray, ''))
+        self._fill(self.MAX_VARINT_SIZE)
+        size, pos = wf.decode_varint(self._data, self._curr_cursor)
+        self._fill(pos - self._curr_cursor + size)
+        val, self._curr_cursor = wf.decode_length_delimited(self._data, self._curr_cursor)
+        return val
 
     def at_end(self):
-        return self._curr_cursor >= self._n_totals
\ No newline at end of file
+        self._fill(1)
+        return self._curr_cursor >= len(self._data)
@@ -0,0 +1,412 @@
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from multiprocessing.pool import ThreadPool
+
+from six.moves import queue
+
+from .. import errors, options, types
+from .errors import TunnelError
+from .io import CompressOption
+from .writer import TunnelWriter
+
+LOG = logging.getLogger(__name__)
+
+
+def split_ranges(start, count, range_size, step=1):
+    """
+    Split records in [start, start+count) into ranges of at most
+    ``range_size`` records. Every range except the last one holds a multiple
+    of ``step`` records, so that each range can be stepped independently.
+
+    :return: list of (start, count)
+    """
+    range_size = max(range_size, 1)
+    if step > 1:
+        range_size = max(range_size // step, 1) * step
+
+    ranges = []
+    end = start + count
+    while start < end:
+        size = min(range_size, end - start)
+        ranges.append((start, size))
+        start += size
+    return ranges
+
+
+class ParallelRecordReader(object):
+    """
+    Read a range of records by splitting it into several smaller ranges
+    and downloading them on a thread pool.
+
+    At most ``max_pending`` ranges are downloaded or held in memory at the same
+    time. When ``ordered`` is True, records are yielded in their original
+    order, otherwise the ranges are yielded as soon as they are downloaded.
+
+    :param open_reader: callable accepting ``start`` and ``count`` which opens a reader
+                        of the range, e.g. ``DownloadSession.open_record_reader``
+    :param start: the record where read starts with
+    :param count: the number of records to read
+    :param workers: size of the thread pool
+    :param range_size: records of each range, default as count divided evenly by ``max_pending``
+    :param ordered: if True, keep the original order of records
+    :param max_pending: max ranges in flight, default as twice of ``workers``
+    :param step: default as 1
+
+    :Example:
+
+    >>> reader = ParallelRecordReader(download_session.open_record_reader, 0,
+    >>>                               download_session.count, workers=4)
+    >>> for record in reader:
+    >>>     # deal with the record
+    """
+
+    MAX_RANGE_SIZE = 100000
+
+    def __init__(self, open_reader, start, count, workers=4, range_size=None,
+                 ordered=True, max_pending=None, step=None):
+        if workers < 1:
+            raise ValueError('workers should be a positive integer')
+        self._open_reader = open_reader
+        self._workers = workers
+        self._ordered = ordered
+        self._max_pending = max(max_pending or 2 * workers, 1)
+        self._step = step or 1
+
+        if range_size is None:
+            range_size = min(-(-count // self._max_pending), self.MAX_RANGE_SIZE)
+        self._ranges = split_ranges(start, count, range_size, step=self._step)
+
+        self._pool = None
+        self._it = None
+
+    @property
+    def ranges(self):
+        return self._ranges
+
+    def _read_range(self, rng):
+        start, count = rng
+        with self._open_reader(start, count) as reader:
+            if self._step > 1:
+                return list(reader[::self._step])
+            return list(reader)
+
+    def _iter_ordered(self, ranges):
+        pending = deque()
+        while ranges or pending:
+            while ranges and len(pending) < self._max_pending:
+                pending.append(self._pool.apply_async(self._read_range, (ranges.popleft(), )))
+            yield pending.popleft().get()
+
+    def _iter_unordered(self, ranges):
+        finished = queue.Queue()
+
+        def read_range(rng):
+            try:
+                finished.put((self._read_range(rng), None))
+            except Exception as e:
+                finished.put((None, e))
+
+        n_pending = 0
+        while ranges or n_pending:
+            while ranges and n_pending < self._max_pending:
+                self._pool.apply_async(read_range, (ranges.popleft(), ))
+                n_pending += 1
+            items, e = finished.get()
+            n_pending -= 1
+            if e is not None:
+                raise e
+            yield items
+
+    def _iter_results(self):
+        ranges = deque(self._ranges)
+        self._pool = ThreadPool(min(self._workers, max(len(ranges), 1)))
+        try:
+            if self._ordered:
+                for items in self._iter_ordered(ranges):
+                    for item in items:
+                        yield item
+            else:
+                for items in self._iter_unordered(ranges):
+                    for item in items:
+                        yield item
+        finally:
+            self.close()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._it is None:
+            self._it = self._iter_results()
+        return next(self._it)
+
+    next = __next__
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
+class ParallelRecordWriter(object):
+    """
+    Write a single stream of records into several blocks of an upload session
+    in parallel.
+
+    Records are sharded across ``workers`` threads, each of which encodes its
+    records into a block and uploads the block when it holds ``block_size``
+    records, then allocates the next free block id. With ``shard='round_robin'``
+    batches of records are dealt to the workers in turn, while with
+    ``shard='size'`` a worker receives consecutive records until its block is
+    full. Failed uploads are retried ``retry_times`` times, and all the blocks
+    are committed through :meth:`odps.tunnel.UploadSession.commit` by
+    :meth:`commit`.
+
+    To be able to retry, each worker keeps the encoded data of its current
+    block in memory until the block is uploaded, thus up to ``workers``
+    encoded blocks of ``block_size`` records are held at the same time. When
+    ``retry_times`` is 0, blocks are streamed to the server while encoding
+    instead, and only a few chunks of ``options.chunk_size`` bytes are
+    buffered for each worker.
+
+    :param upload_session: :class:`odps.tunnel.UploadSession`
+    :param workers: number of blocks written concurrently
+    :param block_size: max records of each block, default as ``DEFAULT_BLOCK_SIZE``
+    :param shard: ``round_robin`` or ``size``
+    :param compress: if True, the data will be compressed during uploading
+    :param retry_times: times to retry a failed block, default as ``options.retry_times``
+    :param start_block_id: the first block id to allocate
+
+    :Example:
+
+    >>> upload_session = tunnel.create_upload_session('my_table')
+    >>> with ParallelRecordWriter(upload_session, workers=4) as writer:
+    >>>     writer.write(records)
+    >>> # all blocks are committed when exiting the with statement
+    """
+
+    MAX_BLOCK_ID = 19999
+    DEFAULT_BLOCK_SIZE = 20000
+    BATCH_SIZE = 1000
+    QUEUE_SIZE = 16
+    RETRY_INTERVAL = 1
+
+    def __init__(self, upload_session, workers=4, block_size=None, shard='round_robin',
+                 compress=False, retry_times=None, start_block_id=0):
+        if workers < 1:
+            raise ValueError('workers should be a positive integer')
+        if shard not in ('round_robin', 'size'):
+            raise ValueError('Unknown shard method: %s' % shard)
+
+        self._upload_session = upload_session
+        self._block_size = block_size or self.DEFAULT_BLOCK_SIZE
+        self._shard = shard
+        self._compress = compress
+        self._retry_times = retry_times if retry_times is not None else options.retry_times
+
+        self._block_ids = itertools.count(start_block_id)
+        self._blocks = []
+        self._lock = threading.Lock()
+        self._error = None
+        self._closed = False
+
+        self._batches = [[] for _ in range(workers)]
+        self._batch_size = min(self.BATCH_SIZE, self._block_size)
+        self._queues = [queue.Queue(self.QUEUE_SIZE) for _ in range(workers)]
+        self._threads = [threading.Thread(target=self._work, args=(q, ))
+                         for q in self._queues]
+        for thread in self._threads:
+            thread.setDaemon(True)
+            thread.start()
+
+        self._curr_worker = 0
+        self._curr_worker_count = 0
+        self._count = 0
+
+    @property
+    def blocks(self):
+        """
+        Ids of blocks which are uploaded.
+        """
+        return sorted(self._blocks)
+
+    @property
+    def count(self):
+        return self._count
+
+    def _allocate_block(self):
+        with self._lock:
+            block_id = next(self._block_ids)
+        if block_id > self.MAX_BLOCK_ID:
+            raise TunnelError('Block id exceeds %s, try a larger block_size' % self.MAX_BLOCK_ID)
+        return block_id
+
+    def _add_block(self, block_id):
+        with self._lock:
+            self._blocks.append(block_id)
+
+    def _upload_block(self, block_id, chunks):
+        retry = 0
+        while True:
+            try:
+                self._upload_session.put_block(block_id, iter(chunks), compress=self._compress)
+                break
+            except (errors.ODPSError, TunnelError, IOError) as e:
+                if retry >= self._retry_times:
+                    raise
+                retry += 1
+                LOG.warning('Failed to upload block %s, retry %s: %s', block_id, retry, e)
+                time.sleep(self.RETRY_INTERVAL)
+
+        self._add_block(block_id)
+
+    def _new_block_writer(self, block_id, chunks):
+        option = None
+        if self._compress:
+            option = self._upload_session._compress_option or CompressOption()
+        if chunks is None:
+            # nothing to retry with, stream the block while encoding
+            upload = lambda data: self._upload_session.put_block(block_id, data,
+                                                                 compress=self._compress)
+        else:
+            upload = chunks.extend
+        return TunnelWriter(self._upload_session.schema, upload, compress_option=option)
+
+    def _close_block(self, writer, block_id, chunks):
+        writer.close()
+        if chunks is None:
+            self._add_block(block_id)
+        else:
+            self._upload_block(block_id, chunks)
+
+    def _work(self, q):
+        writer, block_id, chunks = None, None, None
+        while True:
+            records = q.get()
+            if records is None:
+                break
+            if self._error is not None:
+                # keep consuming so that the producer never blocks
+                continue
+            try:
+                for record in records:
+                    if writer is None:
+                        block_id = self._allocate_block()
+                        chunks = [] if self._retry_times > 0 else None
+                        writer = self._new_block_writer(block_id, chunks)
+                    writer.write(record)
+                    if writer.count >= self._block_size:
+                        self._close_block(writer, block_id, chunks)
+                        writer, block_id, chunks = None, None, None
+            except Exception as e:
+                self._error = e
+
+        if writer is not None and self._error is None:
+            try:
+                self._close_block(writer, block_id, chunks)
+            except Exception as e:
+                self._error = e
+
+    def _check_error(self):
+        if self._error is not None:
+            raise self._error
+
+    def _dispatch(self, worker):
+        batch = self._batches[worker]
+        if batch:
+            self._queues[worker].put(batch)
+            self._batches[worker] = []
+
+    def _write_record(self, record):
+        worker = self._curr_worker
+        batch = self._batches[worker]
+        batch.append(record)
+        self._count += 1
+
+        if self._shard == 'size':
+            self._curr_worker_count += 1
+            if self._curr_worker_count >= self._block_size:
+                self._dispatch(worker)
+                self._curr_worker = (worker + 1) % len(self._queues)
+                self._curr_worker_count = 0
+            elif len(batch) >= self._batch_size:
+                self._dispatch(worker)
+        elif len(batch) >= self._batch_size:
+            self._dispatch(worker)
+            self._curr_worker = (worker + 1) % len(self._queues)
+
+    def write(self, *records):
+        """
+        Write records, which can be records or a list of records.
+        """
+        if self._closed:
+            raise IOError('The writer is closed')
+        self._check_error()
+
+        if len(records) == 1 and not isinstance(records[0], types.Record):
+            records = records[0]
+        for record in records:
+            self._write_record(record)
+        self._check_error()
+
+    def _join(self):
+        if self._closed:
+            return
+        self._closed = True
+        for worker, q in enumerate(self._queues):
+            self._dispatch(worker)
+            q.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def close(self):
+        """
+        Wait until all the blocks are uploaded.
+        """
+        self._join()
+        self._check_error()
+
+    def commit(self):
+        """
+        Wait until all the blocks are uploaded and commit them.
+        """
+        self.close()
+        self._upload_session.commit(self.blocks)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, *_):
+        if exc_type is not None:
+            # stop uploading and let the original exception propagate
+            self._error = self._error or exc_val
+            self._join()
+            return
+        self.commit()
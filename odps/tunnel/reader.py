@@ -17,17 +17,31 @@
 # specific language governing permissions and limitations
 # under the License.
 
+from decimal import Decimal
+
+try:
+    import numpy as np
+    has_numpy = True
+except ImportError:
+    has_numpy = False
+try:
+    import pandas as pd
+    has_pandas = True
+except ImportError:
+    has_pandas = False
+
 from . import io
-from .. import utils, types, compat
+from .. import utils, types, compat, errors
 from .checksum import Checksum
-from ..models import Record
+from ..types import Record, ReadOnlyRecord
 from ..readers import AbstractRecordReader
 from .wireconstants import ProtoWireConstants
 
 
 class TunnelReader(AbstractRecordReader):
     def __init__(self, schema, data, compress_option=None,
-                 compress_algo=None, compres_level=None, compress_strategy=None, columns=None):
+                 compress_algo=None, compres_level=None, compress_strategy=None, columns=None,
+                 read_only=False):
         self._compress_option = compress_option
         if self._compress_option is None and compress_algo is not None:
             self._compress_option = io.CompressOption(
@@ -39,117 +53,250 @@ class TunnelReader(AbstractRecordReader):
         else:
             self._columns = [self._schema[c] for c in columns]
 
+        # read-only records store values in tuples which take less memory
+        self._record_class = ReadOnlyRecord if read_only else Record
+        # the index of column names is shared by all the records read
+        self._name_indexes = types.build_column_indexes(self._columns)
+
         self._stream = data
         self._reader = io.ProtobufReader(data, compress_option=self._compress_option)
 
-        self._crc = Checksum()
+        self._crc = Checksum(batch=True)
         self._crccrc = Checksum()
         self._curr_cusor = 0
 
+        self._index_bytes = [Checksum._INT.pack(i + 1) for i in range(len(self._columns))]
+        self._decoders = self._compile_decoders()
+
     @property
     def count(self):
         return self._curr_cusor
 
-    def _read_array(self, value_type):
-        res = []
-
-        size = self._reader.read_uint32()
-        for _ in range(size):
-            if self._reader.read_bool():
-                res.append(None)
-            else:
-                if value_type == types.string:
-                    val = utils.to_text(self._reader.read_string())
-                    self._crc.update(val)
-                elif value_type == types.bigint:
-                    val = self._reader.read_long()
-                    self._crc.update_long(val)
-                elif value_type == types.double:
-                    val = self._reader.read_double()
-                    self._crc.update_float(val)
-                elif value_type == types.boolean:
-                    val = self._reader.read_bool()
-                    self._crc.update_bool(val)
+    def _compile_primitive_decoder(self, data_type):
+        """
+        Compile the decoder of a value without tag, used for elements of arrays and maps.
+        """
+        reader = self._reader
+        crc = self._crc.buffer
+        to_text = utils.to_text
+        pack_long = Checksum._LONG.pack
+        pack_double = Checksum._DOUBLE.pack
+
+        if data_type == types.string:
+            def decode():
+                val = reader.read_string()
+                crc.extend(val)
+                return to_text(val)
+        elif data_type == types.bigint:
+            def decode():
+                val = reader.read_long()
+                crc.extend(pack_long(val))
+                return val
+        elif data_type == types.double:
+            def decode():
+                val = reader.read_double()
+                crc.extend(pack_double(val))
+                return val
+        elif data_type == types.boolean:
+            def decode():
+                val = reader.read_bool()
+                crc.append(1 if val else 0)
+                return val
+        else:
+            raise IOError('Unsupport array type. type: %s' % data_type)
+        return decode
+
+    def _compile_array_decoder(self, data_type):
+        reader = self._reader
+        decode_element = self._compile_primitive_decoder(data_type)
+
+        def decode():
+            res = []
+            size = reader.read_uint32()
+            for _ in range(size):
+                if reader.read_bool():
+                    res.append(None)
                 else:
-                    raise IOError('Unsupport array type. type: %s' % value_type)
-                res.append(val)
+                    res.append(decode_element())
+            return res
+        return decode
 
-        return res
-        
-    def read(self):
-        record = Record(self._columns)
+    def _compile_decoder(self, data_type, raw_datetime=False):
+        """
+        Compile the decoder of a column, which reads the value after the tag
+        and updates the checksum of the record. When ``raw_datetime`` is True,
+        datetime values are left as milliseconds since epoch.
+        """
+        reader = self._reader
+        crc = self._crc.buffer
+        to_text = utils.to_text
+        to_datetime = utils.to_datetime
+        pack_long = Checksum._LONG.pack
+        pack_double = Checksum._DOUBLE.pack
+
+        if data_type == types.double:
+            def decode():
+                val = reader.read_double()
+                crc.extend(pack_double(val))
+                return val
+        elif data_type == types.boolean:
+            def decode():
+                val = reader.read_bool()
+                crc.append(1 if val else 0)
+                return val
+        elif data_type == types.bigint:
+            def decode():
+                val = reader.read_long()
+                crc.extend(pack_long(val))
+                return val
+        elif data_type == types.string:
+            def decode():
+                val = reader.read_string()
+                crc.extend(val)
+                return to_text(val)
+        elif data_type == types.datetime and raw_datetime:
+            def decode():
+                val = reader.read_long()
+                crc.extend(pack_long(val))
+                return val
+        elif data_type == types.datetime:
+            def decode():
+                val = reader.read_long()
+                crc.extend(pack_long(val))
+                return to_datetime(val)
+        elif data_type == types.decimal:
+            def decode():
+                val = reader.read_string()
+                crc.extend(val)
+                return Decimal(to_text(val))
+        elif isinstance(data_type, types.Array):
+            decode = self._compile_array_decoder(data_type.value_type)
+        elif isinstance(data_type, types.Map):
+            decode_keys = self._compile_array_decoder(data_type.key_type)
+            decode_values = self._compile_array_decoder(data_type.value_type)
+
+            def decode():
+                keys = decode_keys()
+                values = decode_values()
+                return compat.OrderedDict(zip(keys, values))
+        else:
+            def decode():
+                raise IOError('Unsupported type %s' % data_type)
+        return decode
+
+    def _compile_decoders(self, raw_datetime=False):
+        return [self._compile_decoder(column.type, raw_datetime=raw_datetime)
+                for column in self._columns]
+
+    def _end_record(self):
+        reader = self._reader
+        checksum = utils.long_to_int(self._crc.getvalue())
+        if int(reader.read_uint32()) != utils.int_to_uint(checksum):
+            raise IOError('Checksum invalid')
+        self._crc.reset()
+        self._crccrc.update_int(checksum)
+        self._curr_cusor += 1
+
+    def _end_stream(self):
+        reader = self._reader
+        if self.count != reader.read_long():
+            raise IOError('count does not match')
+        if ProtoWireConstants.TUNNEL_META_CHECKSUM != \
+                reader.read_field_num():
+            raise IOError('Invalid stream data.')
+        if int(self._crccrc.getvalue()) != reader.read_uint32():
+            raise IOError('Checksum invalid.')
+        if not reader.at_end():
+            raise IOError('Expect at the end of stream, but not.')
+
+        self.close()
+
+    def _read_values(self):
+        """
+        Read values of the next record as a list, None when reaching the end.
+        """
+        values = [None, ] * len(self._columns)
+
+        reader = self._reader
+        crc = self._crc.buffer
+        index_bytes = self._index_bytes
+        decoders = self._decoders
+        n_columns = len(decoders)
 
         while True:
-            index = self._reader.read_field_num()
+            index = reader.read_field_num()
 
             if index == 0:
                 continue
             if index == ProtoWireConstants.TUNNEL_END_RECORD:
-                checksum = utils.long_to_int(self._crc.getvalue())
-                if int(self._reader.read_uint32()) != utils.int_to_uint(checksum):
-                    raise IOError('Checksum invalid')
-                self._crc.reset()
-                self._crccrc.update_int(checksum)
-                break
+                self._end_record()
+                return values
 
             if index == ProtoWireConstants.TUNNEL_META_COUNT:
-                if self.count != self._reader.read_long():
-                    raise IOError('count does not match')
-                if ProtoWireConstants.TUNNEL_META_CHECKSUM != \
-                        self._reader.read_field_num():
-                    raise IOError('Invalid stream data.')
-                if int(self._crccrc.getvalue()) != self._reader.read_uint32():
-                    raise IOError('Checksum invalid.')
-                if not self._reader.at_end():
-                    raise IOError('Expect at the end of stream, but not.')
-
+                self._end_stream()
                 return
 
-            if index > len(self._columns):
+            if index > n_columns:
                 raise IOError('Invalid protobuf tag. Perhaps the datastream '
                               'from server is crushed.')
 
-            self._crc.update_int(index)
+            i = index - 1
+            crc.extend(index_bytes[i])
+            values[i] = decoders[i]()
+
+    def _read_columns(self, count, decoders=None):
+        """
+        Read at most ``count`` records, the values of which are appended to the
+        lists of their columns directly without building records or rows.
+
+        :param decoders: decoders of the columns, default as those of the reader
+        :return: tuple of the list of columns and the number of records read,
+                 which is less than ``count`` only when reaching the end
+        """
+        columns = [[] for _ in self._columns]
+        appends = [col.append for col in columns]
+
+        reader = self._reader
+        crc = self._crc.buffer
+        index_bytes = self._index_bytes
+        decoders = decoders or self._decoders
+        n_columns = len(decoders)
+
+        n_records = 0
+        while n_records < count:
+            index = reader.read_field_num()
+
+            if index == 0:
+                continue
+            if index == ProtoWireConstants.TUNNEL_END_RECORD:
+                self._end_record()
+                n_records += 1
+                # null values are not written into the stream
+                for col in columns:
+                    if len(col) < n_records:
+                        col.append(None)
+                continue
+
+            if index == ProtoWireConstants.TUNNEL_META_COUNT:
+                self._end_stream()
+                break
+
+            if index > n_columns:
+                raise IOError('Invalid protobuf tag. Perhaps the datastream '
+                              'from server is crushed.')
 
             i = index - 1
-            data_type = self._columns[i].type
-            if data_type == types.double:
-                val = self._reader.read_double()
-                self._crc.update_float(val)
-                record[i] = val
-            elif data_type == types.boolean:
-                val = self._reader.read_bool()
-                self._crc.update_bool(val)
-                record[i] = val
-            elif data_type == types.bigint:
-                val = self._reader.read_long()
-                self._crc.update_long(val)
-                record[i] = val
-            elif data_type == types.string:
-                val = utils.to_text(self._reader.read_string())
-                self._crc.update(val)
-                record[i] = val
-            elif data_type == types.datetime:
-                val = self._reader.read_long()
-                self._crc.update_long(val)
-                record[i] = utils.to_datetime(val)
-            elif data_type == types.decimal:
-                val = self._reader.read_string()
-                self._crc.update(val)
-                record[i] = val
-            elif isinstance(data_type, types.Array):
-                val = self._read_array(data_type.value_type)
-                record[i] = val
-            elif isinstance(data_type, types.Map):
-                keys = self._read_array(data_type.key_type)
-                values = self._read_array(data_type.value_type)
-                val = compat.OrderedDict(zip(keys, values))
-                record[i] = val
-            else:
-                raise IOError('Unsupported type %s' % data_type)
+            crc.extend(index_bytes[i])
+            appends[i](decoders[i]())
 
-        self._curr_cusor += 1
-        return record
+        return columns, n_records
+
+    def read(self):
+        values = self._read_values()
+        if values is None:
+            return
+        return self._record_class._from_decoded(self._columns, values,
+                                                name_indexes=self._name_indexes)
 
     def __next__(self):
         record = self.read()
@@ -172,6 +319,170 @@ class TunnelReader(AbstractRecordReader):
     def __enter__(self):
         return self
 
+    def close(self):
+        self._reader.close()
+
+    def __exit__(self, *_):
+        self.close()
+
+
+class TunnelBatchReader(object):
+    """
+    Read records from a tunnel stream into columns, batch by batch. The CSV
+    reader of :class:`odps.readers.RecordReader` is also accepted.
+
+    Every batch is either a pandas DataFrame (``batch_format='pandas'``) or
+    an ordered dict of column name to NumPy array (``batch_format='numpy'``).
+    In the latter case, bigint, double, boolean and datetime columns are masked
+    arrays whose masks mark the null values, and other columns are object arrays
+    with None as null. Datetime columns are converted into ``datetime64`` in
+    local time for the whole batch at once. In DataFrames, bigint columns with
+    null values are of the nullable ``Int64`` type, or of ``object`` if pandas
+    does not support it, so that large integers keep their precision.
+
+    :Example:
+
+    >>> with download_session.open_record_reader(0, count, as_batches=True,
+    >>>                                          batch_size=10000) as reader:
+    >>>     for df in reader:
+    >>>         # process each pandas DataFrame
+    """
+
+    DEFAULT_BATCH_SIZE = 10000
+
+    _numpy_types = (
+        (types.bigint, 'int64', 0),
+        (types.double, 'float64', 0.0),
+        (types.boolean, 'bool', False),
+    )
+
+    def __init__(self, reader, batch_size=None, batch_format='pandas'):
+        if batch_format not in ('pandas', 'numpy'):
+            raise ValueError('Unknown batch format: %s' % batch_format)
+        if batch_format == 'pandas' and not has_pandas:
+            raise errors.DependencyNotInstalledError(
+                'pandas library is required to read batches as DataFrames')
+        if not has_numpy:
+            raise errors.DependencyNotInstalledError(
+                'numpy library is required to read batches')
+
+        self._reader = reader
+        self._batch_size = batch_size or self.DEFAULT_BATCH_SIZE
+        self._batch_format = batch_format
+        self._columns = reader._columns
+        # datetime columns are converted as a whole from milliseconds
+        self._decoders = reader._compile_decoders(raw_datetime=True)
+        self._converters = [self._get_converter(col.type) for col in self._columns]
+        self._finished = False
+
+    @property
+    def count(self):
+        return self._reader.count
+
+    @property
+    def n_bytes(self):
+        return self._reader.n_bytes
+
+    def _get_converter(self, data_type):
+        for tp, dtype, fill_value in self._numpy_types:
+            if data_type == tp:
+                return self._make_typed_converter(dtype, fill_value)
+        if data_type == types.datetime:
+            return self._convert_datetime
+        if isinstance(data_type, (types.Array, types.Map)):
+            return self._nested_to_array
+        return self._to_object_array
+
+    def _convert_datetime(self, values):
+        if None not in values:
+            data = utils.to_datetime64(values)
+            if self._batch_format == 'pandas':
+                return data.astype('datetime64[ns]')
+            return np.ma.MaskedArray(data, mask=np.zeros(len(data), dtype=np.bool_))
+
+        mask = np.array([v is None for v in values], dtype=np.bool_)
+        data = utils.to_datetime64([0 if v is None else v for v in values])
+        if self._batch_format == 'pandas':
+            data = data.astype('datetime64[ns]')
+            data[mask] = np.datetime64('NaT')
+            return data
+        return np.ma.MaskedArray(data, mask=mask)
+
+    def _make_typed_converter(self, dtype, fill_value):
+        pandas = self._batch_format == 'pandas'
+
+        def convert(values):
+            if None not in values:
+                data = np.array(values, dtype=dtype)
+                if pandas:
+                    return data
+                return np.ma.MaskedArray(data, mask=np.zeros(len(data), dtype=np.bool_))
+
+            if pandas and dtype == 'bool':
+                # keep None for pandas as booleans cannot hold NaN
+                return self._to_object_array(values)
+            if pandas and dtype == 'int64':
+                # integers beyond 2 ** 53 cannot be held by floats
+                if hasattr(pd, 'Int64Dtype'):
+                    return pd.array(values, dtype='Int64')
+                return self._to_object_array(values)
+
+            mask = np.array([v is None for v in values], dtype=np.bool_)
+            data = np.array([fill_value if v is None else v for v in values], dtype=dtype)
+            if not pandas:
+                return np.ma.MaskedArray(data, mask=mask)
+            data = data.astype('float64')
+            data[mask] = np.nan
+            return data
+        return convert
+
+    @staticmethod
+    def _to_object_array(values):
+        return np.array(values, dtype=object)
+
+    @staticmethod
+    def _nested_to_array(values):
+        # avoid numpy treating lists as another dimension
+        arr = np.empty(len(values), dtype=object)
+        for i, v in enumerate(values):
+            arr[i] = v
+        return arr
+
+    def read(self):
+        """
+        Read next batch, return None if no more records.
+        """
+        if self._finished:
+            return
+        columns, n_records = self._reader._read_columns(self._batch_size, decoders=self._decoders)
+        if n_records < self._batch_size:
+            self._finished = True
+        if n_records == 0:
+            return
+
+        names = [col.name for col in self._columns]
+        arrays = [convert(values) for convert, values in zip(self._converters, columns)]
+        data = compat.OrderedDict(zip(names, arrays))
+        if self._batch_format == 'pandas':
+            return pd.DataFrame(data, columns=names)
+        return data
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        batch = self.read()
+        if batch is None:
+            raise StopIteration
+        return batch
+
+    next = __next__
+
+    def close(self):
+        self._reader.close()
+
+    def __enter__(self):
+        return self
+
     def __exit__(self, *_):
-        if hasattr(self._schema, 'close'):
-            self._schema.close()
+        self.close()
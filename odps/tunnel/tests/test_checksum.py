@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from odps.tunnel.checksum import Checksum
+from odps.tests.core import TestBase
+from odps.compat import unittest
+
+
+class Test(TestBase):
+
+    def _feed(self, checksum):
+        checksum.update_int(1)
+        checksum.update_long(-2 ** 63 + 1)
+        checksum.update_int(2)
+        checksum.update_float(3.1415926)
+        checksum.update_int(3)
+        checksum.update_bool(True)
+        checksum.update_int(4)
+        checksum.update(u'hello world')
+        checksum.update(b'abcdefg', 2, 3)
+        checksum.update(bytearray(b'x' * 300))
+
+    def testBatchChecksum(self):
+        checksum = Checksum()
+        batch_checksum = Checksum(batch=True)
+
+        for _ in range(3):
+            self._feed(checksum)
+            self._feed(batch_checksum)
+            self.assertEqual(checksum.getvalue(), batch_checksum.getvalue())
+
+            checksum.reset()
+            batch_checksum.reset()
+
+        batch_checksum.update_int(10)
+        batch_checksum.reset()
+        self.assertEqual(checksum.getvalue(), batch_checksum.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import random
+import threading
+import time
+
+from odps.tunnel.parallel import split_ranges, ParallelRecordReader, ParallelRecordWriter
+from odps.tunnel.reader import TunnelReader
+from odps.tunnel.errors import TunnelError
+from odps.tests.core import TestBase
+from odps.compat import unittest
+from odps.models import Schema, Record
+
+
+class FakeRangeReader(object):
+    def __init__(self, data, start, count):
+        self._data = data[start: start + count]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __getitem__(self, item):
+        return iter(self._data[item])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        pass
+
+
+class FakeUploadSession(object):
+    def __init__(self, schema, fail_blocks=None):
+        self.schema = schema
+        self._compress_option = None
+        self.uploaded = dict()
+        self.committed = None
+        self._fail_blocks = dict(fail_blocks or dict())
+        self._lock = threading.Lock()
+
+    def put_block(self, block_id, data, compress=False):
+        data = b''.join(data)
+        with self._lock:
+            if self._fail_blocks.get(block_id):
+                self._fail_blocks[block_id] -= 1
+                raise TunnelError('failed to upload block %s' % block_id)
+            self.uploaded[block_id] = data
+
+    def commit(self, blocks):
+        self.committed = blocks
+
+
+class Test(TestBase):
+    def testSplitRanges(self):
+        self.assertEqual(split_ranges(0, 10, 4), [(0, 4), (4, 4), (8, 2)])
+        self.assertEqual(split_ranges(5, 3, 10), [(5, 3)])
+        self.assertEqual(split_ranges(0, 0, 10), [])
+        self.assertEqual(split_ranges(0, 10, 4, step=3), [(0, 3), (3, 3), (6, 3), (9, 1)])
+
+    def testOrderedRead(self):
+        data = list(range(1000))
+
+        def open_reader(start, count):
+            time.sleep(random.random() * 0.01)
+            return FakeRangeReader(data, start, count)
+
+        reader = ParallelRecordReader(open_reader, 10, 900, workers=4, range_size=50)
+        self.assertEqual(len(reader.ranges), 18)
+        self.assertEqual(list(reader), data[10:910])
+
+        reader = ParallelRecordReader(open_reader, 10, 900, workers=4, step=3)
+        self.assertEqual(list(reader), data[10:910:3])
+
+    def testUnorderedRead(self):
+        data = list(range(1000))
+        lock = threading.Lock()
+        opened = []
+
+        def open_reader(start, count):
+            with lock:
+                opened.append(start)
+            time.sleep(random.random() * 0.01)
+            return FakeRangeReader(data, start, count)
+
+        with ParallelRecordReader(open_reader, 0, 1000, workers=3, range_size=10,
+                                  ordered=False, max_pending=2) as reader:
+            consumed = 0
+            for _ in reader:
+                consumed += 1
+                # ranges are opened only when there are free slots
+                self.assertLessEqual(len(opened) * 10, consumed + 2 * 10)
+            self.assertEqual(consumed, 1000)
+
+        reader = ParallelRecordReader(open_reader, 0, 1000, workers=3, range_size=10,
+                                      ordered=False)
+        self.assertEqual(sorted(reader), data)
+
+    def testReadError(self):
+        def open_reader(start, count):
+            if start == 20:
+                raise IOError('failed to read range')
+            return FakeRangeReader(list(range(100)), start, count)
+
+        for ordered in (True, False):
+            reader = ParallelRecordReader(open_reader, 0, 100, workers=2, range_size=10,
+                                          ordered=ordered)
+            self.assertRaises(IOError, list, reader)
+
+    def _read_blocks(self, session):
+        return dict((block_id, [r.values for r in TunnelReader(session.schema, data)])
+                    for block_id, data in session.uploaded.items())
+
+    def testParallelWrite(self):
+        schema = Schema.from_lists(['id', 'name'], ['bigint', 'string'])
+        data = [[i, 'name%s' % i] for i in range(10000)]
+
+        session = FakeUploadSession(schema)
+        with ParallelRecordWriter(session, workers=3, block_size=1500) as writer:
+            writer.write(data[:10])
+            for r in data[10:]:
+                writer.write(Record(schema=schema, values=r))
+        self.assertEqual(writer.count, len(data))
+        self.assertEqual(session.committed, list(range(7)))
+        blocks = self._read_blocks(session)
+        self.assertTrue(all(len(records) <= 1500 for records in blocks.values()))
+        self.assertEqual(sorted(r for records in blocks.values() for r in records), data)
+
+        session = FakeUploadSession(schema, fail_blocks={0: 2, 3: 1})
+        writer = ParallelRecordWriter(session, workers=2, block_size=2500, shard='size',
+                                      retry_times=2)
+        writer.RETRY_INTERVAL = 0
+        writer.write(data)
+        writer.commit()
+        self.assertEqual(session.committed, list(range(4)))
+        blocks = self._read_blocks(session)
+        # blocks are filled with consecutive records
+        self.assertEqual(sorted(blocks.values()), [data[i: i + 2500] for i in range(0, 10000, 2500)])
+
+        session = FakeUploadSession(schema, fail_blocks={1: 2})
+        writer = ParallelRecordWriter(session, workers=2, block_size=2500, retry_times=1)
+        writer.RETRY_INTERVAL = 0
+        writer.write(data)
+        self.assertRaises(TunnelError, writer.commit)
+        self.assertIsNone(session.committed)
+
+        # blocks are streamed when not retried
+        session = FakeUploadSession(schema)
+        with ParallelRecordWriter(session, workers=2, block_size=3000, retry_times=0) as writer:
+            writer.write(data)
+        self.assertEqual(session.committed, list(range(4)))
+        blocks = self._read_blocks(session)
+        self.assertEqual(sorted(r for records in blocks.values() for r in records), data)
+
+        session = FakeUploadSession(schema, fail_blocks={2: 1})
+        writer = ParallelRecordWriter(session, workers=2, block_size=3000, retry_times=0)
+        writer.write(data)
+        self.assertRaises(TunnelError, writer.commit)
+        self.assertIsNone(session.committed)
+
+
+if __name__ == '__main__':
+    unittest.main()
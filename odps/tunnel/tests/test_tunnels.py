@@ -18,20 +18,33 @@
 # under the License.
 
 import math
+import zlib
 from datetime import datetime
 from decimal import Decimal
 import random
 import time
 from multiprocessing.pool import ThreadPool
+try:
+    import numpy as np
+except ImportError:
+    np = None
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
 try:
     from string import letters
 except ImportError:
     from string import ascii_letters as letters
 
 from odps.tests.core import TestBase, to_str
-from odps.compat import unittest, OrderedDict
+from odps.compat import unittest, OrderedDict, BytesIO
 from odps.models import Schema
-from odps import types
+from odps import types, options
+from odps.tunnel.reader import TunnelReader, TunnelBatchReader
+from odps.tunnel.writer import TunnelWriter
+from odps.tunnel.io import CompressOption
 
 
 class Test(TestBase):
@@ -63,6 +76,14 @@ class Test(TestBase):
              ['false'], OrderedDict({'false': 0})),
         ]
 
+    def _write_local(self, schema, data):
+        chunks = []
+        writer = TunnelWriter(schema, lambda it: chunks.extend(it))
+        for r in data:
+            writer.write(types.Record(schema=schema, values=list(r)))
+        writer.close()
+        return b''.join(chunks)
+
     def _create_table(self, table_name):
         fields = ['id', 'int_num', 'float_num', 'dt', 'bool', 'dec', 'arr', 'm']
         types = ['string', 'bigint', 'double', 'datetime', 'boolean', 'decimal',
@@ -83,6 +104,179 @@ class Test(TestBase):
     def _delete_table(self, table_name):
         self.odps.delete_table(table_name)
 
+    def testStreamingReadLocal(self):
+        fields = ['id', 'int_num', 'float_num', 'dt', 'bool', 'dec', 'arr', 'm']
+        tps = ['string', 'bigint', 'double', 'datetime', 'boolean', 'decimal',
+               'array<string>', 'map<string,bigint>']
+        schema = Schema.from_lists(fields, tps)
+        data = self._gen_data() * 10
+
+        raw = self._write_local(schema, data)
+        expected = [tuple(r.values) for r in TunnelReader(schema, raw)]
+        self.assertEqual(len(expected), len(data))
+
+        class ChunkedStream(object):
+            def __init__(self, data, chunk_size):
+                self._buf = BytesIO(data)
+                self._chunk_size = chunk_size
+
+            def read(self, size):
+                return self._buf.read(min(size, self._chunk_size))
+
+        for chunk_size in (1, 7, 4096):
+            reader = TunnelReader(schema, ChunkedStream(raw, chunk_size))
+            self.assertSequenceEqual(expected, [tuple(r.values) for r in reader])
+            self.assertEqual(reader.n_bytes, len(raw))
+
+        records = list(TunnelReader(schema, raw, read_only=True))
+        self.assertTrue(all(isinstance(r, types.ReadOnlyRecord) for r in records))
+        self.assertSequenceEqual(expected, [r.values for r in records])
+        self.assertTrue(all(r._name_indexes is records[0]._name_indexes for r in records))
+
+    @unittest.skipIf(np is None, 'numpy not installed')
+    def testBatchReadLocal(self):
+        fields = ['id', 'int_num', 'float_num', 'dt', 'bool', 'dec', 'arr', 'm']
+        tps = ['string', 'bigint', 'double', 'datetime', 'boolean', 'decimal',
+               'array<string>', 'map<string,bigint>']
+        schema = Schema.from_lists(fields, tps)
+        data = self._gen_data() * 5 + [(None, ) * len(fields)]
+
+        raw = self._write_local(schema, data)
+        reader = TunnelBatchReader(TunnelReader(schema, raw), batch_size=4,
+                                   batch_format='numpy')
+        batches = list(reader)
+        self.assertEqual([4, 4, 4, 4], [len(b['id']) for b in batches])
+        self.assertEqual(reader.count, len(data))
+
+        int_col = np.ma.concatenate([b['int_num'] for b in batches])
+        self.assertEqual(int_col.dtype, np.int64)
+        self.assertEqual(list(int_col.mask), [False] * 15 + [True])
+        self.assertEqual(list(int_col[:3]), [r[1] for r in data[:3]])
+        bool_col = np.ma.concatenate([b['bool'] for b in batches])
+        self.assertEqual(bool_col.dtype, np.bool_)
+        self.assertEqual(list(bool_col[:3]), [r[4] for r in data[:3]])
+        self.assertEqual(batches[0]['id'][2], data[2][0])
+        self.assertEqual(batches[0]['dec'][1], data[1][5])
+        self.assertEqual(batches[0]['arr'][1], data[1][6])
+        self.assertIsNone(batches[-1]['m'][-1])
+        dt_col = np.ma.concatenate([b['dt'] for b in batches])
+        self.assertEqual(dt_col.dtype, np.dtype('datetime64[ms]'))
+        self.assertEqual(list(dt_col.mask), [False] * 15 + [True])
+        self.assertEqual(dt_col[0].astype(datetime), data[0][3])
+
+        if pd is None:
+            return
+        tunnel_reader = TunnelReader(schema, raw)
+        decoders = tunnel_reader._decoders
+        reader = TunnelBatchReader(tunnel_reader, batch_size=10)
+        # decoders of the wrapped reader are kept
+        self.assertIs(tunnel_reader._decoders, decoders)
+        df = pd.concat(list(reader), ignore_index=True)
+        self.assertEqual(list(df.columns), fields)
+        self.assertEqual(len(df), len(data))
+        self.assertEqual(df['float_num'].dtype, np.float64)
+        self.assertTrue(pd.isnull(df['int_num'].iloc[-1]))
+        self.assertEqual(list(df['int_num'].iloc[:3]), [r[1] for r in data[:3]])
+        self.assertEqual(df['dt'].iloc[0], data[0][3])
+        self.assertTrue(pd.isnull(df['dt'].iloc[-1]))
+
+        # large integers with nulls keep their precision
+        schema = Schema.from_lists(['int_num'], ['bigint'])
+        raw = self._write_local(schema, [(2 ** 53 + 1, ), (None, )])
+        df = TunnelBatchReader(TunnelReader(schema, raw)).read()
+        self.assertEqual(df['int_num'].iloc[0], 2 ** 53 + 1)
+        self.assertTrue(pd.isnull(df['int_num'].iloc[1]))
+
+    def testBatchWriteLocal(self):
+        fields = ['id', 'int_num', 'float_num', 'dt', 'bool']
+        schema = Schema.from_lists(fields, ['string', 'bigint', 'double', 'datetime', 'boolean'])
+        data = [r[:5] for r in self._gen_data()] + [(None, ) * len(fields)]
+
+        columns = [list(col) for col in zip(*data)]
+        chunks = []
+        writer = TunnelWriter(schema, lambda it: chunks.extend(it))
+        writer.write_batch(OrderedDict(zip(fields, columns)))
+        if np is not None:
+            arrays = OrderedDict(zip(fields, columns))
+            arrays['int_num'] = np.ma.MaskedArray([r[1] or 0 for r in data],
+                                                  mask=[r[1] is None for r in data])
+            arrays['dt'] = np.array([r[3] or 'NaT' for r in data], dtype='datetime64[ms]')
+            writer.write_batch(arrays)
+        writer.close()
+
+        records = [tuple(r.values) for r in TunnelReader(schema, b''.join(chunks))]
+        self.assertSequenceEqual(records, data * (2 if np is not None else 1))
+
+    def testCompressedWriteLocal(self):
+        fields = ['id', 'int_num', 'float_num', 'dt', 'bool', 'dec', 'arr', 'm']
+        tps = ['string', 'bigint', 'double', 'datetime', 'boolean', 'decimal',
+               'array<string>', 'map<string,bigint>']
+        schema = Schema.from_lists(fields, tps)
+        data = self._gen_data() * 10
+
+        option = CompressOption(CompressOption.CompressAlgorithm.ODPS_ZLIB)
+        chunks = []
+        writer = TunnelWriter(schema, lambda it: chunks.extend(it), compress_option=option)
+        for r in data:
+            writer.write(types.Record(schema=schema, values=list(r)))
+        writer.close()
+
+        # zlib data are decompressed by requests when downloading
+        reader = TunnelReader(schema, zlib.decompress(b''.join(chunks)))
+        self.assertSequenceEqual(data, [tuple(r.values) for r in reader])
+
+    def testUploadBackpressure(self):
+        schema = Schema.from_lists(['id', 'name'], ['bigint', 'string'])
+        records = [types.Record(schema=schema, values=[i, 'name%s' % i]) for i in range(2000)]
+
+        chunks = []
+
+        def failed_upload(data):
+            next(data)
+            raise IOError('upload failed')
+
+        def slow_upload(data):
+            for chunk in data:
+                time.sleep(0.01)
+                chunks.append(chunk)
+
+        old_options = options.chunk_size, options.upload_queue_size
+        options.chunk_size, options.upload_queue_size = 1024, 2
+        try:
+            writer = TunnelWriter(schema, slow_upload)
+            for record in records:
+                writer.write(record)
+                # at most queue size chunks are waiting for uploading
+                self.assertLessEqual(writer._writer.n_chunks - len(chunks), 2 + 1)
+            writer.close()
+            self.assertGreater(writer.producer_blocked_time, 0)
+
+            writer = TunnelWriter(schema, failed_upload)
+            self.assertRaises(IOError, lambda: [writer.write(r) for r in records])
+            self.assertRaises(IOError, writer.close)
+        finally:
+            options.chunk_size, options.upload_queue_size = old_options
+        self.assertTrue(all(len(chunk) <= 1024 + 64 for chunk in chunks))
+        self.assertEqual(len(list(TunnelReader(schema, b''.join(chunks)))), len(records))
+
+    def testWriteLocalWithPartition(self):
+        fields = ['id', 'int_num', 'float_num', 'dt', 'bool', 'dec', 'arr', 'm']
+        tps = ['string', 'bigint', 'double', 'datetime', 'boolean', 'decimal',
+               'array<string>', 'map<string,bigint>']
+        schema = Schema.from_lists(fields, tps)
+        partition_schema = Schema.from_lists(fields, tps, ['ds'], ['string'])
+        data = self._gen_data()
+
+        raw = self._write_local(schema, data)
+        partition_raw = self._write_local(partition_schema,
+                                          [list(r) + ['test'] for r in data])
+        self.assertEqual(raw, partition_raw)
+
+        records = [tuple(r.values) for r in TunnelReader(partition_schema, raw)]
+        self.assertSequenceEqual([tuple(r[:2]) for r in data],
+                                 [r[:2] for r in records])
+        self.assertTrue(all(r[-1] is None for r in records))
+
     def testUploadAndDownloadByRawTunnel(self):
         test_table_name = 'pyodps_test_raw_tunnel'
         self._create_table(test_table_name)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import random
+
+from odps.tunnel import wireformat as wf
+from odps.tunnel.io import ProtobufWriter, ProtobufReader
+from odps.tests.core import TestBase
+from odps.compat import unittest
+
+
+class Test(TestBase):
+
+    def testVarint(self):
+        def encode(val):
+            buf = bytearray()
+            wf.encode_varint(buf, val)
+            return bytes(buf)
+
+        self.assertEqual(encode(0), b'\x00')
+        self.assertEqual(encode(1), b'\x01')
+        self.assertEqual(encode(300), b'\xac\x02')
+        self.assertEqual(encode(-1), b'\xff' * 9 + b'\x01')
+
+        self.assertEqual(wf.decode_varint(bytearray(b'\xac\x02'), 0), (300, 2))
+        self.assertEqual(wf.decode_signed_varint32(bytearray(encode(-1)), 0), (-1, 10))
+
+        self.assertRaises(IOError, lambda: wf.decode_varint(bytearray(b'\xff' * 11), 0))
+
+    def testZigzag(self):
+        self.assertEqual(wf.zigzag_encode(0), 0)
+        self.assertEqual(wf.zigzag_encode(-1), 1)
+        self.assertEqual(wf.zigzag_encode(1), 2)
+        self.assertEqual(wf.zigzag_encode(-2 ** 63), 2 ** 64 - 1)
+
+        for val in (0, -1, 1, 2 ** 63 - 1, -2 ** 63):
+            self.assertEqual(wf.zigzag_decode(wf.zigzag_encode(val)), val)
+
+    def testTagBytes(self):
+        self.assertEqual(wf.tag_bytes(1, wf.WIRETYPE_VARINT), b'\x08')
+        self.assertEqual(wf.tag_bytes(2, wf.WIRETYPE_LENGTH_DELIMITED), b'\x12')
+        self.assertEqual(wf.tag_bytes(33553408, wf.WIRETYPE_VARINT), b'\x80\xc0\xff\x7f')
+
+    def testWriteAndRead(self):
+        longs = [random.randint(-2 ** 63, 2 ** 63 - 1) for _ in range(100)]
+        doubles = [random.uniform(-2 ** 32, 2 ** 32) for _ in range(100)]
+        strings = [b'', b'a', b'b' * 300]
+
+        writer = ProtobufWriter(buffer_size=16)
+        for i, (l, d) in enumerate(zip(longs, doubles)):
+            writer.write_long(i + 1, l)
+            writer.write_double(i + 1, d)
+            writer.write_bool(i + 1, i % 2 == 0)
+        for s in strings:
+            writer.write_string(1, s)
+        writer.write_uint32(33553408, 2 ** 32 - 1)
+        writer.close()
+
+        reader = ProtobufReader(b''.join(writer))
+        for i, (l, d) in enumerate(zip(longs, doubles)):
+            self.assertEqual(reader.read_field_num(), i + 1)
+            self.assertEqual(reader.read_long(), l)
+            self.assertEqual(reader.read_field_num(), i + 1)
+            self.assertEqual(reader.read_double(), d)
+            self.assertEqual(reader.read_field_num(), i + 1)
+            self.assertEqual(reader.read_bool(), i % 2 == 0)
+        for s in strings:
+            self.assertEqual(reader.read_field_num(), 1)
+            self.assertEqual(bytes(reader.read_string()), s)
+        self.assertEqual(reader.read_field_num(), 33553408)
+        self.assertEqual(reader.read_uint32(), 2 ** 32 - 1)
+        self.assertTrue(reader.at_end())
+
+if __name__ == '__main__':
+    unittest.main()
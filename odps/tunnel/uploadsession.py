@@ -104,6 +104,18 @@ class UploadSession(serializers.JSONSerializableModel):
         BlockId是由用户选取的0~19999之间的数值，标识本次上传数据块
         """
         compress_option = self._compress_option or CompressOption()
+        option = compress_option if compress else None
+        chunk_upload = lambda data: self.put_block(block_id, data, compress=compress)
+        writer = TunnelWriter(self.schema, chunk_upload, compress_option=option)
+
+        return writer
+
+    def put_block(self, block_id, data, compress=False):
+        """
+        Upload encoded data of a block, the data is an iterable of bytes
+        produced by :class:`odps.tunnel.writer.TunnelWriter`.
+        """
+        compress_option = self._compress_option or CompressOption()
 
         params = {}
         headers = {'Transfer-Encoding': 'chunked',
@@ -125,13 +137,8 @@ class UploadSession(serializers.JSONSerializableModel):
             params['partition'] = self._partition_spec
 
         url = self._table.resource()
-        chunk_upload = lambda data: self._client.put(
-            url, data=data, params=params, headers=headers)
-        option = compress_option if compress else None
-        writer = TunnelWriter(self.schema, chunk_upload, compress_option=option)
+        return self._client.put(url, data=data, params=params, headers=headers)
 
-        return writer
-    
     def get_block_list(self):
         self.reload()
         return self.blocks
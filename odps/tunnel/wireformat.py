@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Pure-Python codec for the subset of protobuf wire format used by tunnel.
+
+Encoders append to a ``bytearray`` and decoders read from any buffer whose
+items are integers (``bytearray``, or ``bytes`` and ``memoryview`` in python 3),
+returning the decoded value together with the new position.
+"""
+
+import struct
+
+WIRETYPE_VARINT = 0
+WIRETYPE_FIXED64 = 1
+WIRETYPE_LENGTH_DELIMITED = 2
+WIRETYPE_START_GROUP = 3
+WIRETYPE_END_GROUP = 4
+WIRETYPE_FIXED32 = 5
+
+TAG_TYPE_BITS = 3
+TAG_TYPE_MASK = (1 << TAG_TYPE_BITS) - 1
+
+_UINT32_MASK = (1 << 32) - 1
+_UINT64_MASK = (1 << 64) - 1
+
+_DOUBLE = struct.Struct('<d')
+
+_tag_cache = dict()
+
+
+def encode_varint(buf, value):
+    if 0 <= value < 0x80:
+        buf.append(value)
+        return
+    if value < 0:
+        value &= _UINT64_MASK
+
+    bits = value & 0x7f
+    value >>= 7
+    while value:
+        buf.append(0x80 | bits)
+        bits = value & 0x7f
+        value >>= 7
+    buf.append(bits)
+
+
+def zigzag_encode(value):
+    return (value << 1) ^ (value >> 63)
+
+
+def zigzag_decode(value):
+    return (value >> 1) ^ -(value & 1)
+
+
+def tag_bytes(field_num, wire_type):
+    """
+    Encoded tag of a field, the result is cached since the number of
+    distinct tags in a tunnel stream is small.
+    """
+    key = (field_num << TAG_TYPE_BITS) | wire_type
+    try:
+        return _tag_cache[key]
+    except KeyError:
+        buf = bytearray()
+        encode_varint(buf, key)
+        tag = _tag_cache[key] = bytes(buf)
+        return tag
+
+
+def encode_double(buf, value):
+    buf.extend(_DOUBLE.pack(value))
+
+
+def encode_length_delimited(buf, value):
+    encode_varint(buf, len(value))
+    buf.extend(value)
+
+
+def decode_varint(data, pos):
+    b = data[pos]
+    if b < 0x80:
+        return b, pos + 1
+
+    result = b & 0x7f
+    shift = 7
+    pos += 1
+    while True:
+        b = data[pos]
+        result |= (b & 0x7f) << shift
+        pos += 1
+        if not b & 0x80:
+            return result, pos
+        shift += 7
+        if shift >= 64:
+            raise IOError('Too many bytes when decoding varint.')
+
+
+def decode_signed_varint32(data, pos):
+    value, pos = decode_varint(data, pos)
+    value &= _UINT32_MASK
+    if value > 0x7fffffff:
+        value -= 1 << 32
+    return value, pos
+
+
+def decode_uint32(data, pos):
+    value, pos = decode_varint(data, pos)
+    return value & _UINT32_MASK, pos
+
+
+def decode_sint32(data, pos):
+    value, pos = decode_varint(data, pos)
+    return zigzag_decode(value & _UINT32_MASK), pos
+
+
+def decode_sint64(data, pos):
+    value, pos = decode_varint(data, pos)
+    return zigzag_decode(value & _UINT64_MASK), pos
+
+
+def decode_double(data, pos):
+    return _DOUBLE.unpack_from(data, pos)[0], pos + 8
+
+
+def decode_length_delimited(data, pos):
+    size, pos = decode_varint(data, pos)
+    end = pos + size
+    if end > len(data):
+        raise IOError('Truncated length delimited field.')
+    return data[pos: end], end
+
+
+def unpack_tag(tag):
+    return tag >> TAG_TYPE_BITS, tag & TAG_TYPE_MASK
@@ -23,6 +23,7 @@ import six
 
 from .. import utils, types, compat, options
 from . import io
+from . import wireformat as wf
 from .checksum import Checksum
 from .wireconstants import ProtoWireConstants
 
@@ -42,14 +43,20 @@ class TunnelWriter(object):
         self._do_upload = do_upload
 
         self._writer = io.ProtobufWriter(compress_option=self._compress_option,
-                                         buffer_size=options.chunk_size, encoding=encoding)
+                                         buffer_size=options.chunk_size, encoding=encoding,
+                                         queue_size=options.upload_queue_size)
 
-        self._crc = Checksum()
+        self._crc = Checksum(batch=True)
         self._crccrc = Checksum()
         self._curr_cursor = 0
 
+        self._n_columns = len(self._columns)
+        self._encoders = self._compile_encoders()
+        self._batch_encoders = None
+
         self._upload_started = False
         self._upload_thread = None
+        self._upload_error = None
 
     def _start_upload(self):
         if self._upload_started:
@@ -60,7 +67,14 @@ class TunnelWriter(object):
                 yield data
 
         def do_upload():
-            self._do_upload(gen_data())
+            try:
+                self._do_upload(gen_data())
+            except Exception as e:
+                self._upload_error = e
+            finally:
+                # drain the rest chunks, or the writer would block on the full queue
+                for _ in self._writer:
+                    pass
 
         self._upload_thread = threading.Thread(target=do_upload)
         self._upload_thread.setDaemon(True)
@@ -68,100 +82,228 @@ class TunnelWriter(object):
 
         self._upload_started = True
 
-    def _write_bool(self, pb_index, data):
-        self._crc.update_bool(data)
-        self._writer.write_bool(pb_index, data)
-
-    def _write_long(self, pb_index, data):
-        self._crc.update_long(data)
-        self._writer.write_long(pb_index, data)
-
-    def _write_double(self, pb_index, data):
-        self._crc.update_float(data)
-        self._writer.write_double(pb_index, data)
+    def _compile_primitive_encoder(self, data_type):
+        """
+        Compile the encoder of a value without tag, used for elements of arrays and maps.
+        """
+        out = self._writer.buffer
+        crc = self._crc.buffer
+        encoding = self._encoding
+        encode_varint = wf.encode_varint
+        zigzag_encode = wf.zigzag_encode
+        pack_long = Checksum._LONG.pack
+        pack_double = Checksum._DOUBLE.pack
 
-    def _write_string(self, pb_index, data):
-        if isinstance(data, six.text_type):
-            data = data.encode(self._encoding)
-
-        self._crc.update(data)
-        self._writer.write_string(pb_index, data)
-
-    def _write_primitive(self, data, data_type):
         if data_type == types.string:
-            if isinstance(data, six.text_type):
-                data = data.encode(self._encoding)
-
-            self._writer.write_raw_varint32(len(data))
-            self._writer.write_raw_bytes(data)
-            self._crc.update(data)
+            def encode(val):
+                if isinstance(val, six.text_type):
+                    val = val.encode(encoding)
+                encode_varint(out, len(val))
+                out.extend(val)
+                crc.extend(val)
         elif data_type == types.bigint:
-            self._writer.write_long_no_tag(data)
-            self._crc.update_long(data)
+            def encode(val):
+                encode_varint(out, zigzag_encode(val))
+                crc.extend(pack_long(val))
         elif data_type == types.double:
-            self._writer.write_double_no_tag(data)
-            self._crc.update_float(data)
+            def encode(val):
+                packed = pack_double(val)
+                out.extend(packed)
+                crc.extend(packed)
         elif data_type == types.boolean:
-            self._writer.write_bool_no_tag(data)
-            self._crc.update_bool(data)
+            def encode(val):
+                b = 1 if val else 0
+                out.append(b)
+                crc.append(b)
         else:
             raise IOError('Not a primitive type in array. type: %s' % data_type)
-
-    def _write_array(self, pb_index, data, data_type):
-        self._writer.write_raw_varint32(len(data))
-        for value in data:
-            if value is None:
-                self._writer.write_bool_no_tag(True)
+        return encode
+
+    def _compile_array_encoder(self, data_type):
+        out = self._writer.buffer
+        encode_varint = wf.encode_varint
+        encode_element = self._compile_primitive_encoder(data_type)
+
+        def encode(val):
+            encode_varint(out, len(val))
+            for element in val:
+                if element is None:
+                    out.append(1)
+                else:
+                    out.append(0)
+                    encode_element(element)
+        return encode
+
+    def _compile_encoder(self, pb_index, data_type, raw_datetime=False):
+        """
+        Compile the encoder of a column, which writes the tag and the value
+        and updates the checksum of the record. When ``raw_datetime`` is True,
+        datetime values are expected to be milliseconds since epoch.
+        """
+        out = self._writer.buffer
+        crc = self._crc.buffer
+        encoding = self._encoding
+        encode_varint = wf.encode_varint
+        zigzag_encode = wf.zigzag_encode
+        to_milliseconds = utils.to_milliseconds
+        pack_long = Checksum._LONG.pack
+        pack_double = Checksum._DOUBLE.pack
+
+        index_bytes = Checksum._INT.pack(pb_index)
+        varint_tag = wf.tag_bytes(pb_index, wf.WIRETYPE_VARINT)
+        fixed64_tag = wf.tag_bytes(pb_index, wf.WIRETYPE_FIXED64)
+        delimited_tag = wf.tag_bytes(pb_index, wf.WIRETYPE_LENGTH_DELIMITED)
+
+        def encode_string(val):
+            if isinstance(val, six.text_type):
+                val = val.encode(encoding)
+            crc.extend(index_bytes)
+            crc.extend(val)
+            out.extend(delimited_tag)
+            encode_varint(out, len(val))
+            out.extend(val)
+
+        if data_type == types.boolean:
+            def encode(val):
+                b = 1 if val else 0
+                crc.extend(index_bytes)
+                crc.append(b)
+                out.extend(varint_tag)
+                out.append(b)
+        elif data_type == types.datetime and raw_datetime:
+            def encode(val):
+                crc.extend(index_bytes)
+                crc.extend(pack_long(val))
+                out.extend(varint_tag)
+                encode_varint(out, zigzag_encode(val))
+        elif data_type == types.datetime:
+            def encode(val):
+                val = to_milliseconds(val)
+                crc.extend(index_bytes)
+                crc.extend(pack_long(val))
+                out.extend(varint_tag)
+                encode_varint(out, zigzag_encode(val))
+        elif data_type == types.string:
+            encode = encode_string
+        elif data_type == types.double:
+            def encode(val):
+                packed = pack_double(val)
+                crc.extend(index_bytes)
+                crc.extend(packed)
+                out.extend(fixed64_tag)
+                out.extend(packed)
+        elif data_type == types.bigint:
+            def encode(val):
+                crc.extend(index_bytes)
+                crc.extend(pack_long(val))
+                out.extend(varint_tag)
+                encode_varint(out, zigzag_encode(val))
+        elif data_type == types.decimal:
+            def encode(val):
+                encode_string(str(val))
+        elif isinstance(data_type, types.Array):
+            encode_array = self._compile_array_encoder(data_type.value_type)
+
+            def encode(val):
+                crc.extend(index_bytes)
+                out.extend(delimited_tag)
+                encode_array(val)
+        elif isinstance(data_type, types.Map):
+            encode_keys = self._compile_array_encoder(data_type.key_type)
+            encode_values = self._compile_array_encoder(data_type.value_type)
+
+            def encode(val):
+                crc.extend(index_bytes)
+                out.extend(delimited_tag)
+                encode_keys(compat.lkeys(val))
+                encode_values(compat.lvalues(val))
+        else:
+            raise IOError('Invalid data type: %s' % data_type)
+        return encode
+
+    def _compile_encoders(self, raw_datetime=False):
+        encoders = []
+        for i, column in enumerate(self._columns):
+            if self._schema.is_partition(column):
+                encoders.append(None)
             else:
-                self._writer.write_bool_no_tag(False)
-                self._write_primitive(value, data_type)
-
-    def _write_map(self, pb_index, data, key_type, value_type):
-        self._write_array(pb_index, compat.lkeys(data), key_type)
-        self._write_array(pb_index, compat.lvalues(data), value_type)
+                encoders.append(self._compile_encoder(i + 1, column.type,
+                                                      raw_datetime=raw_datetime))
+        return encoders
 
     def write(self, record):
         self._start_upload()
+        self._check_upload_error()
+
+        values = record.values if isinstance(record, types.Record) else record
+        self._write_values(values, self._encoders)
+
+    @staticmethod
+    def _to_batch_column(data_type, values):
+        if hasattr(values, 'values') and not callable(values.values):
+            # pandas Series
+            values = values.values
+        if data_type == types.datetime:
+            return utils.datetime_column_to_milliseconds(values)
+
+        mask = None
+        if hasattr(values, 'mask') and hasattr(values, 'filled'):
+            # NumPy masked array
+            mask, values = values.mask, values.data
+        is_float = getattr(getattr(values, 'dtype', None), 'kind', None) == 'f'
+        if hasattr(values, 'tolist'):
+            values = values.tolist()
+        if mask is not None and mask is not False and mask.any():
+            values = [None if m else v for v, m in zip(values, mask.tolist())]
+        elif data_type != types.double:
+            # NaN stands for null in pandas
+            values = [None if isinstance(v, float) and v != v else v for v in values]
+        if is_float and data_type == types.bigint:
+            # integers with nulls are stored as floats by pandas
+            values = [v if v is None else int(v) for v in values]
+        return values
+
+    def write_batch(self, data):
+        """
+        Write a batch of records stored by columns, which can be a pandas
+        DataFrame or a dict of column name to NumPy array or list. Datetime
+        columns are converted from ``datetime64`` or datetime objects for
+        the whole column at once.
+
+        :param data: columns of records
+        """
+        self._start_upload()
+        self._check_upload_error()
 
-        n_record_fields = len(record)
-        n_columns = len(self._columns)
+        if self._batch_encoders is None:
+            self._batch_encoders = self._compile_encoders(raw_datetime=True)
 
-        if n_record_fields > n_columns:
-            raise IOError('record fields count is more than schema.')
+        columns = [c for c in self._columns if not self._schema.is_partition(c)]
+        arrays = []
+        for column in columns:
+            try:
+                values = data[column.name]
+            except KeyError:
+                raise IOError('Column %s not found in the batch' % column.name)
+            arrays.append(self._to_batch_column(column.type, values))
 
-        for i in range(min(n_record_fields, n_columns)):
-            if self._schema.is_partition(self._columns[i]):
-                continue
+        for values in zip(*arrays):
+            self._write_values(values, self._batch_encoders)
+
+    def _write_values(self, values, encoders):
+        n_record_fields = len(values)
 
-            val = record[i]
+        if n_record_fields > self._n_columns:
+            raise IOError('record fields count is more than schema.')
+
+        for i in range(n_record_fields):
+            val = values[i]
             if val is None:
                 continue
 
-            pb_index = i + 1
-            self._crc.update_int(pb_index)
-
-            data_type = self._columns[i].type
-            if data_type == types.boolean:
-                self._write_bool(pb_index, val)
-            elif data_type == types.datetime:
-                val = utils.to_milliseconds(val)
-                self._write_long(pb_index, val)
-            elif data_type == types.string:
-                self._write_string(pb_index, val)
-            elif data_type == types.double:
-                self._write_double(pb_index, val)
-            elif data_type == types.bigint:
-                self._write_long(pb_index, val)
-            elif data_type == types.decimal:
-                self._write_string(pb_index, str(val))
-            elif isinstance(data_type, types.Array):
-                self._writer.write_length_delimited_tag(pb_index)
-                self._write_array(pb_index, val, data_type.value_type)
-            elif isinstance(data_type, types.Map):
-                self._writer.write_length_delimited_tag(pb_index)
-                self._write_map(pb_index, val, data_type.key_type, data_type.value_type)
-            else:
-                raise IOError('Invalid data type: %s' % data_type)
+            encode = encoders[i]
+            if encode is not None:
+                encode(val)
 
         checksum = utils.long_to_int(self._crc.getvalue())
         self._writer.write_uint32(
@@ -185,11 +327,30 @@ class TunnelWriter(object):
             self._upload_thread.join()
 
         self._curr_cursor = 0
+        self._check_upload_error()
+
+    def _check_upload_error(self):
+        if self._upload_error is not None:
+            raise self._upload_error
 
     @property
     def n_bytes(self):
         return self._writer.n_bytes
 
+    @property
+    def producer_blocked_time(self):
+        """
+        Seconds that writing records waited for uploading.
+        """
+        return self._writer.producer_blocked_time
+
+    @property
+    def consumer_blocked_time(self):
+        """
+        Seconds that uploading waited for writing records.
+        """
+        return self._writer.consumer_blocked_time
+
     def get_total_bytes(self):
         return self.n_bytes
     
@@ -164,6 +164,9 @@ class OdpsSchema(Schema):
         return super(OdpsSchema, self).__len__() + len(self._partition_schema)
 
     def __setattr__(self, key, value):
+        if key in ('_columns', '_partitions'):
+            # invalidate the cached column indexes
+            object.__setattr__(self, '_column_indexes', None)
         if key == '_columns' and value and not getattr(self, 'names', None) and \
                 not getattr(self, 'types', None):
             names = [c.name for c in value]
@@ -254,6 +257,18 @@ class OdpsSchema(Schema):
         partitions = self._partitions or []
         return self._columns + partitions
 
+    def get_column_indexes(self):
+        """
+        Get the mapping of names of columns and partitions to their positions.
+        The mapping is cached until the columns or partitions change and shared
+        by the records of this schema, thus it must not be modified.
+        """
+        indexes = getattr(self, '_column_indexes', None)
+        if indexes is None:
+            indexes = build_column_indexes(self.columns)
+            object.__setattr__(self, '_column_indexes', indexes)
+        return indexes
+
     def get_columns(self):
         return self._columns
 
@@ -328,6 +343,13 @@ class OdpsSchema(Schema):
                               partition_types=partitions_types)
 
 
+def build_column_indexes(columns):
+    """
+    Build the mapping of column names to positions of a list of columns.
+    """
+    return dict((col.name, i) for i, col in enumerate(columns))
+
+
 class Record(object):
     """
     A record generally means the data of a single line in a table.
@@ -356,18 +378,39 @@ class Record(object):
     True
     """
 
-    # set __slots__ to save memory in the situation that records' size may be quite large
+    # set __slots__ to save memory in the situation that records' size may be quite large,
+    # the index of column names is shared by records with the same columns
     __slots__ = '_values', '_columns', '_name_indexes'
 
     def __init__(self, columns=None, schema=None, values=None):
-        self._columns = columns or schema.columns
-        if self._columns is None:
+        if columns:
+            self._columns = columns
+            self._name_indexes = build_column_indexes(columns)
+        elif schema is not None:
+            self._columns = schema.columns
+            self._name_indexes = schema.get_column_indexes()
+        else:
             raise ValueError('Either columns or schema should not be provided')
 
         self._values = [None, ] * len(self._columns)
         if values is not None:
             self._sets(values)
-        self._name_indexes = dict((col.name, i) for i, col in enumerate(self._columns))
+
+    @classmethod
+    def _from_decoded(cls, columns, values, name_indexes=None):
+        """
+        Create a record from values which are already of the types of columns,
+        e.g. decoded from tunnel, thus the values are not validated.
+        The list of values is taken by the record without copying, and so is
+        ``name_indexes``, which readers build once and share between records.
+        """
+        record = object.__new__(cls)
+        _set_record_columns(record, columns)
+        if name_indexes is None:
+            name_indexes = build_column_indexes(columns)
+        _set_record_name_indexes(record, name_indexes)
+        _set_record_values(record, values)
+        return record
 
     def _exclude_partition_columns(self):
         return [col for col in self._columns if not isinstance(col, Partition)]
@@ -400,20 +443,22 @@ class Record(object):
     def __setitem__(self, key, value):
         if isinstance(key, six.string_types):
             setattr(self, key, value)
-        self._set(key, value)
+        else:
+            self._set(key, value)
 
     def __getattr__(self, item):
-        if item == '_name_indexes':
-            return object.__getattribute__(self, item)
-        if hasattr(self, '_name_indexes') and item in self._name_indexes:
-            i = self._name_indexes[item]
-            return self._values[i]
+        if item not in Record.__slots__:
+            i = self._name_indexes.get(item)
+            if i is not None:
+                return self._values[i]
         return object.__getattribute__(self, item)
 
     def __setattr__(self, key, value):
-        if hasattr(self, '_name_indexes') and key in self._name_indexes:
-            i = self._name_indexes[key]
-            self._set(i, value)
+        if key not in Record.__slots__:
+            i = self._name_indexes.get(key)
+            if i is not None:
+                self._set(i, value)
+                return
         object.__setattr__(self, key, value)
 
     def get_by_name(self, name):
@@ -468,6 +513,46 @@ class Record(object):
         return self.n_columns
 
 
+# setters of slots, used to create records without calling __setattr__
+_set_record_columns = Record._columns.__set__
+_set_record_name_indexes = Record._name_indexes.__set__
+_set_record_values = Record._values.__set__
+
+
+class ReadOnlyRecord(Record):
+    """
+    A compact record whose values cannot be changed, the values are stored
+    in a tuple. Reading APIs are the same as :class:`Record`.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, columns=None, schema=None, values=None):
+        super(ReadOnlyRecord, self).__init__(columns=columns, schema=schema, values=values)
+        object.__setattr__(self, '_values', tuple(self._values))
+
+    @classmethod
+    def _from_decoded(cls, columns, values, name_indexes=None):
+        return super(ReadOnlyRecord, cls)._from_decoded(columns, tuple(values),
+                                                        name_indexes=name_indexes)
+
+    def _set(self, i, value):
+        if isinstance(self._values, tuple):
+            raise TypeError('Cannot set values of a read-only record')
+        super(ReadOnlyRecord, self)._set(i, value)
+
+    set = _set
+
+    def __eq__(self, other):
+        if not isinstance(other, Record):
+            return False
+
+        return self._columns == other._columns and list(self._values) == list(other._values)
+
+    def __hash__(self):
+        return super(ReadOnlyRecord, self).__hash__()
+
+
 class DataType(object):
     """
     Abstract data type
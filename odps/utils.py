@@ -24,7 +24,8 @@ from hashlib import sha1, md5
 from base64 import b64encode
 import struct
 import string
-from datetime import datetime
+from datetime import datetime, timedelta
+import calendar
 import re
 import xml.dom.minidom
 import traceback
@@ -179,18 +180,217 @@ def gen_rfc822(dt=None, localtime=False, usegmt=False):
     return formatdate(t, localtime=localtime, usegmt=usegmt)
 
 
+_EPOCH = datetime(1970, 1, 1)
+# offsets of local time are cached by hours of timestamps
+_UTC_OFFSET_BUCKET = 3600
+_UTC_OFFSET_CACHE_SIZE = 100000
+# offsets of local time to UTC are always within 15 hours
+_MAX_UTC_OFFSET_BUCKETS = 15
+_utc_offset_cache = dict()
+_local_utc_offsets_cache = dict()
+
+
+def _calc_utc_offset(seconds):
+    return calendar.timegm(time.localtime(seconds)) - seconds
+
+
+def _get_bucket_utc_offset(bucket):
+    """
+    Offset of local time in seconds inside the bucket of UTC timestamps,
+    None if the offset changes inside the bucket.
+    """
+    try:
+        return _utc_offset_cache[bucket]
+    except KeyError:
+        start = bucket * _UTC_OFFSET_BUCKET
+        offset = _calc_utc_offset(start)
+        if offset != _calc_utc_offset(start + _UTC_OFFSET_BUCKET - 1):
+            offset = None
+        if len(_utc_offset_cache) >= _UTC_OFFSET_CACHE_SIZE:
+            _utc_offset_cache.clear()
+        _utc_offset_cache[bucket] = offset
+        return offset
+
+
+def _get_local_utc_offsets(bucket):
+    """
+    Distinct offsets of local time in seconds within 15 hours around the bucket.
+    A local time in the bucket, treated as UTC, can only map to UTC timestamps
+    with one of these offsets.
+    """
+    try:
+        return _local_utc_offsets_cache[bucket]
+    except KeyError:
+        offsets = set()
+        for b in range(bucket - _MAX_UTC_OFFSET_BUCKETS, bucket + _MAX_UTC_OFFSET_BUCKETS + 1):
+            offset = _get_bucket_utc_offset(b)
+            if offset is None:
+                start = b * _UTC_OFFSET_BUCKET
+                offsets.add(_calc_utc_offset(start))
+                offsets.add(_calc_utc_offset(start + _UTC_OFFSET_BUCKET - 1))
+            else:
+                offsets.add(offset)
+        offsets = tuple(sorted(offsets))
+        if len(_local_utc_offsets_cache) >= _UTC_OFFSET_CACHE_SIZE:
+            _local_utc_offsets_cache.clear()
+        _local_utc_offsets_cache[bucket] = offsets
+        return offsets
+
+
+def _get_stable_utc_offset(bucket):
+    """
+    Offset of local time in seconds if it stays the same within 15 hours around
+    the bucket, None otherwise. When the offset of a local time is stable,
+    the local time maps to exactly one UTC timestamp with the offset.
+    """
+    offsets = _get_local_utc_offsets(bucket)
+    return offsets[0] if len(offsets) == 1 else None
+
+
+def get_utc_offset(seconds):
+    """
+    Get the offset in seconds of local time to UTC at the given UTC timestamp.
+    """
+    offset = _get_bucket_utc_offset(seconds // _UTC_OFFSET_BUCKET)
+    if offset is None:
+        return _calc_utc_offset(seconds)
+    return offset
+
+
+def clear_utc_offset_cache():
+    """
+    Clear cached offsets of local time, call it after the time zone is changed.
+    """
+    _utc_offset_cache.clear()
+    _local_utc_offsets_cache.clear()
+
+
+def _to_local_seconds(dt):
+    delta = dt - _EPOCH
+    return delta.days * 86400 + delta.seconds
+
+
+def _resolve_timestamp(dt, local_seconds, offsets):
+    """
+    Timestamp of a local time near a transition of the offset. A local time
+    repeated after the transition is resolved by ``dt.fold`` (the earlier one
+    by default), while a skipped local time falls back to :func:`time.mktime`.
+    """
+    candidates = [local_seconds - o for o in reversed(offsets)
+                  if _calc_utc_offset(local_seconds - o) == o]
+    if candidates:
+        return candidates[-1] if getattr(dt, 'fold', 0) else candidates[0]
+    return int(time.mktime(dt.timetuple()))
+
+
 def to_timestamp(dt):
+    if dt.tzinfo is None:
+        local_seconds = _to_local_seconds(dt)
+        offsets = _get_local_utc_offsets(local_seconds // _UTC_OFFSET_BUCKET)
+        if len(offsets) == 1:
+            return local_seconds - offsets[0]
+        return _resolve_timestamp(dt, local_seconds, offsets)
     return int(time.mktime(dt.timetuple()))
 
 
 def to_milliseconds(dt):
-    return int((time.mktime(dt.timetuple()) + dt.microsecond/1000000.0) * 1000)
+    if dt.tzinfo is None:
+        local_seconds = _to_local_seconds(dt)
+        bucket = local_seconds // _UTC_OFFSET_BUCKET
+        offsets = _local_utc_offsets_cache.get(bucket) or _get_local_utc_offsets(bucket)
+        if len(offsets) == 1:
+            return (local_seconds - offsets[0]) * 1000 + dt.microsecond // 1000
+        return _resolve_timestamp(dt, local_seconds, offsets) * 1000 + dt.microsecond // 1000
+    return int(time.mktime(dt.timetuple())) * 1000 + dt.microsecond // 1000
 
 
 def to_datetime(milliseconds):
-    seconds = int(milliseconds / 1000)
-    microseconds = milliseconds % 1000 * 1000
-    return datetime.fromtimestamp(seconds).replace(microsecond=microseconds)
+    seconds, milliseconds = divmod(int(milliseconds), 1000)
+    offset = _utc_offset_cache.get(seconds // _UTC_OFFSET_BUCKET)
+    if offset is None:
+        offset = get_utc_offset(seconds)
+    return _EPOCH + timedelta(0, seconds + offset, 0, milliseconds)
+
+
+def _lookup_offsets(buckets, get_offset):
+    """
+    Look up offsets of a NumPy array of buckets, return offsets and a mask
+    marking buckets whose offsets are None.
+    """
+    import numpy as np
+
+    if len(buckets) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.bool_)
+
+    lo, hi = int(buckets.min()), int(buckets.max())
+    if hi - lo <= 2 * len(buckets) + 1024:
+        # a dense table of offsets, buckets are used as indexes directly
+        keys = six.moves.range(lo, hi + 1)
+        indexes = buckets - lo
+    else:
+        keys, indexes = np.unique(buckets, return_inverse=True)
+        keys = [int(k) for k in keys]
+    offsets = [get_offset(k) for k in keys]
+
+    table = np.array([o or 0 for o in offsets], dtype=np.int64)
+    missing = np.array([o is None for o in offsets], dtype=np.bool_)
+    return table[indexes], missing[indexes]
+
+
+def to_datetime64(milliseconds):
+    """
+    Convert an array of milliseconds since epoch into a NumPy array of
+    ``datetime64[ms]`` in local time.
+    """
+    import numpy as np
+
+    milliseconds = np.asarray(milliseconds, dtype=np.int64)
+    seconds = np.floor_divide(milliseconds, 1000)
+    offsets, varying = _lookup_offsets(np.floor_divide(seconds, _UTC_OFFSET_BUCKET),
+                                       _get_bucket_utc_offset)
+    if varying.any():
+        offsets[varying] = [_calc_utc_offset(int(s)) for s in seconds[varying]]
+    return (milliseconds + offsets * 1000).astype('datetime64[ms]')
+
+
+def datetime64_to_milliseconds(values):
+    """
+    Convert an array of ``datetime64`` in local time into a NumPy array of
+    milliseconds since epoch. NaT values are not allowed.
+    """
+    import numpy as np
+
+    local = np.asarray(values).astype('datetime64[ms]').astype(np.int64)
+    offsets, unstable = _lookup_offsets(
+        np.floor_divide(local, _UTC_OFFSET_BUCKET * 1000), _get_stable_utc_offset)
+    result = local - offsets * 1000
+    if unstable.any():
+        # local times near transitions of the offset
+        result[unstable] = [to_milliseconds(dt) for dt in
+                            local[unstable].astype('datetime64[ms]').astype(datetime)]
+    return result
+
+
+def datetime_column_to_milliseconds(values):
+    """
+    Convert a column of datetime values into a list of milliseconds since
+    epoch with None as null. The column can be a NumPy array of ``datetime64``,
+    which is converted at once, or a sequence of datetime objects.
+    """
+    if getattr(getattr(values, 'dtype', None), 'kind', None) != 'M':
+        return [None if v is None else to_milliseconds(v) for v in values]
+
+    import numpy as np
+
+    mask = np.isnat(np.asarray(values))
+    if np.ma.isMaskedArray(values):
+        mask |= np.ma.getmaskarray(values)
+        values = values.data
+    if not mask.any():
+        return datetime64_to_milliseconds(values).tolist()
+    result = np.empty(len(values), dtype=object)
+    result[~mask] = datetime64_to_milliseconds(values[~mask]).tolist()
+    return result.tolist()
 
 
 def to_binary(text, encoding='utf-8'):
@@ -232,6 +432,37 @@ def is_namedtuple(obj):
     return isinstance(obj, tuple) and hasattr(obj, '_fields')
 
 
+class Backoff(object):
+    """
+    Intervals of polling, which grow by ``factor`` from ``interval``
+    up to ``max_interval``.
+
+    :Example:
+
+    >>> backoff = Backoff(1, 10)
+    >>> while not instance.is_terminated():
+    >>>     time.sleep(backoff.next())
+    """
+
+    def __init__(self, interval=1, max_interval=None, factor=1.5):
+        self._interval = interval
+        self._max_interval = max(max_interval, interval) if max_interval is not None else None
+        self._factor = factor
+        self._curr = interval
+
+    def reset(self):
+        self._curr = self._interval
+
+    def next(self):
+        interval = self._curr
+        self._curr *= self._factor
+        if self._max_interval is not None:
+            self._curr = min(self._curr, self._max_interval)
+        return interval
+
+    __next__ = next
+
+
 def load_resource_string(path, file_name):
     res_str = resource_string(path, file_name)
     if six.PY3:
@@ -34,10 +34,6 @@ requirements = []
 with open('requirements.txt') as f:
     requirements.extend(f.read().splitlines())
 
-if PY2:
-    requirements.append('protobuf>=2.5.0')
-else:
-    requirements.append('python3-protobuf>=2.5.0')
 if LESS_PY34:
     requirements.append('enum34>=1.0.4')
 if PY26: